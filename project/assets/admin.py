@@ -3,3 +3,4 @@ from django.contrib import admin
 from . import models
 
 admin.site.register(models.Asset)
+admin.site.register(models.DdoMirror)
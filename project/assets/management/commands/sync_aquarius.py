@@ -0,0 +1,79 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from helpers.config import config
+from helpers.services.aquarius import AquariusError, DdoSummary, aquarius
+
+from assets.models import DdoMirror, SyncCheckpoint
+
+
+class Command(BaseCommand):
+    help = """
+    Mirrors the Aquarius DDO summaries into the local ddo_mirror table. Pages
+    the DDOs by their metadata.updated timestamp and resumes from where the
+    previous run left off.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=config.AQUARIUS_SYNC_BATCH_SIZE,
+        )
+        parser.add_argument(
+            "--max-pages",
+            type=int,
+            help="Stop after this many pages, the next run resumes from there",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Ignore the checkpoint and mirror every DDO again",
+        )
+
+    def handle(self, *args, **options):
+        checkpoint, _ = SyncCheckpoint.objects.get_or_create(name="aquarius")
+        if options["full"]:
+            checkpoint.updated_since, checkpoint.last_did = None, None
+
+        pages, synced = 0, 0
+        while options["max_pages"] is None or pages < options["max_pages"]:
+            # Keyset paging, each page starts right after the last stored DDO
+            after = None
+            if checkpoint.updated_since is not None and checkpoint.last_did:
+                after = (checkpoint.updated_since, checkpoint.last_did)
+            try:
+                ddos = aquarius.query_ddos(
+                    checkpoint.updated_since, after=after, size=options["batch_size"]
+                )
+            except AquariusError as e:
+                raise CommandError(str(e))
+            pages += 1
+
+            summaries = []
+            for ddo in ddos:
+                try:
+                    summaries.append(DdoSummary.from_ddo(ddo["id"], ddo))
+                except (AquariusError, KeyError):
+                    self.stderr.write(f"Skipping malformed DDO {ddo.get('id')}")
+
+            with transaction.atomic():
+                synced += DdoMirror.objects.upsert(summaries)
+                self.advance(checkpoint, ddos)
+                checkpoint.save()
+
+            for summary in summaries:
+                aquarius.invalidate(summary.did)
+
+            if len(ddos) < options["batch_size"]:
+                break
+
+        self.stdout.write(f"Synced DDOs... {synced} ({pages} pages)")
+
+    def advance(self, checkpoint: SyncCheckpoint, ddos: list[dict]) -> None:
+        """Moves the checkpoint to the last DDO of the given page that has a
+        timestamp, those without one are never matched by the range query."""
+        for ddo in reversed(ddos):
+            updated = (ddo.get("metadata") or {}).get("updated")
+            if updated is not None and ddo.get("id"):
+                checkpoint.updated_since, checkpoint.last_did = updated, ddo["id"]
+                return
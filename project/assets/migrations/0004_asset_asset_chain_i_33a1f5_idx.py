@@ -0,0 +1,19 @@
+# Generated by Django 6.1.2 on 2026-10-18 08:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0003_asset_chain_id"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(fields=["chain_id"], name="asset_chain_i_33a1f5_idx"),
+        ),
+    ]
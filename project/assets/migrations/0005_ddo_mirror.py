@@ -0,0 +1,57 @@
+# Generated by Django 6.1.2 on 2026-10-18 08:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0004_asset_asset_chain_i_33a1f5_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DdoMirror",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("did", models.CharField(max_length=255, unique=True)),
+                ("owner", models.CharField(max_length=80)),
+                ("chain_id", models.PositiveIntegerField(default=0)),
+                ("type", models.CharField(max_length=20, null=True)),
+                ("updated", models.DateTimeField(null=True)),
+                ("synced_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "ddo_mirror",
+            },
+        ),
+        migrations.CreateModel(
+            name="SyncCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=64, unique=True)),
+                ("updated_since", models.CharField(max_length=64, null=True)),
+                ("offset", models.PositiveIntegerField(default=0)),
+                ("synced_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "sync_checkpoint",
+            },
+        ),
+    ]
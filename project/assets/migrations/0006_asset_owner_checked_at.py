@@ -0,0 +1,26 @@
+# Generated by Django 6.1.2 on 2026-10-18 09:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0005_ddo_mirror"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="asset",
+            name="owner_checked_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="asset",
+            index=models.Index(
+                fields=["owner_checked_at"], name="asset_owner_checked_at"
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 6.1.2 on 2026-10-18 09:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0006_asset_owner_checked_at"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="synccheckpoint",
+            name="offset",
+        ),
+        migrations.AddField(
+            model_name="synccheckpoint",
+            name="last_did",
+            field=models.CharField(max_length=255, null=True),
+        ),
+    ]
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
+
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import IntegrityError, models, transaction
+from django.utils.dateparse import parse_datetime
 from django.utils.translation import gettext_lazy as _
-from helpers.services.aquarius import aquarius
+from helpers.services.aquarius import AquariusError, DdoSummary, aquarius
 from helpers.validators.DidLengthValidator import DidLengthValidator
 
 User = get_user_model()
@@ -11,11 +15,18 @@ User = get_user_model()
 
 class AssetManager(models.Manager):
     def get_pending_consents(self, asset) -> int:
+        """Pending consents of the asset, read from its precomputed counters
+        (consents.ConsentCounter)."""
+        try:
+            counter = asset.consent_counter
+        except ObjectDoesNotExist:
+            return 0
+
         match asset.type:
             case Asset.Types.DATASET:
-                return Asset.objects.get(id=asset.id).incoming_consents.count()
+                return counter.incoming_pending
             case Asset.Types.ALGORITHM:
-                return Asset.objects.get(id=asset.id).outgoing_consents.count()
+                return counter.outgoing_pending
         return -1
 
     def get_or_create(
@@ -23,6 +34,7 @@ class AssetManager(models.Manager):
         did: str,
         type: str,
         chain_id: int | None = None,
+        summary: DdoSummary | None = None,
     ) -> Asset:
         asset = self.filter(did=did)
         if asset.exists():
@@ -37,11 +49,89 @@ class AssetManager(models.Manager):
                 )
             return asset
 
-        # Create the owner instance
-        owner = User.helper.get_or_create_from_aquarius(did)
-        chain_id = aquarius.get_asset_chain_id(did)
+        summary = summary or self.get_ddo_summary(did)
+        owner = User.helper.get_or_create(summary.owner)
+
+        try:
+            with transaction.atomic():
+                return self.create(
+                    did=did, owner=owner, type=type, chain_id=summary.chain_id
+                )
+        except IntegrityError:
+            # A concurrent request created it first
+            return self.get_or_create(did, type, chain_id)
+
+    def get_ddo_summary(self, did: str) -> DdoSummary:
+        """Returns the DDO summary of a DID from the local mirror, falling back
+        to Aquarius and writing the result through to the mirror.
+
+        Raises:
+            AquariusError: If the DID is not mirrored and Aquarius fails.
+        """
+        mirrored = DdoMirror.objects.filter(did=did).first()
+        if mirrored is not None:
+            return mirrored.to_summary()
+
+        summary = aquarius.get_ddo_summary(did)
+        DdoMirror.objects.upsert([summary])
+        return summary
+
+    def resolve_many(
+        self, dids: Iterable[str]
+    ) -> tuple[dict[str, DdoSummary], dict[str, AquariusError]]:
+        """Returns the DDO summary of each DID, reading the local mirror with
+        one query and fetching the rest from Aquarius concurrently.
+
+        Returns:
+            tuple: The DDO summaries by DID and the Aquarius errors by DID.
+        """
+        dids = set(dids)
+        resolved = {
+            mirrored.did: mirrored.to_summary()
+            for mirrored in DdoMirror.objects.filter(did__in=dids)
+        }
 
-        return self.create(did=did, owner=owner, type=type, chain_id=chain_id)
+        fetched, errors = [], {}
+        missing = dids - resolved.keys()
+        results = aquarius.get_ddo_summaries(missing) if missing else {}
+        for did, result in results.items():
+            if isinstance(result, AquariusError):
+                errors[did] = result
+            else:
+                fetched.append(result)
+
+        DdoMirror.objects.upsert(fetched)
+        resolved.update((summary.did, summary) for summary in fetched)
+        return resolved, errors
+
+    def bulk_get_or_create(
+        self,
+        types: dict[str, str],
+        resolved: dict[str, DdoSummary],
+    ) -> dict[str, Asset]:
+        """Returns the assets of the given DIDs by DID, inserting the resolved
+        ones that do not exist yet with a single insert.
+
+        Args:
+            types (dict): The asset type to create each DID with.
+            resolved (dict): The DDO summaries of the DIDs to create.
+        """
+        owners = User.helper.bulk_get_or_create(
+            summary.owner for summary in resolved.values()
+        )
+        self.bulk_create(
+            [
+                Asset(
+                    did=did,
+                    owner=owners[summary.owner],
+                    type=types[did],
+                    chain_id=summary.chain_id,
+                )
+                for did, summary in resolved.items()
+            ],
+            ignore_conflicts=True,
+        )
+        return {asset.did: asset for asset in self.filter(did__in=types)}
 
 
 class Asset(models.Model):
@@ -53,6 +143,9 @@ class Asset(models.Model):
         db_table = "asset"
         indexes = [
             models.Index(fields=["did", "owner"]),
+            models.Index(fields=["chain_id"]),
+            # Stalest first, see consents.owners
+            models.Index(fields=["owner_checked_at"], name="asset_owner_checked_at"),
         ]
 
     did = models.CharField(
@@ -71,9 +164,79 @@ class Asset(models.Model):
         default=Types.DATASET,
     )
     chain_id = models.PositiveIntegerField(default=0)
+    # Last time the owner was checked against Aquarius, None if never
+    owner_checked_at = models.DateTimeField(null=True, blank=True)
 
     objects = models.Manager()
     helper = AssetManager()
 
     def __str__(self):
         return self.did
+
+
+class DdoMirrorManager(models.Manager):
+    def upsert(self, summaries: Iterable[DdoSummary]) -> int:
+        """Inserts or refreshes the mirror rows of the given summaries with a
+        single statement. Returns the number of summaries written."""
+        rows = {
+            summary.did: DdoMirror(
+                did=summary.did,
+                owner=summary.owner,
+                chain_id=summary.chain_id,
+                type=summary.type,
+                updated=parse_datetime(summary.updated) if summary.updated else None,
+            )
+            for summary in summaries
+        }
+        self.bulk_create(
+            rows.values(),
+            update_conflicts=True,
+            unique_fields=["did"],
+            update_fields=["owner", "chain_id", "type", "updated", "synced_at"],
+        )
+        return len(rows)
+
+
+class DdoMirror(models.Model):
+    """Local copy of the Aquarius DDO summaries, kept up to date by the
+    sync_aquarius command and written through on every remote lookup."""
+
+    class Meta:
+        db_table = "ddo_mirror"
+
+    did = models.CharField(max_length=255, unique=True)
+    owner = models.CharField(max_length=80)
+    chain_id = models.PositiveIntegerField(default=0)
+    type = models.CharField(max_length=20, null=True)
+    updated = models.DateTimeField(null=True)
+    synced_at = models.DateTimeField(auto_now=True)
+
+    objects = DdoMirrorManager()
+
+    def __str__(self):
+        return self.did
+
+    def to_summary(self) -> DdoSummary:
+        return DdoSummary(
+            did=self.did,
+            owner=self.owner,
+            chain_id=self.chain_id,
+            type=self.type,
+            updated=self.updated.isoformat() if self.updated else None,
+        )
+
+
+class SyncCheckpoint(models.Model):
+    """Where an incremental sync left off: the `metadata.updated` and the id
+    of the last DDO it stored, the next page starts right after them."""
+
+    class Meta:
+        db_table = "sync_checkpoint"
+
+    name = models.CharField(max_length=64, unique=True)
+    updated_since = models.CharField(max_length=64, null=True)
+    last_did = models.CharField(max_length=255, null=True)
+    synced_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.updated_since})"
@@ -0,0 +1,12 @@
+from datetime import timedelta
+
+from django.core.management import call_command
+from helpers.config import config
+from jobs.registry import task
+
+
+# Bounded so that a large backlog is caught up over several runs, each well
+# within the job lease
+@task("assets.sync_aquarius", every=timedelta(minutes=5))
+def sync_aquarius():
+    call_command("sync_aquarius", max_pages=config.AQUARIUS_SYNC_MAX_PAGES)
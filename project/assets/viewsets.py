@@ -1,5 +1,6 @@
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
+from helpers.pagination import KeysetPagination
 from rest_framework.viewsets import ReadOnlyModelViewSet
 
 from assets.models import Asset
@@ -7,8 +8,9 @@ from assets.serializers import DetailAsset, ListAsset
 
 
 class AssetsViewset(ReadOnlyModelViewSet):
-    queryset = Asset.objects.all()
+    queryset = Asset.objects.select_related("owner")
     serializer_class = ListAsset
+    pagination_class = KeysetPagination
     lookup_field = "did"
     lookup_url_kwarg = "did"
 
@@ -29,22 +31,26 @@ class AssetsViewset(ReadOnlyModelViewSet):
                 description="List of assets",
                 schema=ListAsset(),
                 examples={
-                    "application/json": [
-                        {
-                            "url": "http://localhost:8050/api/assets/did:op:75afadb65591ca977344fa598c2b42c0ca5c7e8620b7c8bf47533e8f222d7997/",
-                            "did": "did:op:75afadb65591ca977344fa598c2b42c0ca5c7e8620b7c8bf47533e8f222d7997",
-                            "owner": "0xDf7a37EA1f42588Ea219Ec19328757F67BaBCeCD",
-                            "type": "Dataset",
-                            "chain_id": 32457,
-                        },
-                        {
-                            "url": "http://localhost:8050/api/assets/did:op:b533c6703cd099cfc228e1f6587c4049bc1f445b2bd0da24f5321a13fd9f1c8a/",
-                            "did": "did:op:b533c6703cd099cfc228e1f6587c4049bc1f445b2bd0da24f5321a13fd9f1c8a",
-                            "owner": "0xD999bAaE98AC5246568FD726be8832c49626867D",
-                            "type": "Algorithm",
-                            "chain_id": 32457,
-                        },
-                    ]
+                    "application/json": {
+                        "next": "http://localhost:8050/api/assets/?cursor=cD0yMDI1LTA5LTE5",
+                        "previous": None,
+                        "results": [
+                            {
+                                "url": "http://localhost:8050/api/assets/did:op:75afadb65591ca977344fa598c2b42c0ca5c7e8620b7c8bf47533e8f222d7997/",
+                                "did": "did:op:75afadb65591ca977344fa598c2b42c0ca5c7e8620b7c8bf47533e8f222d7997",
+                                "owner": "0xDf7a37EA1f42588Ea219Ec19328757F67BaBCeCD",
+                                "type": "Dataset",
+                                "chain_id": 32457,
+                            },
+                            {
+                                "url": "http://localhost:8050/api/assets/did:op:b533c6703cd099cfc228e1f6587c4049bc1f445b2bd0da24f5321a13fd9f1c8a/",
+                                "did": "did:op:b533c6703cd099cfc228e1f6587c4049bc1f445b2bd0da24f5321a13fd9f1c8a",
+                                "owner": "0xD999bAaE98AC5246568FD726be8832c49626867D",
+                                "type": "Algorithm",
+                                "chain_id": 32457,
+                            },
+                        ],
+                    }
                 },
             )
         },
@@ -27,3 +27,4 @@ class ConsentAdminForm(forms.ModelForm):
 
 admin.site.register(models.Consent, BitfieldAdmin)
 admin.site.register(models.ConsentResponse, BitfieldAdmin)
+admin.site.register(models.ConsentToken, BitfieldAdmin)
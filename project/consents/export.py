@@ -0,0 +1,70 @@
+import csv
+from collections.abc import Iterable, Iterator
+
+import orjson
+from django.db.models import QuerySet
+
+from consents.models import Status
+
+# Column name -> ORM lookup. Values are fetched flat with one joined query.
+COLUMNS = {
+    "id": "id",
+    "created_at": "created_at",
+    "dataset": "dataset__did",
+    "dataset_owner": "dataset_owner__address",
+    "algorithm": "algorithm__did",
+    "algorithm_owner": "algorithm_owner__address",
+    "chain_id": "dataset__chain_id",
+    "solicitor": "solicitor__address",
+    "reason": "reason",
+    "request": "request",
+    "status": "status",
+    "permitted": "response__permitted",
+    "response_reason": "response__reason",
+    "responded_at": "response__last_updated_at",
+}
+
+
+def export_rows(queryset: QuerySet, chunk_size: int) -> Iterator[dict]:
+    """Yields one flat dict per consent.
+
+    ``iterator()`` streams the rows through a server-side cursor on
+    PostgreSQL, so memory usage does not depend on the number of rows.
+    """
+
+    rows = (
+        queryset.order_by("id")
+        .values_list(*COLUMNS.values())
+        .iterator(chunk_size=chunk_size)
+    )
+    for row in rows:
+        row = dict(zip(COLUMNS, row))
+        row["status"] = str(Status(row["status"]).label)
+        for mask in ("request", "permitted"):
+            if row[mask] is not None:
+                row[mask] = int(row[mask])
+        yield row
+
+
+def to_ndjson(rows: Iterable[dict]) -> Iterator[bytes]:
+    for row in rows:
+        yield orjson.dumps(row) + b"\n"
+
+
+class _Echo:
+    def write(self, value: str) -> str:
+        return value
+
+
+def to_csv(rows: Iterable[dict]) -> Iterator[str]:
+    writer = csv.DictWriter(_Echo(), fieldnames=list(COLUMNS))
+    yield writer.writeheader()
+    for row in rows:
+        yield writer.writerow(row)
+
+
+# Output format -> (encoder, content type)
+EXPORT_FORMATS = {
+    "ndjson": (to_ndjson, "application/x-ndjson"),
+    "csv": (to_csv, "text/csv"),
+}
@@ -0,0 +1,103 @@
+from django.db.models import Q
+from helpers.filters import Filter, FilterSet, parse_timestamp
+
+from consents.models import RequestFlags, Status
+
+
+class StatusFilter(Filter):
+    """Accepts either the status code (``P``) or its label (``Pending``)."""
+
+    def to_q(self, value: str) -> Q:
+        status = next(
+            (
+                choice
+                for choice in Status
+                if value.lower() in (choice.value.lower(), choice.label.lower())
+            ),
+            None,
+        )
+        if status is None:
+            raise ValueError(
+                f"expected any of: {', '.join(str(s.label) for s in Status)}"
+            )
+
+        return Q(**{self.lookup: status})
+
+
+class FlagsFilter(Filter):
+    """Matches the rows with every one of the comma separated flag names
+    set, each tested apart so it can use its partial index."""
+
+    def to_q(self, value: str) -> Q:
+        flags = [flag for flag, _ in RequestFlags.flags]
+
+        query = Q()
+        for name in value.split(","):
+            if name.strip() not in flags:
+                raise ValueError(f"expected any of: {', '.join(flags)}")
+            query &= Q(**{self.lookup: 1 << flags.index(name.strip())})
+        return query
+
+
+class ConsentFilterSet(FilterSet):
+    """Every filter resolves through an index: the unique ``asset.did`` and
+    ``users.address`` columns, the foreign key indexes of ``consent``, the
+    explicit indexes declared on the models or, for the time windows on
+    PostgreSQL, the BRIN indexes of migration 0015."""
+
+    filters = {
+        "dataset_did": Filter("dataset__did", description="Dataset DID"),
+        "algorithm_did": Filter("algorithm__did", description="Algorithm DID"),
+        "dataset_owner": Filter(
+            "dataset_owner__address",
+            description="Dataset owner address",
+        ),
+        "algorithm_owner": Filter(
+            "algorithm_owner__address",
+            description="Algorithm owner address",
+        ),
+        # Kept for backwards compatibility, these match on the owner address
+        "dataset": Filter(
+            "dataset_owner__address",
+            description="Alias of dataset_owner",
+        ),
+        "algorithm": Filter(
+            "algorithm_owner__address",
+            description="Alias of algorithm_owner",
+        ),
+        "solicitor": Filter("solicitor__address", description="Solicitor address"),
+        "status": StatusFilter(
+            "status",
+            description="Status code or name (Pending, Accepted, Denied, Resolved)",
+        ),
+        "chain_id": Filter("dataset__chain_id", int, "Dataset chain id"),
+        "request": Filter("request", int, "Exact requested flags mask"),
+        "request_flags": FlagsFilter(
+            "request__hasbits",
+            description="Comma separated flags that were all requested",
+        ),
+        "permitted_flags": FlagsFilter(
+            "response__permitted__hasbits",
+            description="Comma separated flags that were all permitted",
+        ),
+        "created_after": Filter(
+            "created_at__gte",
+            parse_timestamp,
+            "Created at or after, UNIX timestamp or ISO-8601",
+        ),
+        "created_before": Filter(
+            "created_at__lt",
+            parse_timestamp,
+            "Created before, UNIX timestamp or ISO-8601",
+        ),
+        "responded_after": Filter(
+            "response__last_updated_at__gte",
+            parse_timestamp,
+            "Responded at or after, UNIX timestamp or ISO-8601",
+        ),
+        "responded_before": Filter(
+            "response__last_updated_at__lt",
+            parse_timestamp,
+            "Responded before, UNIX timestamp or ISO-8601",
+        ),
+    }
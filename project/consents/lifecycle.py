@@ -0,0 +1,67 @@
+"""Bookkeeping that must happen whenever a consent changes state.
+
+Every function is expected to run inside the transaction performing the
+change, so the denormalized data commits (or rolls back) with it.
+"""
+
+from collections import defaultdict
+
+from django.db.models import Case, Value, When
+
+from consents import tokens
+from consents.models import (
+    Consent,
+    ConsentCounter,
+    ConsentEvent,
+    ConsentResponse,
+    Status,
+)
+
+
+def responded(*responses: ConsentResponse) -> None:
+    if not responses:
+        return
+
+    consents = defaultdict(list)
+    for response in responses:
+        consents[response.status].append(response.consent_id)
+        if ConsentResponse.consent.is_cached(response):
+            response.consent.status = response.status
+
+    Consent.objects.filter(pk__in=[r.consent_id for r in responses]).update(
+        status=Case(
+            *(When(pk__in=ids, then=Value(status)) for status, ids in consents.items())
+        )
+    )
+    tokens.issue(*responses)
+    ConsentEvent.objects.record(
+        ConsentEvent.Kind.RESPONDED,
+        {
+            response.consent_id: ConsentEvent.responded(response)
+            for response in responses
+        },
+    )
+    ConsentCounter.objects.track([r.consent_id for r in responses], pending=-1)
+
+
+def response_deleted(consent: Consent) -> None:
+    Consent.objects.filter(pk=consent.pk).update(status=Status.PENDING)
+    consent.status = Status.PENDING
+    tokens.revoke(consent)
+    ConsentEvent.objects.record(
+        ConsentEvent.Kind.RESPONSE_DELETED,
+        {consent.pk: {"status": str(Status.PENDING.label)}},
+    )
+    ConsentCounter.objects.track([consent.pk], pending=1)
+
+
+def deleted(consent: Consent) -> None:
+    """Must run before the consent is deleted."""
+    tokens.revoke(consent)
+    # Tombstone, so mirrors drop it too
+    ConsentEvent.objects.record(ConsentEvent.Kind.DELETED, {consent.pk: {}})
+    ConsentCounter.objects.track(
+        [consent.pk],
+        pending=-1 if consent.status == Status.PENDING else 0,
+        total=-1,
+    )
@@ -0,0 +1,138 @@
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import count
+from unittest import mock
+
+from assets.models import Asset, DdoMirror
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection, transaction
+from helpers.services.aquarius import DdoSummary
+
+from consents.models import Consent
+
+User = get_user_model()
+
+
+class FakeAquarius:
+    """Answers every DDO lookup after a fixed latency, as a remote would."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def summary(self, did: str) -> DdoSummary:
+        return DdoSummary(did=did, owner=f"0xbench{did[-32:]}", chain_id=0)
+
+    def get_ddo_summary(self, did: str) -> DdoSummary:
+        time.sleep(self.latency)
+        return self.summary(did)
+
+    def get_ddo_summaries(self, dids) -> dict[str, DdoSummary]:
+        time.sleep(self.latency)  # Resolved concurrently, one round-trip
+        return {did: self.summary(did) for did in dids}
+
+
+class Command(BaseCommand):
+    help = """
+    Benchmarks consent creation for unseen assets against a simulated
+    Aquarius latency. Compares resolving inside the transaction (inline)
+    with resolving before it (two-phase) and reports how long transactions
+    were held open. Creates and then deletes its own rows, run it against a
+    PostgreSQL database to get meaningful contention.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--consents", type=int, default=100)
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0.1,
+            help="Seconds each Aquarius round-trip takes",
+        )
+
+    def handle(self, *args, **options):
+        for mode in ("inline", "two-phase"):
+            latencies, held = self.run(mode, **options)
+            self.stdout.write(
+                f"{mode:>10}: "
+                f"p50 {statistics.median(latencies) * 1000:.1f} ms, "
+                f"p95 {self.p95(latencies) * 1000:.1f} ms, "
+                f"transactions held {sum(held):.2f} s "
+                f"(avg {statistics.mean(held) * 1000:.1f} ms)"
+            )
+
+    def run(self, mode: str, consents: int, threads: int, latency: float, **_):
+        sequence = count()
+        lock = threading.Lock()
+        latencies, held = [], []
+
+        def create(_):
+            with lock:
+                n = next(sequence)
+            started = time.perf_counter()
+            try:
+                if mode == "inline":
+                    with transaction.atomic():
+                        self.create(n)
+                else:
+                    self.create(n)
+            finally:
+                close_old_connections()
+            with lock:
+                latencies.append(time.perf_counter() - started)
+
+        try:
+            with (
+                mock.patch("assets.models.aquarius", FakeAquarius(latency)),
+                self.timed_transactions(held, lock),
+                ThreadPoolExecutor(max_workers=threads) as pool,
+            ):
+                list(pool.map(create, range(consents)))
+        finally:
+            self.cleanup()
+        return latencies, held
+
+    def create(self, n: int) -> Consent:
+        return Consent.helper.get_or_create_from_aquarius(
+            dataset=f"did:op:bench{n:059x}d",
+            algorithm=f"did:op:bench{n:059x}a",
+            solicitor=f"0xbenchsolicitor{n:024x}",
+            request=3,
+        )
+
+    @contextmanager
+    def timed_transactions(self, held: list, lock: threading.Lock):
+        """Records how long each outermost transaction stays open."""
+        atomic = transaction.atomic
+
+        @contextmanager
+        def timed(*args, **kwargs):
+            if connection.in_atomic_block:
+                with atomic(*args, **kwargs):
+                    yield
+                return
+
+            started = time.perf_counter()
+            try:
+                with atomic(*args, **kwargs):
+                    yield
+            finally:
+                with lock:
+                    held.append(time.perf_counter() - started)
+
+        with mock.patch.object(transaction, "atomic", timed):
+            yield
+
+    def cleanup(self):
+        Consent.objects.filter(solicitor__address__startswith="0xbench").delete()
+        Asset.objects.filter(did__startswith="did:op:bench").delete()
+        DdoMirror.objects.filter(did__startswith="did:op:bench").delete()
+        User.objects.filter(address__startswith="0xbench").delete()
+
+    @staticmethod
+    def p95(values: list[float]) -> float:
+        return sorted(values)[int(len(values) * 0.95) - 1]
@@ -0,0 +1,202 @@
+import math
+import random
+import statistics
+import time
+from itertools import batched
+
+from assets.models import Asset
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries, transaction
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from consents.models import Consent, ConsentResponse, Status
+
+User = get_user_model()
+
+PREFIX = "did:op:benchdecision"
+
+
+class Command(BaseCommand):
+    help = """
+    Benchmarks the consent decision endpoint on a seeded table. Seeds a grid
+    of datasets and algorithms with one consent per pair, half of them
+    responded, then times decisions for random pairs (some without a
+    consent) through the whole request stack and reports the p50, p95 and
+    p99 latencies, then does the same for batches of each --pairs size. The
+    seeded rows are kept for later runs unless --cleanup
+    is given, run it against PostgreSQL to get meaningful numbers.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument("--requests", type=int, default=5000)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument(
+            "--pairs",
+            type=lambda value: [int(size) for size in value.split(",")],
+            default=[10, 100, 500],
+            help="Comma separated sizes of the batches to time",
+        )
+        parser.add_argument(
+            "--cleanup",
+            action="store_true",
+            help="Delete the seeded rows afterwards",
+        )
+
+    def handle(self, *args, **options):
+        side = math.ceil(math.sqrt(options["rows"]))
+        try:
+            self.seed(side, options["rows"], options["batch_size"])
+            latencies, queries = self.run(side, options["requests"])
+            batches = {
+                size: self.run_batches(side, size, options["requests"] // size or 1)
+                for size in options["pairs"]
+            }
+            seeded = Consent.objects.filter(dataset__did__startswith=PREFIX).count()
+        finally:
+            if options["cleanup"]:
+                self.cleanup()
+
+        self.stdout.write(
+            f"{options['requests']} decisions over {seeded} consents: "
+            f"p50 {statistics.median(latencies) * 1000:.2f} ms, "
+            f"p95 {self.percentile(latencies, 0.95) * 1000:.2f} ms, "
+            f"p99 {self.percentile(latencies, 0.99) * 1000:.2f} ms, "
+            f"max {max(latencies) * 1000:.2f} ms, "
+            f"{max(queries)} queries per decision"
+        )
+        for size, (latencies, queries) in batches.items():
+            self.stdout.write(
+                f"{len(latencies)} batches of {size} pairs: "
+                f"p50 {statistics.median(latencies) * 1000:.2f} ms, "
+                f"p99 {self.percentile(latencies, 0.99) * 1000:.2f} ms, "
+                f"{statistics.median(latencies) / size * 1e6:.1f} us per pair, "
+                f"{max(queries)} queries per batch"
+            )
+
+    def did(self, type: str, n: int) -> str:
+        return f"{PREFIX}{type}{n:050x}"
+
+    def seed(self, side: int, rows: int, batch_size: int) -> None:
+        existing = Consent.objects.filter(dataset__did__startswith=PREFIX).count()
+        if existing >= rows:
+            self.stdout.write(f"Reusing {existing} seeded consents")
+            return
+
+        self.cleanup()
+        started = time.perf_counter()
+        with transaction.atomic():
+            owner = User.objects.create(
+                address="0xbenchdecisionowner", username="user_0xbenchdecisionowner"
+            )
+            solicitor = User.objects.create(
+                address="0xbenchdecisionsolicitor",
+                username="user_0xbenchdecisionsolicitor",
+            )
+            Asset.objects.bulk_create(
+                (
+                    Asset(did=self.did(type, n), owner=owner, type=type)
+                    for type in (Asset.Types.DATASET, Asset.Types.ALGORITHM)
+                    for n in range(side)
+                ),
+                batch_size=batch_size,
+            )
+            datasets = self.ids(Asset.Types.DATASET)
+            algorithms = self.ids(Asset.Types.ALGORITHM)
+
+        for start in range(0, rows, batch_size):
+            with transaction.atomic():
+                Consent.objects.bulk_create(
+                    Consent(
+                        dataset_id=datasets[n // side],
+                        algorithm_id=algorithms[n % side],
+                        dataset_owner=owner,
+                        algorithm_owner=owner,
+                        solicitor=solicitor,
+                        request=3,
+                        status=(Status.ACCEPTED, Status.PENDING)[n % 2],
+                    )
+                    for n in range(start, min(start + batch_size, rows))
+                )
+
+        accepted = Consent.objects.filter(
+            dataset__did__startswith=PREFIX, status=Status.ACCEPTED
+        ).values_list("pk", flat=True)
+        for batch in batched(accepted.iterator(chunk_size=batch_size), batch_size):
+            ConsentResponse.objects.bulk_create(
+                ConsentResponse(
+                    consent_id=pk,
+                    permitted=3,
+                    reason="Benchmark",
+                    status=Status.ACCEPTED,
+                )
+                for pk in batch
+            )
+
+        self.stdout.write(
+            f"Seeded {rows} consents in {time.perf_counter() - started:.1f} s"
+        )
+
+    def ids(self, type: str) -> dict[int, int]:
+        return {
+            int(did.removeprefix(PREFIX + type), 16): pk
+            for pk, did in Asset.objects.filter(
+                did__startswith=PREFIX + type
+            ).values_list("pk", "did")
+        }
+
+    def pair(self, side: int) -> dict:
+        # A few pairs fall outside the grid, and have no consent
+        return {
+            "dataset": self.did(Asset.Types.DATASET, random.randrange(side)),
+            "algorithm": self.did(
+                Asset.Types.ALGORITHM, random.randrange(side + side // 10)
+            ),
+        }
+
+    def run(self, side: int, requests: int) -> tuple[list[float], list[int]]:
+        url = reverse("consents-decision")
+        return self.timed(
+            lambda client: client.get(url, self.pair(side)),
+            requests,
+        )
+
+    def run_batches(
+        self, side: int, size: int, requests: int
+    ) -> tuple[list[float], list[int]]:
+        url = reverse("consents-batch-decision")
+        return self.timed(
+            lambda client: client.post(
+                url,
+                {"pairs": [self.pair(side) for _ in range(size)]},
+                content_type="application/json",
+            ),
+            requests,
+        )
+
+    def timed(self, send, requests: int) -> tuple[list[float], list[int]]:
+        client = Client()
+        latencies, queries = [], []
+
+        with override_settings(DEBUG=True, ALLOWED_HOSTS=["testserver"]):
+            for _ in range(requests):
+                reset_queries()
+                started = time.perf_counter()
+                response = send(client)
+                latencies.append(time.perf_counter() - started)
+                queries.append(len(connection.queries))
+                assert response.status_code == 200, response.content
+
+        return latencies, queries
+
+    def cleanup(self):
+        Consent.objects.filter(dataset__did__startswith=PREFIX).delete()
+        Asset.objects.filter(did__startswith=PREFIX).delete()
+        User.objects.filter(address__startswith="0xbenchdecision").delete()
+
+    @staticmethod
+    def percentile(values: list[float], fraction: float) -> float:
+        return sorted(values)[max(int(len(values) * fraction) - 1, 0)]
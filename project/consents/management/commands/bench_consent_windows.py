@@ -0,0 +1,221 @@
+import math
+import random
+import statistics
+import time
+from datetime import timedelta
+from unittest import mock
+
+from assets.models import Asset
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max, QuerySet
+from django.utils import timezone
+
+from consents.filters import ConsentFilterSet
+from consents.models import Consent, ConsentResponse, Status
+
+User = get_user_model()
+
+PREFIX = "did:op:benchwindow"
+
+# Statements run, and rolled back, before timing each strategy on PostgreSQL
+STRATEGIES = {
+    "brin": [],
+    "btree": [
+        "DROP INDEX consent_created_at_brin",
+        "DROP INDEX consent_response_last_updated_at_brin",
+        "CREATE INDEX bench_response_last_updated_at"
+        " ON consent_response (last_updated_at)",
+    ],
+    "seqscan": [
+        "DROP INDEX consent_created_at_brin",
+        "DROP INDEX consent_response_last_updated_at_brin",
+        "SET LOCAL enable_indexscan = off",
+        "SET LOCAL enable_indexonlyscan = off",
+        "SET LOCAL enable_bitmapscan = off",
+    ],
+}
+
+
+class Command(BaseCommand):
+    help = """
+    Benchmarks the created_* and responded_* time window filters on a seeded
+    table. Seeds consents created one after another over a year, half of
+    them responded a while later, then counts and lists the consents of
+    each --days window. On PostgreSQL every query is timed with the BRIN
+    indexes, with btree indexes instead and with no index, reporting the
+    plan and index sizes. The seeded rows are kept for later runs unless
+    --cleanup is given.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000_000)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument(
+            "--days",
+            type=lambda value: [int(days) for days in value.split(",")],
+            default=[1, 7, 30, 365],
+            help="Comma separated sizes of the windows, in days",
+        )
+        parser.add_argument(
+            "--cleanup",
+            action="store_true",
+            help="Delete the seeded rows afterwards",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            self.seed(options["rows"], options["batch_size"])
+            if connection.vendor == "postgresql":
+                self.report_sizes()
+                strategies = STRATEGIES
+            else:
+                self.stdout.write("Not on PostgreSQL, timing the btree indexes only")
+                strategies = {"btree": []}
+
+            seeded = Consent.objects.filter(dataset__did__startswith=PREFIX)
+            end = seeded.aggregate(end=Max("created_at"))["end"]
+            for days in options["days"]:
+                since = int((end - timedelta(days=days)).timestamp())
+                for name, statements in strategies.items():
+                    self.run(days, since, name, statements, options["repeat"])
+        finally:
+            if options["cleanup"]:
+                self.cleanup()
+
+    def seed(self, rows: int, batch_size: int) -> None:
+        existing = Consent.objects.filter(dataset__did__startswith=PREFIX).count()
+        if existing >= rows:
+            self.stdout.write(f"Reusing {existing} seeded consents")
+            return
+
+        self.cleanup()
+        started = time.perf_counter()
+        side = math.ceil(math.sqrt(rows))
+        with transaction.atomic():
+            owner = User.objects.create(
+                address="0xbenchwindowowner", username="user_0xbenchwindowowner"
+            )
+            assets = {
+                type: Asset.objects.bulk_create(
+                    (
+                        Asset(did=f"{PREFIX}{type}{n:050x}", owner=owner, type=type)
+                        for n in range(side)
+                    ),
+                    batch_size=batch_size,
+                )
+                for type in (Asset.Types.DATASET, Asset.Types.ALGORITHM)
+            }
+
+        # Spread over the last year, in insertion order as in production
+        end = timezone.now()
+        step = timedelta(days=365) / rows
+        datasets, algorithms = (
+            assets[Asset.Types.DATASET],
+            assets[Asset.Types.ALGORITHM],
+        )
+        created_at = Consent._meta.get_field("created_at")
+        last_updated_at = ConsentResponse._meta.get_field("last_updated_at")
+        with (
+            mock.patch.object(created_at, "auto_now_add", False),
+            mock.patch.object(last_updated_at, "auto_now_add", False),
+        ):
+            for start in range(0, rows, batch_size):
+                with transaction.atomic():
+                    consents = Consent.objects.bulk_create(
+                        Consent(
+                            dataset=datasets[n // side],
+                            algorithm=algorithms[n % side],
+                            dataset_owner=owner,
+                            algorithm_owner=owner,
+                            solicitor=owner,
+                            request=3,
+                            status=(Status.ACCEPTED, Status.PENDING)[n % 2],
+                            created_at=end - (rows - n) * step,
+                        )
+                        for n in range(start, min(start + batch_size, rows))
+                    )
+                    ConsentResponse.objects.bulk_create(
+                        ConsentResponse(
+                            consent=consent,
+                            permitted=3,
+                            reason="Benchmark",
+                            status=Status.ACCEPTED,
+                            last_updated_at=consent.created_at
+                            + timedelta(minutes=random.randrange(60)),
+                        )
+                        for consent in consents
+                        if consent.status == Status.ACCEPTED
+                    )
+
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE consent, consent_response")
+
+        self.stdout.write(
+            f"Seeded {rows} consents in {time.perf_counter() - started:.1f} s"
+        )
+
+    def queries(self, since: int) -> dict[str, QuerySet]:
+        # Over the whole table, as the dashboards query it
+        consents = Consent.objects.all()
+        created = ConsentFilterSet({"created_after": str(since)}).filter(consents)
+        responded = ConsentFilterSet({"responded_after": str(since)}).filter(consents)
+        return {
+            "created count": created,
+            "created page": created.order_by("-created_at", "-id")[:50],
+            "responded count": responded,
+        }
+
+    def run(self, days: int, since: int, strategy: str, statements, repeat: int):
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
+
+            for name, queryset in self.queries(since).items():
+                count = name.endswith("count")
+                timings = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    rows = queryset.count() if count else len(queryset.all())
+                    timings.append(time.perf_counter() - started)
+
+                self.stdout.write(
+                    f"{days:>4} days, {strategy:<8} {name:<16} {rows:>10} rows: "
+                    f"median {statistics.median(timings) * 1000:9.2f} ms"
+                    f"{self.plan(queryset.order_by() if count else queryset)}"
+                )
+
+            # Undoes the dropped and created indexes
+            transaction.set_rollback(True)
+
+    def plan(self, queryset: QuerySet) -> str:
+        """The scans of the plan of a query, on PostgreSQL."""
+        if connection.vendor != "postgresql":
+            return ""
+
+        scans = [
+            line.strip().removeprefix("->  ").split("  (")[0]
+            for line in queryset.explain().splitlines()
+            if "Scan" in line
+        ]
+        return f", {'; '.join(scans)}"
+
+    def report_sizes(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT indexrelname, pg_size_pretty(pg_relation_size(indexrelid))
+                FROM pg_stat_user_indexes
+                WHERE relname IN ('consent', 'consent_response')
+                ORDER BY pg_relation_size(indexrelid) DESC
+                """)
+            for name, size in cursor.fetchall():
+                self.stdout.write(f"Index {name}: {size}")
+
+    def cleanup(self):
+        Consent.objects.filter(dataset__did__startswith=PREFIX).delete()
+        Asset.objects.filter(did__startswith=PREFIX).delete()
+        User.objects.filter(address__startswith="0xbenchwindow").delete()
@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand, CommandError
+from helpers.config import config
+from rest_framework.exceptions import ValidationError
+
+from consents import export
+from consents.filters import ConsentFilterSet
+from consents.models import Consent
+
+
+class Command(BaseCommand):
+    help = """
+    Streams the consents to a file (or stdout) as NDJSON or CSV. Accepts the
+    same filters as the consents list endpoint, i.e. --filter status=Pending
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            choices=list(export.EXPORT_FORMATS),
+            default="ndjson",
+        )
+        parser.add_argument(
+            "--file",
+            help="Destination path, defaults to stdout",
+        )
+        parser.add_argument(
+            "--filter",
+            action="append",
+            default=[],
+            metavar="NAME=VALUE",
+            help=f"Any of: {', '.join(ConsentFilterSet.filters)}",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=config.EXPORT_CHUNK_SIZE,
+        )
+
+    def handle(self, *args, **options):
+        try:
+            params = dict(f.split("=", 1) for f in options["filter"])
+            queryset = ConsentFilterSet(params).filter(Consent.objects.all())
+        except ValueError:
+            raise CommandError("Filters must be given as NAME=VALUE")
+        except ValidationError as e:
+            raise CommandError(e.detail)
+
+        encode, _ = export.EXPORT_FORMATS[options["output"]]
+        rows = export.export_rows(queryset, chunk_size=options["chunk_size"])
+
+        chunks = (
+            chunk.decode() if isinstance(chunk, bytes) else chunk
+            for chunk in encode(rows)
+        )
+
+        if not options["file"]:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+
+        with open(options["file"], "w", newline="") as destination:
+            destination.writelines(chunks)
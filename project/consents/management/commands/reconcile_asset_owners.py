@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand, CommandError
+from helpers.config import config
+from helpers.services.aquarius import AquariusUnavailable
+
+from consents import owners
+
+
+class Command(BaseCommand):
+    help = """
+    Checks the owner of the assets against Aquarius, never checked and
+    stalest first, transferring those that changed hands along with their
+    consents. Interrupted runs resume from where they were left.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            help="Stop after checking this many assets, every stale one if unset",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=config.ASSET_OWNER_CHECK_BATCH_SIZE,
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=config.ASSET_OWNER_CHECK_RATE,
+            help="Max Aquarius requests per second, 0 for no limit",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=config.ASSET_OWNER_CHECK_INTERVAL,
+            help="Seconds before a checked owner is checked again",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            progress = owners.reconcile(
+                limit=options["limit"],
+                batch_size=options["batch_size"],
+                rate=options["rate"],
+                interval=options["interval"],
+                report=self.report,
+            )
+        except AquariusUnavailable as e:
+            raise CommandError(f"{e}, the next run resumes from here")
+
+        self.stdout.write(
+            f"Checked asset owners... {progress.checked} "
+            f"({progress.transferred} transferred, {progress.errors} errors)"
+        )
+
+    def report(self, progress: owners.Progress) -> None:
+        self.stdout.write(
+            f"  {progress.checked} checked, {progress.transferred} transferred, "
+            f"{progress.errors} errors, {progress.rate:.1f} assets/s"
+        )
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from consents.models import ConsentCounter
+
+
+class Command(BaseCommand):
+    help = """
+    Verifies that the precomputed consent counters of every user and asset
+    match their consents and rebuilds them from scratch if any drifted.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report the drifted counters, exit with 1 if any",
+        )
+
+    def handle(self, *args, **options):
+        drifted = ConsentCounter.objects.drifted()
+        self.stdout.write(f"Drifted counters... {len(drifted)}")
+
+        if options["check"]:
+            if drifted:
+                raise SystemExit(1)
+            return
+
+        rebuilt = ConsentCounter.objects.rebuild()
+        self.stdout.write(f"Rebuilt counters... {rebuilt}")
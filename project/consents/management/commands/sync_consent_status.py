@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from consents.models import Consent, Status
+
+
+class Command(BaseCommand):
+    help = """
+    Verifies that the denormalized Consent.status matches the status of its
+    response (or Pending when there is none) and repairs any drift.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report the drifted consents, exit with 1 if any",
+        )
+
+    def handle(self, *args, **options):
+        drifted = Consent.helper.drifted()
+        self.stdout.write(f"Drifted consents... {drifted.count()}")
+
+        if options["check"]:
+            if drifted.exists():
+                raise SystemExit(1)
+            return
+
+        repaired = 0
+        with transaction.atomic():
+            for status in Status.values:
+                if status == Status.PENDING:
+                    stale = Consent.objects.filter(response__isnull=True)
+                else:
+                    stale = Consent.objects.filter(response__status=status)
+                repaired += stale.exclude(status=status).update(status=status)
+
+        self.stdout.write(f"Repaired consents... {repaired}")
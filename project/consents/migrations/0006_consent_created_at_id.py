@@ -0,0 +1,22 @@
+# Generated by Django 6.1.2 on 2026-10-18 08:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0003_asset_chain_id"),
+        ("consents", "0005_alter_consent_request_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="consent",
+            index=models.Index(
+                fields=["created_at", "id"], name="consent_created_at_id"
+            ),
+        ),
+    ]
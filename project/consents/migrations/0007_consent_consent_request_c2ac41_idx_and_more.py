@@ -0,0 +1,24 @@
+# Generated by Django 6.1.2 on 2026-10-18 08:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0004_asset_asset_chain_i_33a1f5_idx"),
+        ("consents", "0006_consent_created_at_id"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="consent",
+            index=models.Index(fields=["request"], name="consent_request_c2ac41_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="consentresponse",
+            index=models.Index(fields=["status"], name="consent_res_status_e131c0_idx"),
+        ),
+    ]
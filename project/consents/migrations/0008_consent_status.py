@@ -0,0 +1,60 @@
+# Generated by Django 6.1.2 on 2026-10-18 08:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_status(apps, schema_editor):
+    Consent = apps.get_model("consents", "Consent")
+    for status in ("A", "D", "R"):
+        Consent.objects.filter(response__status=status).update(status=status)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0004_asset_asset_chain_i_33a1f5_idx"),
+        ("consents", "0007_consent_consent_request_c2ac41_idx_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="consent",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("A", "Accepted"),
+                    ("P", "Pending"),
+                    ("D", "Denied"),
+                    ("R", "Resolved"),
+                ],
+                default="P",
+                max_length=1,
+            ),
+        ),
+        migrations.RunPython(backfill_status, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="consent",
+            index=models.Index(
+                fields=["status", "created_at", "id"],
+                name="consent_status_created",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="consent",
+            index=models.Index(
+                condition=models.Q(("status", "P")),
+                fields=["dataset", "created_at"],
+                name="consent_pending_dataset",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="consent",
+            index=models.Index(
+                condition=models.Q(("status", "P")),
+                fields=["solicitor", "created_at"],
+                name="consent_pending_solicitor",
+            ),
+        ),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 6.1.2 on 2026-10-18 08:59
+
+import bitfield.models
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("consents", "0008_consent_status"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ConsentSubmission",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("dataset", models.CharField(max_length=255)),
+                ("algorithm", models.CharField(max_length=255)),
+                (
+                    "request",
+                    bitfield.models.BitField(
+                        (
+                            (
+                                "trusted_algorithm_publisher",
+                                "Trusted Algorithm Publisher",
+                            ),
+                            ("trusted_algorithm", "Trusted Algorithm"),
+                            ("allow_network_access", "Allow Network Access"),
+                        ),
+                        default=None,
+                    ),
+                ),
+                ("reason", models.TextField(blank=True)),
+                ("callback_url", models.URLField(blank=True)),
+                (
+                    "state",
+                    models.CharField(
+                        choices=[
+                            ("resolving", "Resolving"),
+                            ("created", "Created"),
+                            ("failed", "Failed"),
+                        ],
+                        default="resolving",
+                        max_length=10,
+                    ),
+                ),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("last_error", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "consent",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="submissions",
+                        to="consents.consent",
+                    ),
+                ),
+                (
+                    "solicitor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="consent_submissions",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "consent_submission",
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("state", "resolving")),
+                        fields=["next_attempt_at"],
+                        name="consent_submission_due",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 6.1.2 on 2026-10-18 09:12
+
+import bitfield.models
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("consents", "0009_consent_submission"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ConsentToken",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "jti",
+                    models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+                ),
+                (
+                    "permitted",
+                    bitfield.models.BitField(
+                        (
+                            (
+                                "trusted_algorithm_publisher",
+                                "Trusted Algorithm Publisher",
+                            ),
+                            ("trusted_algorithm", "Trusted Algorithm"),
+                            ("allow_network_access", "Allow Network Access"),
+                        ),
+                        default=None,
+                    ),
+                ),
+                ("issued_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("expires_at", models.DateTimeField()),
+                ("revoked_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "consent",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="tokens",
+                        to="consents.consent",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "consent_token",
+                "indexes": [
+                    models.Index(
+                        fields=["consent", "expires_at"],
+                        name="consent_tok_consent_ba8f65_idx",
+                    ),
+                    models.Index(
+                        condition=models.Q(("revoked_at__isnull", False)),
+                        fields=["expires_at"],
+                        name="consent_token_revoked",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,102 @@
+# Generated by Django 6.1.2 on 2026-10-18 09:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_counters(apps, schema_editor):
+    Consent = apps.get_model("consents", "Consent")
+    ConsentCounter = apps.get_model("consents", "ConsentCounter")
+
+    counts = {}
+    pending = models.Q(status="P")
+    for kind, direction, lookup in (
+        ("asset", "incoming", "dataset"),
+        ("user", "incoming", "dataset__owner"),
+        ("asset", "outgoing", "algorithm"),
+        ("user", "outgoing", "solicitor"),
+    ):
+        rows = (
+            Consent.objects.order_by()
+            .values(lookup)
+            .annotate(
+                total=models.Count("pk"),
+                pending=models.Count("pk", filter=pending),
+            )
+            .values_list(lookup, "pending", "total")
+        )
+        for pk, pending_count, total_count in rows:
+            fields = counts.setdefault((kind, pk), {})
+            fields[f"{direction}_pending"] = pending_count
+            fields[f"{direction}_total"] = total_count
+
+    ConsentCounter.objects.bulk_create(
+        (
+            ConsentCounter(**{f"{kind}_id": pk}, **fields)
+            for (kind, pk), fields in counts.items()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0005_ddo_mirror"),
+        ("consents", "0011_consent_event"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ConsentCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("incoming_pending", models.IntegerField(default=0)),
+                ("incoming_total", models.IntegerField(default=0)),
+                ("outgoing_pending", models.IntegerField(default=0)),
+                ("outgoing_total", models.IntegerField(default=0)),
+                (
+                    "asset",
+                    models.OneToOneField(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="consent_counter",
+                        to="assets.asset",
+                    ),
+                ),
+                (
+                    "user",
+                    models.OneToOneField(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="consent_counter",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "consent_counter",
+                "constraints": [
+                    models.CheckConstraint(
+                        condition=models.Q(
+                            models.Q(("asset__isnull", True), ("user__isnull", False)),
+                            models.Q(("asset__isnull", False), ("user__isnull", True)),
+                            _connector="OR",
+                        ),
+                        name="consent_counter_user_or_asset",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
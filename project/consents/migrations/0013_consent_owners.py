@@ -0,0 +1,55 @@
+# Generated by Django 6.1.2 on 2026-10-18 09:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_owners(apps, schema_editor):
+    Asset = apps.get_model("assets", "Asset")
+    Consent = apps.get_model("consents", "Consent")
+
+    def owner(field):
+        return Subquery(Asset.objects.filter(pk=OuterRef(field)).values("owner")[:1])
+
+    Consent.objects.update(
+        dataset_owner=owner("dataset"),
+        algorithm_owner=owner("algorithm"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0005_ddo_mirror"),
+        ("consents", "0012_consent_counter"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="consent",
+            name="algorithm_owner",
+            field=models.ForeignKey(
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="consent",
+            name="dataset_owner",
+            field=models.ForeignKey(
+                db_index=False,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.RunPython(backfill_owners, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 6.1.2 on 2026-10-18 09:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("consents", "0013_consent_owners"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="consent",
+            name="consent_pending_dataset",
+        ),
+        migrations.AlterField(
+            model_name="consent",
+            name="algorithm_owner",
+            field=models.ForeignKey(
+                editable=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="consent",
+            name="dataset_owner",
+            field=models.ForeignKey(
+                db_index=False,
+                editable=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="consent",
+            index=models.Index(
+                fields=["dataset_owner", "created_at"],
+                name="consent_dataset_owner_created",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="consent",
+            index=models.Index(
+                fields=["solicitor", "created_at"], name="consent_solicitor_created"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="consent",
+            index=models.Index(
+                condition=models.Q(("status", "P")),
+                fields=["dataset_owner", "created_at"],
+                name="consent_pending_dataset_owner",
+            ),
+        ),
+    ]
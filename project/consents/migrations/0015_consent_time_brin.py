@@ -0,0 +1,45 @@
+# Written by hand: BRIN indexes only exist on PostgreSQL
+
+from django.db import migrations
+
+# Consents and responses are mostly appended, in time order, so their
+# timestamps follow the physical order of the rows. A BRIN index keeps the
+# bounds of each range of pages, a few pages for millions of rows, and lets
+# a time window skip every range outside it.
+INDEXES = {
+    "consent_created_at_brin": ("consent", "created_at"),
+    "consent_response_last_updated_at_brin": ("consent_response", "last_updated_at"),
+}
+
+
+def postgresql(*statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == "postgresql":
+            for statement in statements:
+                schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+    # Built concurrently, so writes are not blocked meanwhile
+    atomic = False
+
+    dependencies = [
+        ("consents", "0014_consent_owner_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            postgresql(
+                *(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                    f"ON {table} USING brin ({column})"
+                    for name, (table, column) in INDEXES.items()
+                )
+            ),
+            postgresql(
+                *(f"DROP INDEX CONCURRENTLY IF EXISTS {name}" for name in INDEXES)
+            ),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 6.1.2 on 2026-10-18 09:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+import helpers.bitfields  # noqa: F401, registers the hasbits lookup
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0006_asset_owner_checked_at"),
+        ("consents", "0015_consent_time_brin"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="consent",
+            index=models.Index(
+                condition=models.Q(("request__hasbits", 1)),
+                fields=["created_at", "id"],
+                name="consent_request_bit0",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="consent",
+            index=models.Index(
+                condition=models.Q(("request__hasbits", 2)),
+                fields=["created_at", "id"],
+                name="consent_request_bit1",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="consent",
+            index=models.Index(
+                condition=models.Q(("request__hasbits", 4)),
+                fields=["created_at", "id"],
+                name="consent_request_bit2",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="consentresponse",
+            index=models.Index(
+                condition=models.Q(("permitted__hasbits", 1)),
+                fields=["consent"],
+                name="consent_permitted_bit0",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="consentresponse",
+            index=models.Index(
+                condition=models.Q(("permitted__hasbits", 2)),
+                fields=["consent"],
+                name="consent_permitted_bit1",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="consentresponse",
+            index=models.Index(
+                condition=models.Q(("permitted__hasbits", 4)),
+                fields=["consent"],
+                name="consent_permitted_bit2",
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 6.1.2 on 2026-10-18 10:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("consents", "0016_consent_flag_indexes"),
+    ]
+
+    # ON CONFLICT cannot use a deferrable constraint as its arbiter, which
+    # the batch creation relies on. Nothing defers it anyway
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="consent",
+            name="unique_algorithm_dataset",
+        ),
+        migrations.AddConstraint(
+            model_name="consent",
+            constraint=models.UniqueConstraint(
+                fields=("algorithm", "dataset"), name="unique_algorithm_dataset"
+            ),
+        ),
+    ]
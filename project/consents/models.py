@@ -1,10 +1,18 @@
+import uuid
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+
 from assets.models import Asset
 from bitfield import BitField
+from bitfield.types import BitHandler
 from django.contrib.auth import get_user_model
-from django.db import models
-from django.db.models import constraints
+from django.db import connection, models, transaction
+from django.db.models import Count, F, Q, Value, constraints
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from helpers.bitfields import get_mask
+from helpers.concurrency import transaction_lock
 
 User = get_user_model()
 
@@ -36,7 +44,28 @@ class RequestFlags:
     )
 
 
-class HelperConsentsManager(models.Manager):
+class ConsentQuerySet(models.QuerySet):
+    def pending(self):
+        return self.filter(status=Status.PENDING)
+
+    def with_details(self):
+        """Eager-loads everything the consent serializers touch so that the
+        number of queries does not depend on the number of rows."""
+        return self.select_related(
+            "dataset",
+            "algorithm",
+            "solicitor",
+            "response",
+        )
+
+    def drifted(self):
+        """Consents whose status does not match their response anymore."""
+        return self.alias(
+            expected_status=Coalesce("response__status", Value(Status.PENDING)),
+        ).exclude(status=F("expected_status"))
+
+
+class HelperConsentsManager(models.Manager.from_queryset(ConsentQuerySet)):
     def get_or_create(
         self,
         dataset: Asset,
@@ -54,12 +83,15 @@ class HelperConsentsManager(models.Manager):
             return consent.first()
 
         solicitor = User.helper.get_or_create(solicitor_address)
-        return self.create(
-            dataset=dataset,
-            algorithm=algorithm,
-            solicitor=solicitor,
-            **kwargs,
-        )
+        with transaction.atomic():
+            consent = self.create(
+                dataset=dataset,
+                algorithm=algorithm,
+                solicitor=solicitor,
+                **kwargs,
+            )
+            self._created(consent)
+        return consent
 
     def get_or_create_from_aquarius(
         self,
@@ -78,30 +110,273 @@ class HelperConsentsManager(models.Manager):
         if consent.exists():
             return consent.first()
 
-        dataset = Asset.helper.get_or_create(dataset, Asset.Types.DATASET)
-        algorithm = Asset.helper.get_or_create(algorithm, Asset.Types.ALGORITHM)
-        solicitor_instance = User.helper.get_or_create(solicitor)
+        # Resolve the unknown assets, both at the same time, before opening
+        # the transaction so no connection or lock is held during the calls
+        known = Asset.objects.filter(did__in=(dataset, algorithm))
+        resolved, errors = Asset.helper.resolve_many(
+            {dataset, algorithm} - set(known.values_list("did", flat=True))
+        )
+        if errors:
+            raise next(iter(errors.values()))
 
         request = get_mask(kwargs.pop("request"), Consent)
 
-        return self.create(
-            dataset=dataset,
-            algorithm=algorithm,
-            solicitor=solicitor_instance,
-            request=request,
-            **kwargs,
+        with transaction.atomic():
+            dataset = Asset.helper.get_or_create(
+                dataset, Asset.Types.DATASET, summary=resolved.get(dataset)
+            )
+            algorithm = Asset.helper.get_or_create(
+                algorithm, Asset.Types.ALGORITHM, summary=resolved.get(algorithm)
+            )
+            solicitor_instance = User.helper.get_or_create(solicitor)
+
+            consent = self.create(
+                dataset=dataset,
+                algorithm=algorithm,
+                solicitor=solicitor_instance,
+                request=request,
+                **kwargs,
+            )
+            self._created(consent)
+            return consent
+
+    def bulk_get_or_create_from_aquarius(
+        self,
+        items: list[dict],
+        solicitor: str,
+    ) -> list[dict]:
+        """Creates many consents at once, resolving every unknown DID in
+        Aquarius only once and inserting users, assets and consents in bulk.
+
+        Args:
+            items (list): Dicts with the dataset, algorithm, request and reason.
+            solicitor (str): Address of the solicitor of every consent.
+
+        Returns:
+            list: One result per item, in order, with its status ("created",
+                "exists" or "error") and either the consent or an error detail.
+        """
+        types = {}
+        for item in items:
+            types.setdefault(item["dataset"], Asset.Types.DATASET)
+            types.setdefault(item["algorithm"], Asset.Types.ALGORITHM)
+
+        # Remote resolution happens before any write
+        known = Asset.objects.filter(did__in=types).values_list("did", flat=True)
+        resolved, errors = Asset.helper.resolve_many(types.keys() - set(known))
+
+        with transaction.atomic():
+            solicitor = User.helper.get_or_create(solicitor)
+            assets = Asset.helper.bulk_get_or_create(types, resolved)
+
+            def pairs_in(keys) -> dict[tuple[int, int], Consent]:
+                datasets, algorithms = zip(*keys) if keys else ((), ())
+                return {
+                    (consent.dataset_id, consent.algorithm_id): consent
+                    for consent in self.with_details().filter(
+                        dataset__in=datasets,
+                        algorithm__in=algorithms,
+                    )
+                }
+
+            results, keys, new = [], [], {}
+            for item in items:
+                dataset = assets.get(item["dataset"])
+                algorithm = assets.get(item["algorithm"])
+
+                if dataset is None or algorithm is None:
+                    did = item["dataset"] if dataset is None else item["algorithm"]
+                    error = f"Could not resolve {did} in Aquarius: {errors[did]}"
+                elif dataset.type != Asset.Types.DATASET:
+                    error = f"Asset with DID {dataset.did} is not a dataset"
+                elif algorithm.type != Asset.Types.ALGORITHM:
+                    error = f"Asset with DID {algorithm.did} is not an algorithm"
+                else:
+                    error = None
+
+                key = None if error else (dataset.pk, algorithm.pk)
+                results.append({"status": "error", "detail": error})
+                keys.append(key)
+
+            existing = pairs_in({key for key in keys if key})
+            for key, item in zip(keys, items):
+                if key and key not in existing and key not in new:
+                    dataset, algorithm = (
+                        assets[item["dataset"]],
+                        assets[item["algorithm"]],
+                    )
+                    new[key] = self.model(
+                        dataset=dataset,
+                        algorithm=algorithm,
+                        dataset_owner_id=dataset.owner_id,
+                        algorithm_owner_id=algorithm.owner_id,
+                        solicitor=solicitor,
+                        request=get_mask(item["request"], Consent),
+                        reason=item.get("reason", ""),
+                    )
+
+            # Concurrent inserts of the same pairs are reported below
+            self.bulk_create(new.values(), ignore_conflicts=True)
+            consents = pairs_in(set(new)) | existing
+            self._created(
+                *(
+                    consent
+                    for key, consent in consents.items()
+                    if key in new and consent.solicitor_id == solicitor.pk
+                )
+            )
+
+        for key, result in zip(keys, results):
+            if key is None:
+                continue
+
+            consent = consents.get(key)
+            if consent is None or consent.solicitor_id != solicitor.pk:
+                result["detail"] = (
+                    "The dataset and algorithm pair has already been "
+                    "requested by another solicitor"
+                )
+                continue
+
+            result.pop("detail")
+            result["consent"] = consent
+            result["status"] = "exists" if key in existing else "created"
+            # Repeated pairs within the batch are only created once
+            existing.setdefault(key, consent)
+
+        return results
+
+    def decision(
+        self,
+        dataset: str,
+        algorithm: str,
+        solicitor: str | None = None,
+    ) -> dict | None:
+        """The consent of a dataset and algorithm pair, reduced to what a
+        compute provider needs to allow a job.
+
+        A single row is read through the unique (algorithm, dataset) index,
+        once both DIDs have been looked up in their own unique index.
+
+        Returns:
+            dict | None: The consent id, solicitor address, status and both
+                the request and permitted flags, or None if there is no
+                consent (for the solicitor, if given).
+        """
+        queryset = self.filter(dataset__did=dataset, algorithm__did=algorithm)
+        if solicitor:
+            queryset = queryset.filter(solicitor__address=solicitor)
+
+        row = queryset.values(
+            "id",
+            "status",
+            "request",
+            solicitor_address=F("solicitor__address"),
+            permitted=F("response__permitted"),
+        ).first()
+        return None if row is None else self._with_flags(row)
+
+    def decisions(self, pairs: list[dict]) -> list[dict | None]:
+        """Decisions of many dataset and algorithm pairs at once.
+
+        The pairs are joined as a VALUES list against the same unique
+        indexes decision() reads, so the whole batch is a single query.
+
+        Args:
+            pairs (list): Dicts with the dataset, algorithm and optionally the
+                solicitor, as taken by decision().
+
+        Returns:
+            list: What decision() returns for each pair, in order.
+        """
+        if not pairs:
+            return []
+
+        quote = connection.ops.quote_name
+        values = ", ".join(["(%s, %s, %s)"] * len(pairs))
+        sql = f"""
+            WITH pair (ord, dataset, algorithm) AS (VALUES {values})
+            SELECT pair.ord, c.id, c.status, c.request, u.address, r.permitted
+            FROM pair
+            JOIN {quote(Asset._meta.db_table)} d ON d.did = pair.dataset
+            JOIN {quote(Asset._meta.db_table)} a ON a.did = pair.algorithm
+            JOIN {quote(self.model._meta.db_table)} c
+                ON c.dataset_id = d.id AND c.algorithm_id = a.id
+            JOIN {quote(User._meta.db_table)} u ON u.id = c.solicitor_id
+            LEFT JOIN {quote(ConsentResponse._meta.db_table)} r
+                ON r.consent_id = c.id
+        """
+        params = [
+            value
+            for ord, pair in enumerate(pairs)
+            for value in (ord, pair["dataset"], pair["algorithm"])
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        decisions = [None] * len(pairs)
+        columns = ("id", "status", "request", "solicitor_address", "permitted")
+        for ord, *values in rows:
+            row = dict(zip(columns, values))
+            solicitor = pairs[ord].get("solicitor")
+            if not solicitor or solicitor == row["solicitor_address"]:
+                decisions[ord] = self._with_flags(row)
+        return decisions
+
+    def _with_flags(self, row: dict) -> dict:
+        flags = self.model._meta.get_field("request").flags
+        row["request"] = BitHandler(int(row["request"]), flags)
+        row["permitted"] = BitHandler(int(row["permitted"] or 0), flags)
+        return row
+
+    def _created(self, *consents: "Consent") -> None:
+        """Bookkeeping of new consents, see consents.lifecycle."""
+        ConsentEvent.objects.record(
+            ConsentEvent.Kind.CREATED,
+            {consent.pk: ConsentEvent.created(consent) for consent in consents},
+        )
+        ConsentCounter.objects.track(
+            [consent.pk for consent in consents], pending=1, total=1
         )
 
-    def pending(self):
-        return super().get_queryset().filter(response__isnull=True)
+    def transfer(self, asset: Asset, owner: User) -> int:
+        """Hands an asset over to a new owner, re-pointing the denormalized
+        owner of its consents. The incoming counts of a dataset move from the
+        counters of its previous owner to those of the new one.
+
+        Returns:
+            int: The amount of consents re-pointed.
+        """
+        with transaction.atomic():
+            previous = (
+                Asset.objects.select_for_update()
+                .values_list("owner", flat=True)
+                .get(pk=asset.pk)
+            )
+            asset.owner = owner
+            if previous == owner.pk:
+                return 0
+
+            Asset.objects.filter(pk=asset.pk).update(owner=owner)
+            if asset.type == Asset.Types.ALGORITHM:
+                return self.filter(algorithm=asset).update(algorithm_owner=owner)
+
+            consents = self.filter(dataset=asset)
+            counts = consents.aggregate(
+                pending=Count("pk", filter=Q(status=Status.PENDING)),
+                total=Count("pk"),
+            )
+            ConsentCounter.objects.move(previous, owner.pk, **counts)
+            return consents.update(dataset_owner=owner)
 
     def from_dataset_owner(self, owner: str, pending_only=False):
         queryset = self.pending() if pending_only else self.all()
-        return queryset.filter(dataset__owner=owner)
+        return queryset.filter(dataset_owner=owner)
 
     def from_algorithm_owner(self, owner: str, pending_only=False):
         queryset = self.pending() if pending_only else self.all()
-        return queryset.filter(algorithm__owner=owner)
+        return queryset.filter(algorithm_owner=owner)
 
     def from_solicitor(self, solicitor: str, pending_only=False):
         queryset = self.pending() if pending_only else self.all()
@@ -115,9 +390,50 @@ class Consent(models.Model):
             constraints.UniqueConstraint(
                 fields=["algorithm", "dataset"],
                 name="unique_algorithm_dataset",
-                deferrable=models.Deferrable.IMMEDIATE,
             )
         ]
+        # Time windows also use a BRIN index on PostgreSQL, see migration 0015
+        indexes = [
+            models.Index(
+                fields=["created_at", "id"],
+                name="consent_created_at_id",
+            ),
+            models.Index(fields=["request"]),
+            # Inboxes, matched on the denormalized owner without any join
+            models.Index(
+                fields=["dataset_owner", "created_at"],
+                name="consent_dataset_owner_created",
+            ),
+            models.Index(
+                fields=["solicitor", "created_at"],
+                name="consent_solicitor_created",
+            ),
+            # Status filter, listed newest first
+            models.Index(
+                fields=["status", "created_at", "id"],
+                name="consent_status_created",
+            ),
+            # Pending inboxes
+            models.Index(
+                fields=["dataset_owner", "created_at"],
+                condition=Q(status=Status.PENDING),
+                name="consent_pending_dataset_owner",
+            ),
+            models.Index(
+                fields=["solicitor", "created_at"],
+                condition=Q(status=Status.PENDING),
+                name="consent_pending_solicitor",
+            ),
+            # Requested flags, one index per flag, see helpers.bitfields.HasBits
+            *(
+                models.Index(
+                    fields=["created_at", "id"],
+                    condition=Q(request__hasbits=1 << bit),
+                    name=f"consent_request_bit{bit}",
+                )
+                for bit in range(len(RequestFlags.flags))
+            ),
+        ]
 
     # === Managers ===
     objects = models.Manager()
@@ -144,32 +460,65 @@ class Consent(models.Model):
         related_name="consents",
     )
 
+    # Denormalized from the assets on creation, see HelperConsentsManager.transfer
+    dataset_owner = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="+",
+        editable=False,
+        db_index=False,  # Leads the consent_dataset_owner_created index
+    )
+
+    algorithm_owner = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="+",
+        editable=False,
+    )
+
     request = BitField(flags=RequestFlags.flags)
 
+    # Denormalized from the response, kept in sync by consents.lifecycle
+    status = models.CharField(
+        max_length=1,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return f"{self.solicitor} -> {self.dataset} & {self.algorithm} ({self.status})"
+        return f"{self.solicitor} -> {self.dataset} & {self.algorithm} ({self.get_status_display()})"
+
+    def save(self, *args, **kwargs):
+        if self.dataset_owner_id is None:
+            self.dataset_owner_id = self.dataset.owner_id
+        if self.algorithm_owner_id is None:
+            self.algorithm_owner_id = self.algorithm.owner_id
+        super().save(*args, **kwargs)
 
     @property
     def timestamp(self) -> float:
         return self.created_at.timestamp()
 
-    @property
-    def status(self) -> Status:
-        query = ConsentResponse.objects.filter(consent=self)
-
-        return (
-            query.first().get_status_display()
-            if query.exists()
-            else Status.PENDING.label
-        )
-
 
 class ConsentResponse(models.Model):
     class Meta:
         db_table = "consent_response"
         verbose_name_plural = "consent responses"
+        # Time windows use a BRIN index on PostgreSQL, see migration 0015
+        indexes = [
+            models.Index(fields=["status"]),
+            # Permitted flags, one index per flag, see helpers.bitfields.HasBits
+            *(
+                models.Index(
+                    fields=["consent"],
+                    condition=Q(permitted__hasbits=1 << bit),
+                    name=f"consent_permitted_bit{bit}",
+                )
+                for bit in range(len(RequestFlags.flags))
+            ),
+        ]
 
     consent = models.OneToOneField(
         Consent,
@@ -196,3 +545,329 @@ class ConsentResponse(models.Model):
     @property
     def timestamp(self) -> float:
         return self.last_updated_at.timestamp()
+
+
+class ConsentSubmission(models.Model):
+    """A consent petition accepted asynchronously. Stays resolving until a
+    worker resolves its assets in Aquarius and creates the consent."""
+
+    class State(models.TextChoices):
+        RESOLVING = "resolving", _("Resolving")
+        CREATED = "created", _("Created")
+        FAILED = "failed", _("Failed")
+
+    class Meta:
+        db_table = "consent_submission"
+        indexes = [
+            models.Index(
+                fields=["next_attempt_at"],
+                condition=Q(state="resolving"),
+                name="consent_submission_due",
+            ),
+        ]
+
+    solicitor = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="consent_submissions",
+    )
+    dataset = models.CharField(max_length=255)
+    algorithm = models.CharField(max_length=255)
+    request = BitField(flags=RequestFlags.flags)
+    reason = models.TextField(blank=True)
+    callback_url = models.URLField(blank=True)
+
+    state = models.CharField(
+        max_length=10,
+        choices=State.choices,
+        default=State.RESOLVING,
+    )
+    consent = models.ForeignKey(
+        Consent,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="submissions",
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.solicitor} -> {self.dataset} & {self.algorithm} ({self.state})"
+
+
+class ConsentToken(models.Model):
+    """A signed decision issued for an accepted or resolved consent, see
+    consents.tokens. Kept after its consent is deleted so its revocation is
+    still published until it expires."""
+
+    class Meta:
+        db_table = "consent_token"
+        indexes = [
+            models.Index(fields=["consent", "expires_at"]),
+            models.Index(
+                fields=["expires_at"],
+                condition=Q(revoked_at__isnull=False),
+                name="consent_token_revoked",
+            ),
+        ]
+
+    jti = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+
+    consent = models.ForeignKey(
+        Consent,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="tokens",
+    )
+
+    permitted = BitField(flags=RequestFlags.flags)
+
+    issued_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField()
+    revoked_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.jti} ({self.consent_id})"
+
+
+class ConsentEventManager(models.Manager):
+    def record(self, kind: str, changes: dict[int, dict]) -> None:
+        """Appends an event of `kind` for each consent id, with the data that
+        changed. Must run inside the transaction making the changes.
+
+        Writers are serialized until they commit, so ids become visible in
+        increasing order and a reader past an id never misses a later
+        commit with a lower one.
+        """
+        if not changes:
+            return
+
+        transaction_lock("consent_events")
+        self.bulk_create(
+            self.model(consent_id=consent, kind=kind, data=data)
+            for consent, data in changes.items()
+        )
+
+
+class ConsentEvent(models.Model):
+    """Append-only log of the changes of every consent, read by mirrors with
+    its id as the cursor. Deletions stay as tombstones."""
+
+    class Kind(models.TextChoices):
+        CREATED = "created", _("Created")
+        RESPONDED = "responded", _("Responded")
+        RESPONSE_DELETED = "response_deleted", _("Response deleted")
+        DELETED = "deleted", _("Deleted")
+
+    class Meta:
+        db_table = "consent_event"
+
+    objects = ConsentEventManager()
+
+    # Not a foreign key, the events outlive their consent
+    consent_id = models.BigIntegerField()
+    kind = models.CharField(max_length=16, choices=Kind.choices)
+    data = models.JSONField(default=dict)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"#{self.pk} {self.kind} {self.consent_id}"
+
+    @property
+    def timestamp(self) -> float:
+        return self.created_at.timestamp()
+
+    @staticmethod
+    def created(consent: Consent) -> dict:
+        return {
+            "dataset": consent.dataset.did,
+            "algorithm": consent.algorithm.did,
+            "solicitor": consent.solicitor.address,
+            "reason": consent.reason,
+            "request": int(consent.request),
+            "status": str(consent.get_status_display()),
+        }
+
+    @staticmethod
+    def responded(response: ConsentResponse) -> dict:
+        return {
+            "status": str(response.get_status_display()),
+            "permitted": int(response.permitted),
+            "response_reason": response.reason,
+        }
+
+
+class ConsentCounterManager(models.Manager):
+    COUNTS = (
+        "incoming_pending",
+        "incoming_total",
+        "outgoing_pending",
+        "outgoing_total",
+    )
+
+    def track(self, consents: Iterable[int], pending: int = 0, total: int = 0) -> None:
+        """Adds `pending` and `total` to the counters of the assets and users
+        of the given consents. Must run inside the transaction changing them,
+        before they are deleted.
+
+        Incoming counts are those of datasets and their owners, outgoing ones
+        those of algorithms and solicitors.
+        """
+        if not pending and not total:
+            return
+
+        # How many of the consents each counter is affected by
+        times = Counter()
+        for dataset, owner, algorithm, solicitor in Consent.objects.filter(
+            pk__in=consents
+        ).values_list("dataset", "dataset_owner", "algorithm", "solicitor"):
+            times["asset", dataset, "incoming"] += 1
+            times["user", owner, "incoming"] += 1
+            times["asset", algorithm, "outgoing"] += 1
+            times["user", solicitor, "outgoing"] += 1
+        if not times:
+            return
+
+        # Make sure every row exists, then update those changing alike at once.
+        # Always in the same order, so concurrent writers do not deadlock
+        rows = sorted({(kind, pk) for kind, pk, direction in times})
+        self.bulk_create(
+            (self.model(**{f"{kind}_id": pk}) for kind, pk in rows),
+            ignore_conflicts=True,
+        )
+        groups = defaultdict(list)
+        for (kind, pk, direction), n in times.items():
+            groups[kind, direction, n].append(pk)
+
+        for (kind, direction, n), pks in sorted(groups.items()):
+            self.filter(**{f"{kind}__in": pks}).update(
+                **{
+                    f"{direction}_pending": F(f"{direction}_pending") + pending * n,
+                    f"{direction}_total": F(f"{direction}_total") + total * n,
+                }
+            )
+
+    def move(self, source: int, target: int, pending: int, total: int) -> None:
+        """Moves incoming counts from the counter of a user to another's, as
+        when a dataset changes hands."""
+        if not pending and not total:
+            return
+
+        self.bulk_create(
+            [self.model(user_id=pk) for pk in sorted((source, target))],
+            ignore_conflicts=True,
+        )
+        for pk, sign in sorted(((source, -1), (target, 1))):
+            self.filter(user=pk).update(
+                incoming_pending=F("incoming_pending") + sign * pending,
+                incoming_total=F("incoming_total") + sign * total,
+            )
+
+    def expected(self) -> dict[tuple[str, int], dict[str, int]]:
+        """Counts computed from the consents, by ("user" or "asset", pk)."""
+        counts = defaultdict(lambda: dict.fromkeys(self.COUNTS, 0))
+        pending = Q(status=Status.PENDING)
+        for kind, direction, lookup in (
+            ("asset", "incoming", "dataset"),
+            ("user", "incoming", "dataset_owner"),
+            ("asset", "outgoing", "algorithm"),
+            ("user", "outgoing", "solicitor"),
+        ):
+            rows = (
+                Consent.objects.order_by()
+                .values(lookup)
+                .annotate(total=Count("pk"), pending=Count("pk", filter=pending))
+                .values_list(lookup, "pending", "total")
+            )
+            for pk, pending_count, total_count in rows:
+                counts[kind, pk][f"{direction}_pending"] = pending_count
+                counts[kind, pk][f"{direction}_total"] = total_count
+        return dict(counts)
+
+    def drifted(self) -> list[tuple[str, int]]:
+        """Users and assets whose counters do not match their consents."""
+        expected = self.expected()
+        actual = {
+            ("user" if user else "asset", user or asset): dict(zip(self.COUNTS, counts))
+            for user, asset, *counts in self.values_list("user", "asset", *self.COUNTS)
+        }
+
+        zero = dict.fromkeys(self.COUNTS, 0)
+        return sorted(
+            key
+            for key in expected.keys() | actual.keys()
+            if expected.get(key, zero) != actual.get(key, zero)
+        )
+
+    @transaction.atomic
+    def rebuild(self) -> int:
+        """Recomputes every counter from the consents.
+
+        On PostgreSQL the table is locked first, so changes made meanwhile
+        wait and apply their increments on top of the rebuilt counts.
+
+        Returns:
+            int: The amount of counters.
+        """
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"LOCK TABLE {connection.ops.quote_name(self.model._meta.db_table)}"
+                    " IN EXCLUSIVE MODE"
+                )
+
+        counts = self.expected()
+        self.all().delete()
+        self.bulk_create(
+            (
+                self.model(**{f"{kind}_id": pk}, **fields)
+                for (kind, pk), fields in counts.items()
+            ),
+            batch_size=1000,
+        )
+        return len(counts)
+
+
+class ConsentCounter(models.Model):
+    """Consent counts of a user or an asset, kept up to date as consents
+    change so they are read in O(1). Incoming counts are those of the
+    datasets (and their owners), outgoing ones those of the algorithms (and
+    the solicitors)."""
+
+    class Meta:
+        db_table = "consent_counter"
+        constraints = [
+            constraints.CheckConstraint(
+                condition=Q(user__isnull=False, asset__isnull=True)
+                | Q(user__isnull=True, asset__isnull=False),
+                name="consent_counter_user_or_asset",
+            )
+        ]
+
+    objects = ConsentCounterManager()
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        related_name="consent_counter",
+    )
+    asset = models.OneToOneField(
+        Asset,
+        on_delete=models.CASCADE,
+        null=True,
+        related_name="consent_counter",
+    )
+
+    # Not unsigned, drift (fixed by reconcile_consent_counters) must not fail writes
+    incoming_pending = models.IntegerField(default=0)
+    incoming_total = models.IntegerField(default=0)
+    outgoing_pending = models.IntegerField(default=0)
+    outgoing_total = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user or self.asset} counters"
@@ -0,0 +1,179 @@
+"""Reconciliation of the asset owners with Aquarius.
+
+Asset owners are copied from Aquarius when an asset is first seen, but its
+NFT may change hands afterwards. The reconciler checks the owners again,
+those never checked first and then the stalest, spacing the Aquarius
+requests to a bounded rate. Each chunk of assets is applied in its own
+transaction: the ones that changed hands are transferred along with their
+consents (see HelperConsentsManager.transfer) and every checked asset is
+stamped with `owner_checked_at`, so an interrupted run resumes with the
+assets it did not get to.
+"""
+
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from assets.models import Asset, DdoMirror
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from helpers.config import config
+from helpers.metrics import metrics
+from helpers.services.aquarius import (
+    AquariusError,
+    AquariusUnavailable,
+    DdoSummary,
+    aquarius,
+)
+
+from consents.models import Consent
+
+User = get_user_model()
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Progress:
+    checked: int = 0
+    transferred: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Assets checked per second."""
+        return self.checked / self.elapsed if self.elapsed else 0.0
+
+
+class Throttle:
+    """Spaces the calls to `wait` so that at most `rate` return per second."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1 / rate if rate > 0 else 0.0
+        self.next_at = time.monotonic()
+
+    def wait(self) -> None:
+        now = time.monotonic()
+        if now < self.next_at:
+            time.sleep(self.next_at - now)
+        self.next_at = max(now, self.next_at) + self.interval
+
+
+def stale(checked_before: datetime, limit: int) -> list[Asset]:
+    """The next assets to check, those never checked and then those checked
+    the longest ago, before `checked_before`. Both read the
+    asset_owner_checked_at index in order."""
+    assets = Asset.objects.select_related("owner")
+    never = list(assets.filter(owner_checked_at__isnull=True).order_by("pk")[:limit])
+    if len(never) == limit:
+        return never
+
+    return never + list(
+        assets.filter(owner_checked_at__lt=checked_before).order_by(
+            "owner_checked_at", "pk"
+        )[: limit - len(never)]
+    )
+
+
+def apply(assets: list[Asset], summaries: dict[int, DdoSummary]) -> list[Asset]:
+    """Transfers the assets whose owner changed and stamps every given one
+    as checked, in a single transaction.
+
+    Returns:
+        list: The transferred assets.
+    """
+    changed = [
+        asset
+        for asset in assets
+        if asset.pk in summaries and summaries[asset.pk].owner != asset.owner.address
+    ]
+    with transaction.atomic():
+        owners = User.helper.bulk_get_or_create(
+            summaries[asset.pk].owner for asset in changed
+        )
+        for asset in changed:
+            Consent.helper.transfer(asset, owners[summaries[asset.pk].owner])
+
+        DdoMirror.objects.upsert(summaries.values())
+        Asset.objects.filter(pk__in=[asset.pk for asset in assets]).update(
+            owner_checked_at=timezone.now()
+        )
+    return changed
+
+
+def reconcile(
+    limit: int | None = None,
+    batch_size: int | None = None,
+    rate: float | None = None,
+    interval: float | None = None,
+    report: Callable[[Progress], None] | None = None,
+) -> Progress:
+    """Checks the owner of up to `limit` assets (every stale one if None)
+    against Aquarius. Assets whose check fails are stamped as well, to be
+    checked again after `interval` like the rest.
+
+    Args:
+        limit (int): The maximum amount of assets to check.
+        batch_size (int): The assets checked per transaction.
+        rate (float): The maximum Aquarius requests per second.
+        interval (float): Seconds before a checked owner is stale again.
+        report (callable): Called with the progress after each chunk.
+
+    Raises:
+        AquariusUnavailable: If the Aquarius circuit breaker opened. The
+            assets checked until then are applied first.
+    """
+    batch_size = batch_size or config.ASSET_OWNER_CHECK_BATCH_SIZE
+    throttle = Throttle(config.ASSET_OWNER_CHECK_RATE if rate is None else rate)
+    if interval is None:
+        interval = config.ASSET_OWNER_CHECK_INTERVAL
+    checked_before = timezone.now() - timedelta(seconds=interval)
+
+    progress, started = Progress(), time.monotonic()
+    while limit is None or progress.checked < limit:
+        size = (
+            batch_size if limit is None else min(batch_size, limit - progress.checked)
+        )
+        assets = stale(checked_before, size)
+        if not assets:
+            break
+
+        # Aquarius is called with no transaction open
+        summaries, unavailable = {}, None
+        for n, asset in enumerate(assets):
+            throttle.wait()
+            try:
+                summaries[asset.pk] = aquarius.fetch_ddo_summary(asset.did)
+            except AquariusUnavailable as e:
+                unavailable, assets = e, assets[:n]
+                break
+            except AquariusError as e:
+                progress.errors += 1
+                metrics.inc("asset_owner_check_errors_total")
+                logger.warning("Could not check the owner of %s: %s", asset.did, e)
+
+        transferred = apply(assets, summaries)
+        for asset in transferred:
+            aquarius.invalidate(asset.did)
+
+        progress.checked += len(assets)
+        progress.transferred += len(transferred)
+        progress.elapsed = time.monotonic() - started
+        metrics.inc("asset_owner_checks_total", len(assets))
+        metrics.inc("asset_owner_transfers_total", len(transferred))
+        if report is not None:
+            report(progress)
+
+        if unavailable is not None:
+            raise unavailable
+
+    metrics.set(
+        "asset_owner_stale",
+        Asset.objects.filter(owner_checked_at__isnull=True).count()
+        + Asset.objects.filter(owner_checked_at__lt=checked_before).count(),
+    )
+    return progress
@@ -1,10 +1,14 @@
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import transaction
 from helpers.bitfields import get_mask
+from helpers.config import config
 from helpers.fields.BitField import BitFieldSerializer
 from helpers.validators.BitFieldMarked import BitFieldMarked
+from helpers.validators.CallbackUrlValidator import CallbackUrlValidator
 from helpers.validators.DidLengthValidator import DidLengthValidator
 from rest_framework.exceptions import ValidationError
+from rest_framework.reverse import reverse
 from rest_framework.serializers import (
     CharField,
     HyperlinkedIdentityField,
@@ -12,13 +16,23 @@ from rest_framework.serializers import (
     HyperlinkedRelatedField,
     IntegerField,
     ModelSerializer,
+    Serializer,
     SerializerMethodField,
+    URLField,
 )
 from rest_framework_nested.relations import NestedHyperlinkedRelatedField
 from rest_framework_nested.serializers import NestedHyperlinkedModelSerializer
 from users.serializers import ListUserSerializer
 
-from consents.models import Consent, ConsentResponse, Status
+from consents import lifecycle, submissions, tokens
+from consents.models import (
+    Consent,
+    ConsentEvent,
+    ConsentResponse,
+    ConsentSubmission,
+    ConsentToken,
+    Status,
+)
 
 User = get_user_model()
 
@@ -66,7 +80,7 @@ class ListConsent(HyperlinkedModelSerializer):
     created_at = IntegerField(source="timestamp")
     request = BitFieldSerializer()
     response = DetailConsentResponse()
-    status = CharField()
+    status = CharField(source="get_status_display")
     direction = SerializerMethodField()
 
     class Meta:
@@ -151,9 +165,10 @@ class CreateConsent(ModelSerializer):
         ).data
         return representation
 
-    @transaction.atomic  # Ensure that the whole DB transaction is atomic. If any operation fails ROLLBACK.
     def create(self, validated_data):
         # TODO: Before creating the consent, check if the permissions asked for is already granted in aquarius.
+        # Not atomic on purpose: the manager resolves the assets remotely first
+        # and only then opens a short transaction for the inserts.
         solicitor = self.context["request"].user.address
         return Consent.helper.get_or_create_from_aquarius(
             dataset=validated_data.pop("dataset"),
@@ -163,6 +178,230 @@ class CreateConsent(ModelSerializer):
         )
 
 
+class ConsentDecision(Serializer):
+    """Whether an algorithm may run on a dataset. Validates the query of the
+    decision endpoint and represents it along with its consent, if any."""
+
+    dataset = CharField(validators=[DidLengthValidator()])
+    algorithm = CharField(validators=[DidLengthValidator()])
+    solicitor = CharField(required=False)
+
+    def to_representation(self, instance):
+        consent = instance.get("consent")
+        if consent is None:
+            return {
+                "dataset": instance["dataset"],
+                "algorithm": instance["algorithm"],
+                "solicitor": instance.get("solicitor"),
+                "consent": None,
+                "allowed": False,
+                "status": None,
+                "request": {},
+                "permitted": {},
+                "permitted_mask": 0,
+            }
+
+        status = Status(consent["status"])
+        allowed = status in (Status.ACCEPTED, Status.RESOLVED)
+        flags = BitFieldSerializer()
+        return {
+            "dataset": instance["dataset"],
+            "algorithm": instance["algorithm"],
+            "solicitor": consent["solicitor_address"],
+            "consent": reverse(
+                "consents-detail",
+                args=[consent["id"]],
+                request=self.context.get("request"),
+            ),
+            "allowed": allowed,
+            "status": str(status.label),
+            "request": flags.to_representation(consent["request"]),
+            "permitted": flags.to_representation(consent["permitted"]),
+            "permitted_mask": int(consent["permitted"]) if allowed else 0,
+        }
+
+
+class BatchConsentDecision(Serializer):
+    pairs = ConsentDecision(
+        many=True,
+        allow_empty=False,
+        max_length=config.CONSENT_DECISION_BATCH_LIMIT,
+    )
+
+    def to_representation(self, instance):
+        decision = ConsentDecision(context=self.context)
+        return {
+            "results": [
+                {"index": index, **decision.to_representation(item)}
+                for index, item in enumerate(instance)
+            ]
+        }
+
+
+class ConsentTokenSerializer(ModelSerializer):
+    jti = SerializerMethodField()
+    token = SerializerMethodField()
+    issued_at = SerializerMethodField()
+    expires_at = SerializerMethodField()
+
+    class Meta:
+        model = ConsentToken
+        fields = (
+            "jti",
+            "token",
+            "issued_at",
+            "expires_at",
+        )
+
+    def get_jti(self, obj) -> str:
+        return obj.jti.hex
+
+    def get_token(self, obj) -> str:
+        return tokens.encode(obj)
+
+    def get_issued_at(self, obj) -> int:
+        return int(obj.issued_at.timestamp())
+
+    def get_expires_at(self, obj) -> int:
+        return int(obj.expires_at.timestamp())
+
+
+class RevokedConsentToken(ModelSerializer):
+    jti = SerializerMethodField()
+    revoked_at = SerializerMethodField()
+    expires_at = SerializerMethodField()
+
+    class Meta:
+        model = ConsentToken
+        fields = (
+            "jti",
+            "revoked_at",
+            "expires_at",
+        )
+
+    def get_jti(self, obj) -> str:
+        return obj.jti.hex
+
+    def get_revoked_at(self, obj) -> float:
+        return obj.revoked_at.timestamp()
+
+    def get_expires_at(self, obj) -> int:
+        return int(obj.expires_at.timestamp())
+
+
+class ConsentEventSerializer(ModelSerializer):
+    cursor = IntegerField(source="id")
+    consent = IntegerField(source="consent_id")
+    created_at = IntegerField(source="timestamp")
+
+    class Meta:
+        model = ConsentEvent
+        fields = (
+            "cursor",
+            "kind",
+            "consent",
+            "created_at",
+            "data",
+        )
+
+
+class ConsentSubmissionSerializer(ModelSerializer):
+    url = SerializerMethodField()
+    request = BitFieldSerializer()
+    consent = HyperlinkedRelatedField(
+        view_name="consents-detail",
+        read_only=True,
+    )
+
+    class Meta:
+        model = ConsentSubmission
+        fields = (
+            "id",
+            "url",
+            "state",
+            "dataset",
+            "algorithm",
+            "request",
+            "reason",
+            "consent",
+            "attempts",
+            "last_error",
+        )
+
+    def get_url(self, obj) -> str:
+        return reverse(
+            "consents-submission",
+            kwargs={"submission_pk": obj.pk},
+            request=self.context.get("request"),
+        )
+
+
+class CreateConsentSubmission(ModelSerializer):
+    dataset = CharField(validators=[DidLengthValidator()])
+    algorithm = CharField(validators=[DidLengthValidator()])
+    request = BitFieldSerializer()
+    reason = CharField(required=False)
+    callback_url = URLField(required=False, validators=[CallbackUrlValidator()])
+
+    class Meta:
+        model = ConsentSubmission
+        fields = (
+            "reason",
+            "dataset",
+            "algorithm",
+            "request",
+            "callback_url",
+        )
+
+    def to_representation(self, instance):
+        return ConsentSubmissionSerializer(instance, context=self.context).data
+
+    def create(self, validated_data):
+        # Nothing is resolved here, a background job picks the submission up
+        with transaction.atomic():
+            submission = ConsentSubmission.objects.create(
+                solicitor=self.context["request"].user,
+                request=get_mask(validated_data.pop("request"), Consent),
+                **validated_data,
+            )
+            submissions.schedule(submission)
+        return submission
+
+
+class CreateConsentItem(Serializer):
+    dataset = CharField(validators=[DidLengthValidator()])
+    algorithm = CharField(validators=[DidLengthValidator()])
+    request = BitFieldSerializer()
+    reason = CharField(required=False, allow_blank=True)
+
+
+class BatchCreateConsent(Serializer):
+    items = CreateConsentItem(
+        many=True,
+        allow_empty=False,
+        max_length=config.CONSENT_BATCH_LIMIT,
+    )
+
+    def create(self, validated_data):
+        solicitor = self.context["request"].user.address
+        return Consent.helper.bulk_get_or_create_from_aquarius(
+            validated_data["items"],
+            solicitor=solicitor,
+        )
+
+    def to_representation(self, instance):
+        results = []
+        for index, result in enumerate(instance):
+            result = {"index": index, **result}
+            if "consent" in result:
+                result["consent"] = DetailConsent(
+                    result["consent"],
+                    context={"request": self.context.get("request")},
+                ).data
+            results.append(result)
+        return {"results": results}
+
+
 class CreateConsentResponse(NestedHyperlinkedModelSerializer):
     permitted = BitFieldSerializer()
     reason = CharField(required=False, allow_blank=True)
@@ -177,13 +416,11 @@ class CreateConsentResponse(NestedHyperlinkedModelSerializer):
     def create(self, validated_data):
         # Get the consent instance from the context
         consent_pk = self.context["view"].kwargs["consent_pk"]
-        consent_instance = Consent.objects.select_related(
-            "dataset", "dataset__owner"
-        ).get(pk=consent_pk)
+        consent_instance = Consent.objects.get(pk=consent_pk)
 
         # Ownership check
         request_user = self.context["request"].user
-        if consent_instance.dataset.owner != request_user:
+        if consent_instance.dataset_owner_id != request_user.pk:
             raise ValidationError(
                 "You are not the owner of the dataset",
                 code="forbidden",
@@ -209,4 +446,84 @@ class CreateConsentResponse(NestedHyperlinkedModelSerializer):
         # Attach the consent instance
         validated_data["consent"] = consent_instance
 
-        return super().create(validated_data)
+        instance = super().create(validated_data)
+        lifecycle.responded(instance)
+        return instance
+
+
+class CreateConsentResponseItem(Serializer):
+    consent = IntegerField()
+    permitted = BitFieldSerializer()
+    reason = CharField(required=False, allow_blank=True)
+
+
+class BulkCreateConsentResponse(Serializer):
+    items = CreateConsentResponseItem(
+        many=True,
+        allow_empty=False,
+        max_length=config.CONSENT_BATCH_LIMIT,
+    )
+
+    @transaction.atomic
+    def create(self, validated_data):
+        items = validated_data["items"]
+        request_user = self.context["request"].user
+
+        # Ownership and already responded state of every consent in one query
+        consents = {
+            consent["id"]: consent
+            for consent in Consent.objects.select_for_update(of=("self",))
+            .filter(pk__in={item["consent"] for item in items})
+            .values("id", "request", "dataset_owner", "response")
+        }
+
+        results, responses = [], []
+        for item in items:
+            consent = consents.get(item["consent"])
+            result = {"consent": item["consent"], "status": "error"}
+            results.append(result)
+
+            if consent is None:
+                result["detail"] = "Consent not found"
+                continue
+
+            if consent["dataset_owner"] != request_user.pk:
+                result["detail"] = "You are not the owner of the dataset"
+                continue
+
+            if consent["response"] is not None:
+                result["detail"] = "Consent already has been responded to"
+                continue
+
+            # Validate that the permitted field response has been requested
+            permitted_mask = get_mask(item["permitted"], Consent)
+            try:
+                BitFieldMarked(consent["request"])(permitted_mask)
+            except DjangoValidationError as e:
+                result["detail"] = e.messages[0]
+                continue
+
+            response = ConsentResponse(
+                consent_id=consent["id"],
+                permitted=permitted_mask,
+                reason=item.get("reason", ""),
+                status=Status.from_bitfields(consent["request"], permitted_mask),
+            )
+            # Repeated consents within the same batch are answered once
+            consent["response"] = response
+            responses.append(response)
+
+            result["status"] = "created"
+            result["consent_status"] = response.get_status_display()
+
+        ConsentResponse.objects.bulk_create(responses)
+        lifecycle.responded(*responses)
+
+        return results
+
+    def to_representation(self, instance):
+        return {
+            "results": [
+                {"index": index, **result} for index, result in enumerate(instance)
+            ]
+        }
@@ -0,0 +1,167 @@
+"""Background resolution of the consent petitions accepted asynchronously.
+
+Each submission is resolved by a `consents.resolve_submission` job, which
+claims it, resolves its assets in Aquarius with no transaction open and
+creates the consent. Transient Aquarius failures are retried with exponential
+backoff, anything else fails the submission.
+"""
+
+import logging
+from collections.abc import Callable
+from datetime import timedelta
+
+import requests
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from helpers.config import config
+from helpers.services.aquarius import AquariusError, AquariusUnavailable
+from helpers.validators.CallbackUrlValidator import CallbackUrlValidator
+from jobs.models import Job
+from rest_framework.exceptions import ValidationError
+
+from consents.models import Consent, ConsentSubmission
+
+logger = logging.getLogger(__name__)
+
+
+def backoff(attempts: int) -> timedelta:
+    seconds = config.CONSENT_SUBMISSION_BACKOFF * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(seconds, config.CONSENT_SUBMISSION_MAX_BACKOFF))
+
+
+def schedule(submission: ConsentSubmission) -> None:
+    """Queues the resolution of a submission for its next attempt, once the
+    current transaction commits."""
+    transaction.on_commit(
+        lambda: Job.objects.enqueue(
+            "consents.resolve_submission",
+            {"submission": submission.pk},
+            run_at=submission.next_attempt_at,
+        )
+    )
+
+
+def claim(pk: int | None = None) -> ConsentSubmission | None:
+    """Takes a due submission, the oldest one unless `pk` is given, skipping
+    those other workers hold.
+
+    The attempt is counted and the next one scheduled right away, so the
+    submission is retried later if this worker dies while resolving it.
+    """
+    with transaction.atomic():
+        due = ConsentSubmission.objects.select_for_update(skip_locked=True).filter(
+            state=ConsentSubmission.State.RESOLVING,
+            next_attempt_at__lte=timezone.now(),
+        )
+        if pk is not None:
+            due = due.filter(pk=pk)
+        submission = due.order_by("next_attempt_at").first()
+        if submission is None:
+            return None
+
+        submission.attempts += 1
+        submission.next_attempt_at = timezone.now() + backoff(submission.attempts)
+        submission.save(update_fields=["attempts", "next_attempt_at", "updated_at"])
+        return submission
+
+
+def process(pk: int) -> None:
+    submission = claim(pk)
+    if submission is not None:
+        resolve(submission)
+
+
+def process_due(limit: int = 100, report: Callable[[int], None] | None = None) -> int:
+    """Resolves up to `limit` due submissions, catching up with those whose
+    job was lost. `report` is called with the amount processed so far after
+    each one. Returns how many it processed."""
+    processed = 0
+    while processed < limit and (submission := claim()) is not None:
+        resolve(submission)
+        processed += 1
+        if report is not None:
+            report(processed)
+    return processed
+
+
+def resolve(submission: ConsentSubmission) -> None:
+    try:
+        consent = Consent.helper.get_or_create_from_aquarius(
+            dataset=submission.dataset,
+            algorithm=submission.algorithm,
+            solicitor=submission.solicitor.address,
+            request=int(submission.request),
+            reason=submission.reason,
+        )
+    except AquariusError as e:
+        if (
+            e.status_code == 404
+            or submission.attempts >= config.CONSENT_SUBMISSION_MAX_ATTEMPTS
+        ):
+            fail(submission, str(e))
+            return
+
+        submission.last_error = str(e)
+        if isinstance(e, AquariusUnavailable):
+            # No point in trying again before the circuit lets calls through
+            retry_at = timezone.now() + timedelta(seconds=e.retry_after)
+            submission.next_attempt_at = max(submission.next_attempt_at, retry_at)
+        with transaction.atomic():
+            submission.save(
+                update_fields=["last_error", "next_attempt_at", "updated_at"]
+            )
+            schedule(submission)
+        return
+    except ValueError as e:
+        fail(submission, str(e))
+        return
+    except IntegrityError:
+        # The pair is unique, whoever requested it
+        fail(
+            submission,
+            "The dataset and algorithm pair has already been "
+            "requested by another solicitor",
+        )
+        return
+
+    submission.state = ConsentSubmission.State.CREATED
+    submission.consent = consent
+    submission.last_error = ""
+    submission.save(update_fields=["state", "consent", "last_error", "updated_at"])
+    notify(submission)
+
+
+def fail(submission: ConsentSubmission, error: str) -> None:
+    submission.state = ConsentSubmission.State.FAILED
+    submission.last_error = error
+    submission.save(update_fields=["state", "last_error", "updated_at"])
+    notify(submission)
+
+
+def notify(submission: ConsentSubmission) -> None:
+    """Posts the outcome to the callback URL of the submission, if any. Best
+    effort: clients can always poll the submission instead."""
+    if not submission.callback_url:
+        return
+
+    # Checked again, the host may resolve elsewhere since it was submitted
+    try:
+        CallbackUrlValidator()(submission.callback_url)
+    except ValidationError as e:
+        logger.warning("Not notifying submission %s: %s", submission.pk, e)
+        return
+
+    try:
+        requests.post(
+            submission.callback_url,
+            json={
+                "id": submission.pk,
+                "state": submission.state,
+                "consent": submission.consent_id,
+                "error": submission.last_error or None,
+            },
+            timeout=(config.AQUARIUS_CONNECT_TIMEOUT, config.AQUARIUS_READ_TIMEOUT),
+            allow_redirects=False,
+        )
+    except requests.RequestException as e:
+        logger.warning("Could not notify submission %s: %s", submission.pk, e)
@@ -0,0 +1,34 @@
+from datetime import timedelta
+
+from helpers.config import config
+from jobs.registry import task
+from jobs.worker import heartbeat
+
+from consents import owners, submissions, tokens
+
+
+# Attempts are counted by the submission, which schedules its own retries
+@task("consents.resolve_submission", max_attempts=1)
+def resolve_submission(submission: int):
+    submissions.process(submission)
+
+
+@task("consents.process_due_submissions", every=timedelta(minutes=1))
+def process_due_submissions():
+    # Each submission may wait on Aquarius retries, the lease is renewed as
+    # they are resolved
+    submissions.process_due(report=lambda processed: heartbeat())
+
+
+@task("consents.purge_tokens", every=timedelta(hours=1))
+def purge_tokens():
+    tokens.purge()
+
+
+# The limit keeps a run well within the job lease at the default rate, the
+# lease is renewed after every chunk anyway
+@task("consents.reconcile_asset_owners", every=timedelta(hours=1))
+def reconcile_asset_owners():
+    owners.reconcile(
+        limit=config.ASSET_OWNER_CHECK_LIMIT, report=lambda progress: heartbeat()
+    )
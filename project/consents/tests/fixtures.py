@@ -0,0 +1,58 @@
+from itertools import count
+
+from assets.models import Asset
+from django.contrib.auth import get_user_model
+
+from consents import lifecycle
+from consents.models import Consent, ConsentResponse, Status
+
+User = get_user_model()
+
+_sequence = count(1)
+
+
+def make_did() -> str:
+    return f"did:op:{next(_sequence):064x}"
+
+
+def make_address() -> str:
+    return f"0x{next(_sequence):040x}"
+
+
+def make_user(address: str | None = None) -> User:
+    address = address or make_address()
+    return User.objects.create(address=address, username=f"user_{address}")
+
+
+def make_asset(owner: User, type: str = Asset.Types.DATASET, **kwargs) -> Asset:
+    return Asset.objects.create(did=make_did(), owner=owner, type=type, **kwargs)
+
+
+def make_consent(
+    solicitor: User,
+    dataset: Asset | None = None,
+    algorithm: Asset | None = None,
+    request: int = 3,
+    **kwargs,
+) -> Consent:
+    dataset = dataset or make_asset(make_user())
+    algorithm = algorithm or make_asset(solicitor, Asset.Types.ALGORITHM)
+    return Consent.objects.create(
+        dataset=dataset,
+        algorithm=algorithm,
+        solicitor=solicitor,
+        request=request,
+        reason=kwargs.pop("reason", "Test reason"),
+        **kwargs,
+    )
+
+
+def make_response(consent: Consent, permitted: int) -> ConsentResponse:
+    response = ConsentResponse.objects.create(
+        consent=consent,
+        permitted=permitted,
+        reason="Test reason",
+        status=Status.from_bitfields(consent.request, permitted),
+    )
+    lifecycle.responded(response)
+    return response
@@ -0,0 +1,127 @@
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubAquarius:
+    """Serves DDOs from memory on a local port, counting the requests it gets.
+
+    Usable as a context manager; `url` is the base URL to point the
+    `AquariusService` at.
+    """
+
+    def __init__(self, delay: float = 0.0, failures: int = 0):
+        self.ddos: dict[str, dict] = {}
+        self.hits: Counter = Counter()
+        self.queries: list[dict] = []
+        self.delay = delay
+        self.failures = failures
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def add(self, did: str, owner: str, chain_id: int = 32457, **metadata) -> dict:
+        self.ddos[did] = {
+            "id": did,
+            "chainId": chain_id,
+            "nftAddress": owner,
+            "nft": {"owner": owner},
+            "metadata": {"type": "dataset", **metadata},
+        }
+        return self.ddos[did]
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with stub._lock:
+                    stub.hits[self.path] += 1
+                    failing = stub.failures > 0
+                    stub.failures -= failing
+                    stub.in_flight += 1
+                    stub.peak_in_flight = max(stub.peak_in_flight, stub.in_flight)
+
+                time.sleep(stub.delay)
+                with stub._lock:
+                    stub.in_flight -= 1
+                did = self.path.rsplit("/", 1)[-1]
+                if failing:
+                    self.reply(503, {"error": "Unavailable"})
+                elif did in stub.ddos:
+                    self.reply(200, stub.ddos[did])
+                else:
+                    self.reply(
+                        404, {"error": f"Asset DID {did} not found in Elasticsearch."}
+                    )
+
+            def do_POST(self):
+                with stub._lock:
+                    stub.hits[self.path] += 1
+
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length))
+                with stub._lock:
+                    stub.queries.append(body)
+                since = (
+                    body["query"]
+                    .get("range", {})
+                    .get("metadata.updated", {})
+                    .get("gte", "")
+                )
+
+                def key(ddo):
+                    return (ddo["metadata"].get("updated", ""), ddo["id"])
+
+                matches = sorted(
+                    (
+                        ddo
+                        for ddo in stub.ddos.values()
+                        if ddo["metadata"].get("updated", "") >= since
+                    ),
+                    key=key,
+                )
+                after = tuple(body.get("search_after", ()))
+                page = [ddo for ddo in matches if not after or key(ddo) > after]
+                page = page[body.get("from", 0) :][: body["size"]]
+                self.reply(
+                    200,
+                    {
+                        "hits": {
+                            "total": {"value": len(matches)},
+                            "hits": [{"_source": ddo} for ddo in page],
+                        }
+                    },
+                )
+
+            def reply(self, code: int, body: dict):
+                payload = json.dumps(body).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                try:
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # The client timed out
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self) -> "StubAquarius":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
@@ -118,7 +118,7 @@ class ConsentTest(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertContains(response, c.reason)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
 
     def test_consent_detail_view(self):
         c = self.create_consent()
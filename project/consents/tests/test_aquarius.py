@@ -0,0 +1,413 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from unittest import mock
+
+from assets.models import Asset
+from django.db import connection, connections
+from django.test import TestCase
+from django.urls import reverse
+from helpers.breaker import CircuitBreaker
+from helpers.metrics import Metrics, metrics
+from helpers.services.aquarius import (
+    AquariusError,
+    AquariusService,
+    AquariusUnavailable,
+    DdoCache,
+    DdoSummary,
+)
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from consents.tests.fixtures import make_address, make_did, make_user
+from consents.tests.stub_aquarius import StubAquarius
+
+
+class AquariusServiceTest(TestCase):
+    def setUp(self):
+        self.stub = self.enterContext(StubAquarius())
+        self.service = AquariusService(url=self.stub.url, timeout=(1, 0.5))
+
+    def test_ddo_summary(self):
+        did, owner = make_did(), make_address()
+        self.stub.add(did, owner, chain_id=100, type="algorithm")
+
+        summary = self.service.get_ddo_summary(did)
+
+        self.assertEqual(summary.owner, owner)
+        self.assertEqual(summary.chain_id, 100)
+        self.assertEqual(summary.type, "algorithm")
+
+    def test_asset_is_fetched_once(self):
+        did, owner = make_did(), make_address()
+        self.stub.add(did, owner)
+
+        with mock.patch("assets.models.aquarius", self.service):
+            asset = Asset.helper.get_or_create(did, Asset.Types.DATASET)
+
+        self.assertEqual(asset.owner.address, owner)
+        self.assertEqual(asset.chain_id, 32457)
+        self.assertEqual(self.stub.hits.total(), 1)
+
+    def test_connection_is_reused(self):
+        for _ in range(3):
+            did = make_did()
+            self.stub.add(did, make_address())
+            self.service.get_ddo_summary(did)
+
+        adapter = self.service.session.get_adapter(self.stub.url)
+        self.assertEqual(len(adapter.poolmanager.pools), 1)
+        pool = next(iter(adapter.poolmanager.pools._container.values()))
+        self.assertEqual(pool.num_connections, 1)
+
+    def test_not_found(self):
+        with self.assertRaises(AquariusError) as ctx:
+            self.service.get_ddo_summary(make_did())
+        self.assertEqual(ctx.exception.status_code, 404)
+
+    def test_retries_gateway_errors(self):
+        did = make_did()
+        self.stub.add(did, make_address())
+        self.stub.failures = 2
+
+        self.service.get_ddo_summary(did)
+
+        self.assertEqual(self.stub.hits.total(), 3)
+
+    def test_read_timeout(self):
+        self.stub.delay = 0.5
+        service = AquariusService(url=self.stub.url, timeout=(1, 0.1))
+
+        with self.assertRaises(AquariusError):
+            service.get_ddo_summary(make_did())
+
+
+class DdoCacheTest(TestCase):
+    def setUp(self):
+        self.stub = self.enterContext(StubAquarius())
+        self.service = AquariusService(
+            url=self.stub.url,
+            cache=DdoCache(maxsize=2, ttl=60, negative_ttl=60),
+        )
+
+    def add(self) -> str:
+        did = make_did()
+        self.stub.add(did, make_address())
+        return did
+
+    def test_hit(self):
+        did = self.add()
+        hits = metrics.get("aquarius_cache_hits_total")
+
+        first = self.service.get_ddo_summary(did)
+        second = self.service.get_ddo_summary(did)
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.stub.hits.total(), 1)
+        self.assertEqual(metrics.get("aquarius_cache_hits_total"), hits + 1)
+
+    def test_expiry(self):
+        did = self.add()
+        self.service.get_ddo_summary(did)
+
+        with mock.patch("time.time", return_value=time.time() + 61):
+            self.service.get_ddo_summary(did)
+
+        self.assertEqual(self.stub.hits.total(), 2)
+
+    def test_least_recently_used_is_evicted(self):
+        first, second, third = self.add(), self.add(), self.add()
+        evictions = metrics.get("aquarius_cache_evictions_total")
+
+        for did in (first, second, first, third, first):
+            self.service.get_ddo_summary(did)
+
+        self.assertEqual(self.stub.hits.total(), 3)
+        self.service.get_ddo_summary(second)
+        self.assertEqual(self.stub.hits.total(), 4)
+        self.assertEqual(metrics.get("aquarius_cache_evictions_total"), evictions + 2)
+
+    def test_not_found_is_remembered(self):
+        did = make_did()
+
+        for _ in range(2):
+            with self.assertRaises(AquariusError) as ctx:
+                self.service.get_ddo_summary(did)
+            self.assertEqual(ctx.exception.status_code, 404)
+
+        self.assertEqual(self.stub.hits.total(), 1)
+
+    def test_invalidate(self):
+        did = self.add()
+        self.service.get_ddo_summary(did)
+
+        owner = make_address()
+        self.stub.add(did, owner)
+        self.service.invalidate(did)
+
+        self.assertEqual(self.service.get_ddo_summary(did).owner, owner)
+
+    def test_shared_backend(self):
+        cache = DdoCache(maxsize=0, ttl=60, backend="default")
+        workers = [AquariusService(url=self.stub.url, cache=cache) for _ in range(2)]
+        did = self.add()
+
+        for worker in workers:
+            worker.get_ddo_summary(did)
+
+        self.assertEqual(self.stub.hits.total(), 1)
+        workers[1].invalidate(did)
+        workers[0].get_ddo_summary(did)
+        self.assertEqual(self.stub.hits.total(), 2)
+
+    def test_metrics_endpoint(self):
+        self.service.get_ddo_summary(self.add())
+
+        response = self.client.get("/api/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("aquarius_cache_misses_total", response.content.decode())
+
+    def test_large_counters_keep_every_digit(self):
+        registry = Metrics()
+        registry.inc("aquarius_cache_hits_total", 1_234_567)
+        registry.inc("aquarius_request_seconds_total", 1_234_567.25)
+
+        lines = registry.render().splitlines()
+
+        self.assertIn("aquarius_cache_hits_total 1234567", lines)
+        self.assertIn("aquarius_request_seconds_total 1234567.25", lines)
+
+
+class SingleFlightTest(TestCase):
+    def setUp(self):
+        self.stub = self.enterContext(StubAquarius(delay=0.3))
+        self.service = AquariusService(url=self.stub.url, cache=None)
+
+    def resolve_concurrently(self, did: str, callers: int = 8) -> list:
+        barrier = threading.Barrier(callers)
+
+        def resolve():
+            barrier.wait()
+            try:
+                return self.service.get_ddo_summary(did)
+            except AquariusError as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=callers) as pool:
+            return list(pool.map(lambda _: resolve(), range(callers)))
+
+    def test_one_upstream_call_per_did(self):
+        did, owner = make_did(), make_address()
+        self.stub.add(did, owner)
+        coalesced = metrics.get("aquarius_coalesced_total")
+
+        results = self.resolve_concurrently(did)
+
+        self.assertEqual(self.stub.hits.total(), 1)
+        self.assertEqual({result.owner for result in results}, {owner})
+        self.assertEqual(metrics.get("aquarius_coalesced_total"), coalesced + 7)
+
+    def test_waiters_share_the_error(self):
+        results = self.resolve_concurrently(make_did())
+
+        self.assertEqual(self.stub.hits.total(), 1)
+        self.assertTrue(all(isinstance(result, AquariusError) for result in results))
+
+    def test_next_lookup_is_not_coalesced(self):
+        did = make_did()
+        self.stub.add(did, make_address())
+        self.stub.delay = 0
+
+        self.service.get_ddo_summary(did)
+        self.service.get_ddo_summary(did)
+
+        self.assertEqual(self.stub.hits.total(), 2)
+
+
+class ConcurrentResolutionTest(APITestCase):
+    def setUp(self):
+        self.stub = self.enterContext(StubAquarius(delay=0.3))
+        self.service = AquariusService(url=self.stub.url, cache=None)
+        self.enterContext(mock.patch("assets.models.aquarius", self.service))
+
+        self.solicitor = make_user()
+        self.client.force_authenticate(self.solicitor)
+
+    def test_summaries(self):
+        known, missing = make_did(), make_did()
+        self.stub.add(known, make_address())
+
+        results = self.service.get_ddo_summaries([known, missing, known])
+
+        self.assertEqual(list(results), [known, missing])
+        self.assertEqual(results[known].did, known)
+        self.assertIsInstance(results[missing], AquariusError)
+        self.assertEqual(self.stub.peak_in_flight, 2)
+
+    def test_lookup_threads_never_touch_the_database(self):
+        known, missing = make_did(), make_did()
+        self.stub.add(known, make_address())
+        service = AquariusService(
+            url=self.stub.url, cache=DdoCache(maxsize=10, ttl=60), advisory_lock=True
+        )
+        database, requests = set(), set()  # Threads using each
+        fetch_ddo_summary = AquariusService.fetch_ddo_summary
+
+        @contextmanager
+        def advisory_lock(key):
+            database.add(threading.current_thread())
+            yield
+
+        def record(fn):
+            def recorded(*args, **kwargs):
+                database.add(threading.current_thread())
+                return fn(*args, **kwargs)
+
+            return recorded
+
+        def fetch(service, did):
+            requests.add(threading.current_thread())
+            try:
+                return fetch_ddo_summary(service, did)
+            finally:
+                self.assertIsNone(connections["default"].connection)
+
+        with (
+            mock.patch("helpers.services.aquarius.advisory_lock", advisory_lock),
+            mock.patch.object(service.cache, "_load", record(service.cache._load)),
+            mock.patch.object(service.cache, "_store", record(service.cache._store)),
+            mock.patch.object(
+                AquariusService, "fetch_ddo_summary", autospec=True, side_effect=fetch
+            ),
+        ):
+            results = service.get_ddo_summaries([known, missing])
+
+        self.assertEqual(results[known].did, known)
+        self.assertIsInstance(results[missing], AquariusError)
+        self.assertEqual(database, {threading.current_thread()})
+        self.assertNotIn(threading.current_thread(), requests)
+        self.assertEqual(self.stub.peak_in_flight, 2)
+
+    def test_creation_resolves_both_assets_at_once(self):
+        dataset, algorithm = make_did(), make_did()
+        self.stub.add(dataset, make_address())
+        self.stub.add(algorithm, self.solicitor.address, type="algorithm")
+
+        response = self.client.post(
+            reverse("consents-list"),
+            {"dataset": dataset, "algorithm": algorithm, "request": "3"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.stub.hits.total(), 2)
+        self.assertEqual(self.stub.peak_in_flight, 2)
+        self.assertEqual(Asset.objects.filter(did__in=(dataset, algorithm)).count(), 2)
+
+
+class CircuitBreakerTest(APITestCase):
+    def setUp(self):
+        self.stub = self.enterContext(StubAquarius())
+        self.service = AquariusService(
+            url=self.stub.url,
+            cache=DdoCache(maxsize=10, ttl=60, stale_ttl=3600),
+            breaker=CircuitBreaker("test", failure_threshold=2, reset_timeout=30),
+        )
+        self.session = self.service.session
+        self.session.get_adapter(self.stub.url).max_retries.total = 0
+
+    def fail(self, times: int):
+        self.stub.failures = times
+        for _ in range(times):
+            with self.assertRaises(AquariusError):
+                self.service.get_ddo_summary(make_did())
+
+    def test_opens_after_consecutive_failures(self):
+        self.fail(2)
+        hits = self.stub.hits.total()
+
+        with self.assertRaises(AquariusUnavailable) as ctx:
+            self.service.get_ddo_summary(make_did())
+
+        self.assertEqual(self.stub.hits.total(), hits)
+        self.assertGreater(ctx.exception.retry_after, 29)
+        self.assertEqual(metrics.get("circuit_breaker_state", name="test"), 2)
+
+    def test_half_open_probe(self):
+        did = make_did()
+        self.stub.add(did, make_address())
+        self.fail(2)
+
+        with mock.patch("time.monotonic", return_value=time.monotonic() + 31):
+            self.assertEqual(self.service.breaker.retry_after, 0)
+            self.service.get_ddo_summary(did)
+
+        self.assertEqual(self.service.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_failed_probe_reopens(self):
+        self.fail(2)
+
+        with mock.patch("time.monotonic", return_value=time.monotonic() + 31):
+            self.fail(1)
+            self.assertEqual(self.service.breaker.state, CircuitBreaker.OPEN)
+
+    def test_not_found_is_not_a_failure(self):
+        for _ in range(3):
+            with self.assertRaises(AquariusError):
+                self.service.get_ddo_summary(make_did())
+
+        self.assertEqual(self.service.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_serves_stale_summary(self):
+        did = make_did()
+        self.stub.add(did, make_address())
+        summary = self.service.get_ddo_summary(did)
+        self.fail(2)
+
+        with mock.patch("time.time", return_value=time.time() + 61):
+            self.assertEqual(self.service.get_ddo_summary(did), summary)
+
+    def test_consent_creation_fails_fast(self):
+        self.client.force_authenticate(make_user())
+        self.fail(2)
+
+        with mock.patch("assets.models.aquarius", self.service):
+            response = self.client.post(
+                reverse("consents-list"),
+                {"dataset": make_did(), "algorithm": make_did(), "request": "3"},
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response["Retry-After"], "30")
+
+
+class TwoPhaseCreationTest(APITestCase):
+    def setUp(self):
+        patcher = mock.patch("assets.models.aquarius")
+        self.aquarius = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.client.force_authenticate(make_user())
+
+    def test_resolves_outside_the_transaction(self):
+        # The test case itself runs inside atomic blocks
+        depth = len(connection.atomic_blocks)
+        depths = []
+
+        def resolve(dids):
+            depths.append(len(connection.atomic_blocks))
+            return {
+                did: DdoSummary(did=did, owner=make_address(), chain_id=1)
+                for did in dids
+            }
+
+        self.aquarius.get_ddo_summaries.side_effect = resolve
+
+        response = self.client.post(
+            reverse("consents-list"),
+            {"dataset": make_did(), "algorithm": make_did(), "request": "3"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(depths, [depth])
@@ -0,0 +1,174 @@
+from unittest import mock
+
+from assets.models import Asset
+from django.db import connection
+from django.urls import reverse
+from helpers.config import config
+from helpers.services.aquarius import AquariusError, DdoSummary
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from consents.models import Consent, ConsentResponse, Status
+from consents.tests.fixtures import (
+    make_address,
+    make_asset,
+    make_consent,
+    make_did,
+    make_response,
+    make_user,
+)
+
+
+class BatchConsentTest(APITestCase):
+    def setUp(self):
+        self.solicitor = make_user()
+        self.client.force_authenticate(self.solicitor)
+
+        self.owner = make_address()
+        patcher = mock.patch("assets.models.aquarius")
+        self.aquarius = patcher.start()
+        self.aquarius.get_ddo_summaries.side_effect = lambda dids: {
+            did: DdoSummary(did=did, owner=self.owner, chain_id=32457) for did in dids
+        }
+        self.addCleanup(patcher.stop)
+
+    def batch(self, *items):
+        return self.client.post(
+            reverse("consents-batch-create"),
+            {
+                "items": [
+                    {"dataset": dataset, "algorithm": algorithm, "request": "3"}
+                    for dataset, algorithm in items
+                ]
+            },
+        )
+
+    def test_resolves_each_did_once(self):
+        dataset, first, second = make_did(), make_did(), make_did()
+
+        response = self.batch((dataset, first), (dataset, second), (dataset, first))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [result["status"] for result in response.data["results"]],
+            ["created", "created", "exists"],
+        )
+        self.aquarius.get_ddo_summaries.assert_called_once()
+        self.assertEqual(
+            set(self.aquarius.get_ddo_summaries.call_args.args[0]),
+            {dataset, first, second},
+        )
+        self.assertEqual(Consent.objects.count(), 2)
+        self.assertEqual(Asset.objects.get(did=dataset).owner.address, self.owner)
+
+    def test_reports_errors_per_item(self):
+        algorithm = make_asset(make_user(), Asset.Types.ALGORITHM)
+        taken = Consent.objects.create(
+            dataset=make_asset(make_user()),
+            algorithm=algorithm,
+            solicitor=make_user(),
+            request=1,
+        )
+
+        response = self.batch(
+            (algorithm.did, make_did()),
+            (taken.dataset.did, algorithm.did),
+            (make_did(), algorithm.did),
+        )
+
+        self.assertEqual(
+            [result["status"] for result in response.data["results"]],
+            ["error", "error", "created"],
+        )
+        self.assertIn("is not a dataset", response.data["results"][0]["detail"])
+
+    def test_unresolvable_did(self):
+        self.aquarius.get_ddo_summaries.side_effect = lambda dids: {
+            did: AquariusError("Not found", 404) for did in dids
+        }
+
+        response = self.batch((make_did(), make_did()))
+
+        self.assertEqual(response.data["results"][0]["status"], "error")
+        self.assertFalse(Consent.objects.exists())
+
+    def test_item_limit(self):
+        items = [
+            (make_did(), make_did()) for _ in range(config.CONSENT_BATCH_LIMIT + 1)
+        ]
+        response = self.batch(*items)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.aquarius.get_ddo_summaries.assert_not_called()
+
+
+class BulkResponseTest(APITestCase):
+    def setUp(self):
+        self.owner = make_user()
+        self.client.force_authenticate(self.owner)
+        self.consents = [
+            make_consent(make_user(), dataset=make_asset(self.owner), request=3)
+            for _ in range(3)
+        ]
+
+    def respond(self, *items):
+        return self.client.post(
+            reverse("consents-bulk-respond"),
+            {
+                "items": [
+                    {"consent": consent, "permitted": permitted, "reason": "Bulk"}
+                    for consent, permitted in items
+                ]
+            },
+        )
+
+    def test_responds_in_bulk(self):
+        first, second, third = self.consents
+
+        # Savepoint, lookup, responses, statuses, decision tokens, events (after
+        # their lock on PostgreSQL), counters (lookup, rows and an update per
+        # kind and direction) and release
+        with self.assertNumQueries(13 + (connection.vendor == "postgresql")):
+            response = self.respond(
+                (first.pk, "3"),
+                (second.pk, "1"),
+                (third.pk, "0"),
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [result["consent_status"] for result in response.data["results"]],
+            ["Accepted", "Resolved", "Denied"],
+        )
+        self.assertEqual(
+            list(Consent.objects.order_by("pk").values_list("status", flat=True)),
+            [Status.ACCEPTED, Status.RESOLVED, Status.DENIED],
+        )
+
+    def test_reports_errors_per_item(self):
+        first, second, _ = self.consents
+        make_response(first, permitted=3)
+        foreign = make_consent(make_user())
+        narrow = make_consent(make_user(), dataset=make_asset(self.owner), request=1)
+
+        response = self.respond(
+            (first.pk, "3"),
+            (foreign.pk, "1"),
+            (narrow.pk, "2"),
+            (0, "1"),
+            (second.pk, "1"),
+            (second.pk, "1"),
+        )
+
+        self.assertEqual(
+            [result.get("detail") for result in response.data["results"]],
+            [
+                "Consent already has been responded to",
+                "You are not the owner of the dataset",
+                "Given bitfield 2 has bits not marked in required 1",
+                "Consent not found",
+                None,
+                "Consent already has been responded to",
+            ],
+        )
+        self.assertEqual(ConsentResponse.objects.count(), 2)
@@ -0,0 +1,124 @@
+from unittest import mock
+
+from assets.models import Asset
+from django.urls import reverse
+from helpers.services.aquarius import DdoSummary
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from consents.models import Consent, ConsentEvent
+from consents.tests.fixtures import (
+    make_address,
+    make_asset,
+    make_did,
+    make_user,
+)
+
+
+class ConsentChangesTest(APITestCase):
+    def setUp(self):
+        self.owner = make_user()
+        self.solicitor = make_user()
+
+    def create(self) -> Consent:
+        return Consent.helper.get_or_create(
+            make_asset(self.owner),
+            make_asset(self.solicitor, Asset.Types.ALGORITHM),
+            self.solicitor.address,
+            request=3,
+        )
+
+    def changes(self, **params):
+        return self.client.get(reverse("consents-changes"), params)
+
+    def test_records_the_lifecycle(self):
+        consent = self.create()
+        self.client.force_authenticate(self.owner)
+        self.client.post(
+            reverse("consent-response-list", args=[consent.pk]),
+            {"reason": "Only trusted", "permitted": "2"},
+        )
+        self.client.delete(reverse("consents-delete-response", args=[consent.pk]))
+        self.client.force_authenticate(self.solicitor)
+        self.client.delete(reverse("consents-detail", args=[consent.pk]))
+
+        response = self.changes()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        events = response.data["events"]
+        self.assertEqual(
+            [event["kind"] for event in events],
+            ["created", "responded", "response_deleted", "deleted"],
+        )
+        self.assertEqual({event["consent"] for event in events}, {consent.pk})
+        self.assertEqual(events[0]["data"]["dataset"], consent.dataset.did)
+        self.assertEqual(events[0]["data"]["request"], 3)
+        self.assertEqual(
+            events[1]["data"],
+            {"status": "Resolved", "permitted": 2, "response_reason": "Only trusted"},
+        )
+        self.assertEqual(events[2]["data"], {"status": "Pending"})
+        self.assertEqual(events[3]["data"], {})
+        self.assertEqual(response.data["cursor"], events[-1]["cursor"])
+        self.assertFalse(response.data["has_more"])
+
+    def test_pages_after_the_cursor(self):
+        consents = [self.create() for _ in range(5)]
+
+        first = self.changes(limit=2).data
+        second = self.changes(after=first["cursor"], limit=2).data
+        third = self.changes(after=second["cursor"], limit=2).data
+        done = self.changes(after=third["cursor"]).data
+
+        self.assertTrue(first["has_more"])
+        self.assertTrue(second["has_more"])
+        self.assertFalse(third["has_more"])
+        self.assertEqual(
+            [
+                event["consent"]
+                for page in (first, second, third)
+                for event in page["events"]
+            ],
+            [consent.pk for consent in consents],
+        )
+        self.assertEqual(done["events"], [])
+        self.assertEqual(done["cursor"], third["cursor"])
+
+    def test_polling_cost_does_not_depend_on_the_history(self):
+        for _ in range(20):
+            self.create()
+        cursor = ConsentEvent.objects.latest("pk").pk
+        self.create()
+
+        with self.assertNumQueries(1):
+            response = self.changes(after=cursor)
+
+        self.assertEqual(len(response.data["events"]), 1)
+
+    def test_batch_creation(self):
+        self.client.force_authenticate(self.solicitor)
+        owner = make_address()
+        dataset, algorithm = make_did(), make_did()
+
+        with mock.patch("assets.models.aquarius") as aquarius:
+            aquarius.get_ddo_summaries.side_effect = lambda dids: {
+                did: DdoSummary(did=did, owner=owner, chain_id=0) for did in dids
+            }
+            self.client.post(
+                reverse("consents-batch-create"),
+                {
+                    "items": [
+                        {"dataset": dataset, "algorithm": algorithm, "request": "3"},
+                        {"dataset": dataset, "algorithm": algorithm, "request": "3"},
+                    ]
+                },
+            )
+
+        events = self.changes().data["events"]
+        self.assertEqual([event["kind"] for event in events], ["created"])
+        self.assertEqual(events[0]["data"]["algorithm"], algorithm)
+
+    def test_invalid_cursor(self):
+        response = self.changes(after="last")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
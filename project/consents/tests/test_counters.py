@@ -0,0 +1,121 @@
+from io import StringIO
+
+from assets.models import Asset
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from consents.models import Consent, ConsentCounter
+from consents.tests.fixtures import make_asset, make_consent, make_user
+
+
+class ConsentCounterTest(APITestCase):
+    def setUp(self):
+        self.owner = make_user()
+        self.solicitor = make_user()
+        self.dataset = make_asset(self.owner)
+
+    def create(self) -> Consent:
+        return Consent.helper.get_or_create(
+            self.dataset,
+            make_asset(self.solicitor, Asset.Types.ALGORITHM),
+            self.solicitor.address,
+            request=3,
+        )
+
+    def respond(self, consent: Consent, permitted: str = "3"):
+        self.client.force_authenticate(self.owner)
+        return self.client.post(
+            reverse("consent-response-list", args=[consent.pk]),
+            {"reason": "Test reason", "permitted": permitted},
+        )
+
+    def user(self, user) -> dict:
+        return self.client.get(reverse("users-detail", args=[user.address])).data
+
+    def pending(self, asset: Asset) -> int:
+        response = self.client.get(reverse("assets-detail", args=[asset.did]))
+        return response.data["pending_consents"]
+
+    def assert_consistent(self):
+        self.assertEqual(ConsentCounter.objects.drifted(), [])
+
+    def test_creation_counts(self):
+        first, second = self.create(), self.create()
+
+        self.assertEqual(self.user(self.owner)["incoming_pending_consents"], 2)
+        self.assertEqual(self.user(self.solicitor)["outgoing_pending_consents"], 2)
+        self.assertEqual(self.user(self.owner)["outgoing_pending_consents"], 0)
+        self.assertEqual(self.pending(self.dataset), 2)
+        self.assertEqual(self.pending(first.algorithm), 1)
+        counter = ConsentCounter.objects.get(asset=self.dataset)
+        self.assertEqual((counter.incoming_pending, counter.incoming_total), (2, 2))
+        self.assert_consistent()
+
+    def test_responses_count_only_pending(self):
+        consent, other = self.create(), self.create()
+
+        self.respond(consent)
+
+        self.assertEqual(self.pending(self.dataset), 1)
+        self.assertEqual(self.user(self.solicitor)["outgoing_pending_consents"], 1)
+        self.assertEqual(
+            ConsentCounter.objects.get(asset=self.dataset).incoming_total, 2
+        )
+        self.assert_consistent()
+
+        self.client.delete(reverse("consents-delete-response", args=[consent.pk]))
+
+        self.assertEqual(self.pending(self.dataset), 2)
+        self.assert_consistent()
+
+    def test_bulk_responses(self):
+        consents = [self.create() for _ in range(3)]
+        self.client.force_authenticate(self.owner)
+
+        self.client.post(
+            reverse("consents-bulk-respond"),
+            {"items": [{"consent": c.pk, "permitted": "1"} for c in consents[:2]]},
+            format="json",
+        )
+
+        self.assertEqual(self.pending(self.dataset), 1)
+        self.assert_consistent()
+
+    def test_deletion(self):
+        consent, responded = self.create(), self.create()
+        self.respond(responded)
+        self.client.force_authenticate(self.solicitor)
+
+        for deleted in (consent, responded):
+            response = self.client.delete(reverse("consents-detail", args=[deleted.pk]))
+            self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        counter = ConsentCounter.objects.get(user=self.owner)
+        self.assertEqual((counter.incoming_pending, counter.incoming_total), (0, 0))
+        self.assert_consistent()
+
+    def test_detail_reads_are_constant(self):
+        for _ in range(3):
+            self.create()
+        url = reverse("users-detail", args=[self.owner.address])
+
+        # User, its assets and its counters
+        with self.assertNumQueries(3):
+            self.client.get(url)
+
+    def test_reconcile(self):
+        self.create()
+        make_consent(self.solicitor, dataset=self.dataset)  # Bypasses the counters
+        ConsentCounter.objects.filter(user=self.solicitor).update(outgoing_total=7)
+
+        with self.assertRaises(SystemExit):
+            call_command("reconcile_consent_counters", check=True, stdout=StringIO())
+
+        call_command("reconcile_consent_counters", stdout=StringIO())
+
+        self.assert_consistent()
+        self.assertEqual(self.pending(self.dataset), 2)
+        counter = ConsentCounter.objects.get(user=self.solicitor)
+        self.assertEqual((counter.outgoing_pending, counter.outgoing_total), (2, 2))
@@ -0,0 +1,171 @@
+from django.urls import reverse
+from helpers.config import config
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from consents.tests.fixtures import make_consent, make_did, make_response, make_user
+
+
+class ConsentDecisionTest(APITestCase):
+    url = reverse("consents-decision")
+
+    def setUp(self):
+        self.solicitor = make_user()
+        self.consent = make_consent(self.solicitor, request=3)
+
+    def decide(self, headers=None, **params):
+        params.setdefault("dataset", self.consent.dataset.did)
+        params.setdefault("algorithm", self.consent.algorithm.did)
+        return self.client.get(self.url, params, **(headers or {}))
+
+    def test_pending_is_not_allowed(self):
+        response = self.decide()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data["allowed"])
+        self.assertEqual(response.data["status"], "Pending")
+        self.assertEqual(response.data["solicitor"], self.solicitor.address)
+        self.assertEqual(response.data["permitted"], {})
+
+    def test_accepted(self):
+        make_response(self.consent, permitted=3)
+
+        response = self.decide()
+
+        self.assertTrue(response.data["allowed"])
+        self.assertEqual(response.data["status"], "Accepted")
+        self.assertEqual(response.data["permitted_mask"], 3)
+
+    def test_resolved_returns_the_permitted_flags(self):
+        make_response(self.consent, permitted=2)
+
+        response = self.decide()
+
+        self.assertTrue(response.data["allowed"])
+        self.assertEqual(response.data["status"], "Resolved")
+        self.assertEqual(response.data["permitted"], {"trusted_algorithm": True})
+        self.assertEqual(response.data["permitted_mask"], 2)
+
+    def test_denied(self):
+        make_response(self.consent, permitted=0)
+
+        response = self.decide()
+
+        self.assertFalse(response.data["allowed"])
+        self.assertEqual(response.data["status"], "Denied")
+
+    def test_unknown_pair_is_not_allowed(self):
+        response = self.decide(algorithm=make_did())
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data["allowed"])
+        self.assertIsNone(response.data["status"])
+        self.assertIsNone(response.data["consent"])
+
+    def test_other_solicitor_is_not_allowed(self):
+        make_response(self.consent, permitted=3)
+
+        response = self.decide(solicitor=make_user().address)
+
+        self.assertFalse(response.data["allowed"])
+        self.assertIsNone(response.data["consent"])
+        self.assertTrue(self.decide(solicitor=self.solicitor.address).data["allowed"])
+
+    def test_requires_both_assets(self):
+        response = self.client.get(self.url, {"dataset": self.consent.dataset.did})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("algorithm", response.data)
+
+    def test_single_query(self):
+        make_response(self.consent, permitted=3)
+
+        with self.assertNumQueries(1):
+            self.decide()
+
+    def test_conditional_requests(self):
+        response = self.decide()
+        etag = response["ETag"]
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+
+        response = self.decide(headers={"HTTP_IF_NONE_MATCH": etag})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+        make_response(self.consent, permitted=3)
+        response = self.decide(headers={"HTTP_IF_NONE_MATCH": etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+class BatchConsentDecisionTest(APITestCase):
+    url = reverse("consents-batch-decision")
+
+    def setUp(self):
+        self.solicitor = make_user()
+        self.consents = [make_consent(self.solicitor) for _ in range(3)]
+        make_response(self.consents[0], permitted=3)
+        make_response(self.consents[1], permitted=0)
+
+    def pair(self, consent, **kwargs) -> dict:
+        return {
+            "dataset": consent.dataset.did,
+            "algorithm": consent.algorithm.did,
+            **kwargs,
+        }
+
+    def test_decides_each_pair_in_order(self):
+        pairs = [
+            self.pair(self.consents[2]),
+            {"dataset": make_did(), "algorithm": make_did()},
+            self.pair(self.consents[1]),
+            self.pair(self.consents[0]),
+            self.pair(self.consents[0], solicitor=make_user().address),
+        ]
+
+        response = self.client.post(self.url, {"pairs": pairs}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual([r["index"] for r in results], [0, 1, 2, 3, 4])
+        self.assertEqual(
+            [r["status"] for r in results],
+            ["Pending", None, "Denied", "Accepted", None],
+        )
+        self.assertEqual(
+            [r["allowed"] for r in results],
+            [False, False, False, True, False],
+        )
+        self.assertEqual(results[3]["permitted_mask"], 3)
+        self.assertEqual(results[3]["solicitor"], self.solicitor.address)
+
+    def test_matches_the_single_decision(self):
+        pairs = [self.pair(consent) for consent in self.consents]
+
+        results = self.client.post(self.url, {"pairs": pairs}, format="json").data
+
+        for pair, result in zip(pairs, results["results"]):
+            single = self.client.get(reverse("consents-decision"), pair).data
+            self.assertEqual({"index": result["index"], **single}, result)
+
+    def test_single_query(self):
+        pairs = [self.pair(consent) for consent in self.consents] * 10
+
+        with self.assertNumQueries(1):
+            response = self.client.post(self.url, {"pairs": pairs}, format="json")
+
+        self.assertEqual(len(response.data["results"]), 30)
+
+    def test_limit(self):
+        pairs = [self.pair(self.consents[0])] * (
+            config.CONSENT_DECISION_BATCH_LIMIT + 1
+        )
+
+        response = self.client.post(self.url, {"pairs": pairs}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_empty(self):
+        response = self.client.post(self.url, {"pairs": []}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
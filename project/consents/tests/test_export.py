@@ -0,0 +1,58 @@
+import csv
+import io
+
+import orjson
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from consents.tests.fixtures import (
+    make_asset,
+    make_consent,
+    make_response,
+    make_user,
+)
+
+
+class ConsentExportTest(APITestCase):
+    def setUp(self):
+        self.owner = make_user()
+        self.pending = make_consent(make_user(), dataset=make_asset(self.owner))
+        self.denied = make_consent(make_user())
+        make_response(self.denied, permitted=0)
+
+    def export(self, **params):
+        response = self.client.get(reverse("consents-export"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return b"".join(response.streaming_content).decode()
+
+    def test_ndjson(self):
+        rows = [orjson.loads(line) for line in self.export().splitlines()]
+
+        self.assertEqual([row["id"] for row in rows], [self.pending.pk, self.denied.pk])
+        self.assertEqual(rows[0]["dataset_owner"], self.owner.address)
+        self.assertEqual(rows[0]["request"], 3)
+        self.assertEqual(rows[1]["status"], "Denied")
+        self.assertEqual(rows[1]["permitted"], 0)
+
+    def test_csv_with_filters(self):
+        rows = list(
+            csv.DictReader(io.StringIO(self.export(output="csv", status="Pending")))
+        )
+
+        self.assertEqual([int(row["id"]) for row in rows], [self.pending.pk])
+
+    def test_invalid_output(self):
+        response = self.client.get(reverse("consents-export"), {"output": "xml"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_command(self):
+        stdout = io.StringIO()
+        call_command(
+            "export_consents", output="csv", filter=["status=D"], stdout=stdout
+        )
+
+        rows = list(csv.DictReader(io.StringIO(stdout.getvalue())))
+        self.assertEqual([int(row["id"]) for row in rows], [self.denied.pk])
@@ -0,0 +1,192 @@
+from unittest import skipUnless
+
+from assets.models import Asset
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from consents.filters import ConsentFilterSet
+from consents.models import Consent
+from consents.tests.fixtures import (
+    make_asset,
+    make_consent,
+    make_response,
+    make_user,
+)
+
+
+class ConsentFilterTest(APITestCase):
+    def setUp(self):
+        self.owner = make_user()
+        self.solicitor = make_user()
+        self.pending = make_consent(self.solicitor, dataset=make_asset(self.owner))
+        self.accepted = make_consent(make_user(), request=1)
+        make_response(self.accepted, permitted=1)
+
+    def list(self, **params):
+        return self.client.get(reverse("consents-list"), params)
+
+    def ids(self, **params) -> set[int]:
+        response = self.list(**params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {consent["id"] for consent in response.data["results"]}
+
+    def test_unknown_filter_is_rejected(self):
+        response = self.list(dataset__owner__password="x")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_value_is_rejected(self):
+        for params in ({"chain_id": "x"}, {"status": "x"}, {"combine": "xor"}):
+            self.assertEqual(
+                self.list(**params).status_code, status.HTTP_400_BAD_REQUEST
+            )
+
+    def test_filters_are_anded_by_default(self):
+        self.assertEqual(
+            self.ids(dataset_owner=self.owner.address, status="Pending"),
+            {self.pending.pk},
+        )
+        self.assertEqual(
+            self.ids(dataset_owner=self.owner.address, status="A"),
+            set(),
+        )
+
+    def test_filters_can_be_ored(self):
+        self.assertEqual(
+            self.ids(
+                solicitor=self.solicitor.address,
+                status="accepted",
+                combine="or",
+            ),
+            {self.pending.pk, self.accepted.pk},
+        )
+
+    def test_did_filters(self):
+        self.assertEqual(
+            self.ids(dataset_did=self.pending.dataset.did), {self.pending.pk}
+        )
+        self.assertEqual(
+            self.ids(algorithm_did=self.accepted.algorithm.did), {self.accepted.pk}
+        )
+
+    def test_flag_filters(self):
+        self.assertEqual(
+            self.ids(request_flags="trusted_algorithm_publisher"),
+            {self.pending.pk, self.accepted.pk},
+        )
+        self.assertEqual(
+            self.ids(request_flags="trusted_algorithm_publisher,trusted_algorithm"),
+            {self.pending.pk},
+        )
+        self.assertEqual(self.ids(request_flags="allow_network_access"), set())
+        self.assertEqual(
+            self.ids(permitted_flags="trusted_algorithm_publisher"),
+            {self.accepted.pk},
+        )
+        self.assertEqual(self.ids(permitted_flags="trusted_algorithm"), set())
+
+    def test_flag_filters_are_bitwise(self):
+        queryset = ConsentFilterSet({"request_flags": "allow_network_access"}).filter(
+            Consent.objects.all()
+        )
+
+        self.assertIn('("consent"."request" & 4) = 4', str(queryset.query))
+
+    def test_unknown_flag_is_rejected(self):
+        response = self.list(request_flags="trusted_algorithm,root")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_created_at_range(self):
+        timestamp = int(self.accepted.created_at.timestamp())
+
+        self.assertIn(self.accepted.pk, self.ids(created_after=timestamp))
+        self.assertEqual(self.ids(created_before=timestamp - 60), set())
+
+    def test_responded_at_range(self):
+        timestamp = int(self.accepted.response.last_updated_at.timestamp())
+
+        self.assertEqual(self.ids(responded_after=timestamp), {self.accepted.pk})
+        self.assertEqual(self.ids(responded_before=timestamp - 60), set())
+
+
+@skipUnless(connection.vendor == "postgresql", "EXPLAIN plans are PostgreSQL's")
+class ConsentFilterPlanTest(TestCase):
+    """Every supported filter must be answerable through an index."""
+
+    DATASETS = 200
+    ALGORITHMS = 100
+
+    @classmethod
+    def setUpTestData(cls):
+        owners = [make_user() for _ in range(20)]
+        datasets = Asset.objects.bulk_create(
+            Asset(
+                did=f"did:op:{i:064x}",
+                owner=owners[i % len(owners)],
+                type=Asset.Types.DATASET,
+                chain_id=i % 50,
+            )
+            for i in range(cls.DATASETS)
+        )
+        algorithms = Asset.objects.bulk_create(
+            Asset(
+                did=f"did:op:{cls.DATASETS + i:064x}",
+                owner=owners[i % len(owners)],
+                type=Asset.Types.ALGORITHM,
+            )
+            for i in range(cls.ALGORITHMS)
+        )
+        Consent.objects.bulk_create(
+            Consent(
+                dataset=dataset,
+                algorithm=algorithm,
+                dataset_owner=dataset.owner,
+                algorithm_owner=algorithm.owner,
+                solicitor=owners[(i + j) % len(owners)],
+                request=(i + j) % 8,
+            )
+            for i, dataset in enumerate(datasets)
+            for j, algorithm in enumerate(algorithms)
+        )
+        cls.dataset = datasets[0]
+        cls.algorithm = algorithms[0]
+        cls.owner = owners[0]
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def test_filters_use_indexes(self):
+        values = {
+            "dataset_did": self.dataset.did,
+            "algorithm_did": self.algorithm.did,
+            "dataset_owner": self.owner.address,
+            "algorithm_owner": self.owner.address,
+            "dataset": self.owner.address,
+            "algorithm": self.owner.address,
+            "solicitor": self.owner.address,
+            "status": "Accepted",
+            "chain_id": "7",
+            "request": "5",
+            "created_after": "2999-01-01T00:00:00Z",
+            "created_before": "2000-01-01T00:00:00Z",
+            "responded_after": "2999-01-01T00:00:00Z",
+            "responded_before": "2000-01-01T00:00:00Z",
+            "request_flags": "allow_network_access",
+            "permitted_flags": "trusted_algorithm,allow_network_access",
+        }
+        self.assertEqual(set(values), set(ConsentFilterSet.filters))
+
+        with connection.cursor() as cursor:
+            # Any plan still scanning sequentially lacks a usable index
+            cursor.execute("SET enable_seqscan = off")
+
+        for param, value in values.items():
+            with self.subTest(filter=param):
+                queryset = ConsentFilterSet({param: value}).filter(
+                    Consent.objects.all()
+                )
+                self.assertNotIn("Seq Scan on consent ", queryset.explain())
@@ -0,0 +1,147 @@
+from io import StringIO
+from unittest import mock
+
+from assets.models import DdoMirror, SyncCheckpoint
+from django.core.management import call_command
+from django.urls import reverse
+from helpers.config import config
+from helpers.services.aquarius import AquariusService
+from jobs.registry import registry
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from consents.models import Consent
+from consents.tests.fixtures import make_address, make_did, make_user
+from consents.tests.stub_aquarius import StubAquarius
+
+
+class SyncAquariusTest(APITestCase):
+    def setUp(self):
+        self.stub = self.enterContext(StubAquarius())
+        self.service = AquariusService(url=self.stub.url, cache=None)
+        self.enterContext(
+            mock.patch(
+                "assets.management.commands.sync_aquarius.aquarius", self.service
+            )
+        )
+
+    def add(self, updated: str, **kwargs) -> str:
+        did = make_did()
+        self.stub.add(did, make_address(), updated=updated, **kwargs)
+        return did
+
+    def sync(self, *args):
+        call_command("sync_aquarius", "--batch-size", "2", *args, stdout=StringIO())
+
+    def test_mirrors_every_ddo(self):
+        dids = [self.add(f"2024-01-0{day}T00:00:00Z") for day in range(1, 6)]
+
+        self.sync()
+
+        self.assertEqual(
+            set(DdoMirror.objects.values_list("did", flat=True)), set(dids)
+        )
+        mirrored = DdoMirror.objects.get(did=dids[0])
+        self.assertEqual(mirrored.owner, self.stub.ddos[dids[0]]["nft"]["owner"])
+        self.assertEqual(mirrored.chain_id, 32457)
+        self.assertEqual(mirrored.type, "dataset")
+
+    def test_resumes_from_checkpoint(self):
+        for day in range(1, 6):
+            self.add(f"2024-01-0{day}T00:00:00Z")
+
+        self.sync("--max-pages", "1")
+        self.assertEqual(DdoMirror.objects.count(), 2)
+
+        self.sync()
+        self.assertEqual(DdoMirror.objects.count(), 5)
+
+        checkpoint = SyncCheckpoint.objects.get(name="aquarius")
+        self.assertEqual(checkpoint.updated_since, "2024-01-05T00:00:00Z")
+
+        # Only the DDOs updated since the checkpoint are fetched again
+        changed = self.add("2024-01-06T00:00:00Z")
+        self.sync()
+        self.assertTrue(DdoMirror.objects.filter(did=changed).exists())
+        checkpoint.refresh_from_db()
+        self.assertEqual(checkpoint.updated_since, "2024-01-06T00:00:00Z")
+
+    def test_ddos_sharing_a_timestamp(self):
+        dids = [self.add("2024-01-01T00:00:00Z") for _ in range(5)]
+
+        for _ in range(5):
+            self.sync("--max-pages", "1")
+
+        self.assertEqual(
+            set(DdoMirror.objects.values_list("did", flat=True)), set(dids)
+        )
+
+    def test_idle_runs_keep_the_checkpoint(self):
+        for day in range(1, 4):
+            self.add(f"2024-01-0{day}T00:00:00Z")
+        self.sync()
+        checkpoint = SyncCheckpoint.objects.get(name="aquarius")
+        self.stub.queries.clear()
+
+        self.sync()
+        self.sync()
+
+        checkpoint.refresh_from_db()
+        self.assertEqual(checkpoint.updated_since, "2024-01-03T00:00:00Z")
+        self.assertEqual([query["size"] for query in self.stub.queries], [2, 2])
+        self.assertEqual(
+            [query["search_after"] for query in self.stub.queries],
+            [["2024-01-03T00:00:00Z", checkpoint.last_did]] * 2,
+        )
+        self.assertEqual(DdoMirror.objects.count(), 3)
+
+    def test_recurring_task_is_bounded(self):
+        for day in range(1, 6):
+            self.add(f"2024-01-0{day}T00:00:00Z")
+        task = registry.get("assets.sync_aquarius")
+
+        with (
+            mock.patch.object(config, "AQUARIUS_SYNC_BATCH_SIZE", 2),
+            mock.patch.object(config, "AQUARIUS_SYNC_MAX_PAGES", 1),
+        ):
+            task.fn()
+
+        self.assertIsNotNone(task.every)
+        self.assertEqual(DdoMirror.objects.count(), 2)
+
+    def test_updates_changed_owner(self):
+        did = self.add("2024-01-01T00:00:00Z")
+        self.sync()
+
+        owner = make_address()
+        self.stub.add(did, owner, updated="2024-02-01T00:00:00Z")
+        self.sync()
+
+        self.assertEqual(DdoMirror.objects.get(did=did).owner, owner)
+
+
+class MirrorResolutionTest(APITestCase):
+    def setUp(self):
+        patcher = mock.patch("assets.models.aquarius")
+        self.aquarius = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.solicitor = make_user()
+        self.client.force_authenticate(self.solicitor)
+
+    def test_creation_reads_the_mirror(self):
+        dataset, algorithm = make_did(), make_did()
+        owner = make_address()
+        DdoMirror.objects.create(did=dataset, owner=owner, chain_id=100)
+        DdoMirror.objects.create(did=algorithm, owner=self.solicitor.address)
+
+        response = self.client.post(
+            reverse("consents-list"),
+            {"dataset": dataset, "algorithm": algorithm, "request": "3"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.aquarius.get_ddo_summaries.assert_not_called()
+        consent = Consent.objects.get()
+        self.assertEqual(consent.dataset.owner.address, owner)
+        self.assertEqual(consent.dataset.chain_id, 100)
@@ -0,0 +1,203 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from assets.models import Asset, DdoMirror
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from helpers.config import config
+from helpers.services.aquarius import AquariusError, AquariusUnavailable, DdoSummary
+from jobs.registry import registry
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from consents import owners
+from consents.models import Consent, ConsentCounter
+from consents.tests.fixtures import (
+    make_address,
+    make_asset,
+    make_consent,
+    make_user,
+)
+
+
+class ConsentOwnersTest(APITestCase):
+    def setUp(self):
+        self.owner = make_user()
+        self.solicitor = make_user()
+        self.dataset = make_asset(self.owner)
+        self.consent = Consent.helper.get_or_create(
+            self.dataset,
+            make_asset(self.solicitor, Asset.Types.ALGORITHM),
+            self.solicitor.address,
+            request=3,
+        )
+
+    def respond(self, user):
+        self.client.force_authenticate(user)
+        return self.client.post(
+            reverse("consent-response-list", args=[self.consent.pk]),
+            {"reason": "Test reason", "permitted": "3"},
+        )
+
+    def test_filled_on_creation(self):
+        consent = make_consent(self.solicitor, dataset=self.dataset)
+
+        for created in (self.consent, consent):
+            self.assertEqual(created.dataset_owner, self.owner)
+            self.assertEqual(created.algorithm_owner, self.solicitor)
+
+    def test_inbox_does_not_join_the_assets(self):
+        query = str(Consent.helper.from_dataset_owner(self.owner).query)
+
+        self.assertNotIn("JOIN", query)
+
+    def test_dataset_transfer(self):
+        buyer = make_user()
+
+        self.assertEqual(Consent.helper.transfer(self.dataset, buyer), 1)
+
+        self.dataset.refresh_from_db()
+        self.assertEqual(self.dataset.owner, buyer)
+        self.assertFalse(Consent.helper.from_dataset_owner(self.owner).exists())
+        self.assertEqual(
+            list(Consent.helper.from_dataset_owner(buyer, pending_only=True)),
+            [self.consent],
+        )
+        self.assertEqual(ConsentCounter.objects.get(user=buyer).incoming_pending, 1)
+        self.assertEqual(ConsentCounter.objects.drifted(), [])
+
+        self.assertEqual(
+            self.respond(self.owner).status_code, status.HTTP_400_BAD_REQUEST
+        )
+        self.assertEqual(self.respond(buyer).status_code, status.HTTP_201_CREATED)
+
+    def test_algorithm_transfer(self):
+        buyer = make_user()
+
+        Consent.helper.transfer(self.consent.algorithm, buyer)
+
+        response = self.client.get(
+            reverse("consents-list"), {"algorithm_owner": buyer.address}
+        )
+        self.assertEqual(
+            [consent["id"] for consent in response.data["results"]], [self.consent.pk]
+        )
+        self.assertEqual(ConsentCounter.objects.drifted(), [])
+
+    def test_transfer_to_the_same_owner(self):
+        self.assertEqual(Consent.helper.transfer(self.dataset, self.owner), 0)
+
+
+class AssetOwnerReconcileTest(TestCase):
+    def setUp(self):
+        self.owner = make_user()
+        self.solicitor = make_user()
+        self.dataset = make_asset(self.owner)
+        self.consent = Consent.helper.get_or_create(
+            self.dataset,
+            make_asset(self.solicitor, Asset.Types.ALGORITHM),
+            self.solicitor.address,
+        )
+        self.owners = {}  # DID -> address Aquarius reports, the current if absent
+        patcher = mock.patch("consents.owners.aquarius")
+        self.aquarius = patcher.start()
+        self.aquarius.fetch_ddo_summary.side_effect = self.fetch
+        self.addCleanup(patcher.stop)
+
+    def fetch(self, did: str) -> DdoSummary:
+        owner = self.owners.get(did) or Asset.objects.get(did=did).owner.address
+        if isinstance(owner, Exception):
+            raise owner
+        return DdoSummary(did=did, owner=owner, chain_id=0)
+
+    def reconcile(self, **kwargs) -> owners.Progress:
+        return owners.reconcile(rate=0, **kwargs)
+
+    def test_transfers_the_assets_that_changed_hands(self):
+        buyer = make_address()
+        self.owners[self.dataset.did] = buyer
+
+        progress = self.reconcile()
+
+        self.assertEqual((progress.checked, progress.transferred), (2, 1))
+        self.consent.refresh_from_db()
+        self.assertEqual(self.consent.dataset_owner.address, buyer)
+        self.assertEqual(self.consent.dataset.owner.address, buyer)
+        self.assertEqual(DdoMirror.objects.get(did=self.dataset.did).owner, buyer)
+        self.aquarius.invalidate.assert_called_once_with(self.dataset.did)
+        self.assertFalse(Asset.objects.filter(owner_checked_at__isnull=True).exists())
+        self.assertEqual(ConsentCounter.objects.drifted(), [])
+
+    def test_stalest_first_and_resumable(self):
+        recent, old = make_asset(self.owner), make_asset(self.owner)
+        Asset.objects.update(owner_checked_at=timezone.now() - timedelta(days=2))
+        Asset.objects.filter(pk=old.pk).update(
+            owner_checked_at=timezone.now() - timedelta(days=3)
+        )
+        Asset.objects.filter(pk=recent.pk).update(owner_checked_at=timezone.now())
+        never = make_asset(self.owner)
+
+        def checked():
+            calls = self.aquarius.fetch_ddo_summary.call_args_list
+            return [call.args[0] for call in calls]
+
+        self.reconcile(limit=2)
+
+        self.assertEqual(checked(), [never.did, old.did])
+
+        self.reconcile()
+
+        self.assertEqual(
+            checked(),
+            [never.did, old.did, self.dataset.did, self.consent.algorithm.did],
+        )
+
+    def test_failed_checks_are_counted_and_stamped(self):
+        self.owners[self.dataset.did] = AquariusError("Not found", status_code=404)
+
+        progress = self.reconcile()
+
+        self.assertEqual((progress.checked, progress.errors), (2, 1))
+        self.assertEqual(self.reconcile().checked, 0)
+
+    def test_stops_when_aquarius_is_unavailable(self):
+        self.owners[self.consent.algorithm.did] = AquariusUnavailable(30)
+        self.owners[self.dataset.did] = make_address()
+
+        with self.assertRaises(AquariusUnavailable):
+            self.reconcile()
+
+        self.dataset.refresh_from_db()
+        self.assertIsNotNone(self.dataset.owner_checked_at)
+        self.assertEqual(self.dataset.owner.address, self.owners[self.dataset.did])
+        self.assertTrue(
+            Asset.objects.filter(
+                pk=self.consent.algorithm_id, owner_checked_at__isnull=True
+            ).exists()
+        )
+
+    def test_recurring_task_renews_the_job_lease(self):
+        task = registry.get("consents.reconcile_asset_owners")
+
+        with (
+            mock.patch.object(config, "ASSET_OWNER_CHECK_BATCH_SIZE", 1),
+            mock.patch.object(config, "ASSET_OWNER_CHECK_RATE", 0),
+            mock.patch("consents.tasks.heartbeat") as heartbeat,
+        ):
+            task.fn()
+
+        self.assertEqual(heartbeat.call_count, 2)
+
+    def test_command(self):
+        stdout = StringIO()
+
+        call_command("reconcile_asset_owners", rate=0, batch_size=1, stdout=stdout)
+
+        lines = stdout.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(
+            lines[-1], "Checked asset owners... 2 (0 transferred, 0 errors)"
+        )
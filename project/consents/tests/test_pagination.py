@@ -0,0 +1,48 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from consents.tests.fixtures import make_asset, make_consent, make_user
+
+
+class ConsentPaginationTest(APITestCase):
+    def setUp(self):
+        self.owner = make_user()
+        self.solicitor = make_user()
+        self.consents = [
+            make_consent(self.solicitor, dataset=make_asset(self.owner))
+            for _ in range(5)
+        ]
+
+    def collect(self, url: str, **params) -> list[int]:
+        ids = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [item["id"] for item in response.data["results"]]
+            if not response.data["next"]:
+                return ids
+            response = self.client.get(response.data["next"])
+
+    def test_cursor_walks_every_consent_once(self):
+        ids = self.collect(reverse("consents-list"), page_size=2)
+
+        self.assertEqual(ids, [c.pk for c in reversed(self.consents)])
+
+    def test_page_size_is_capped(self):
+        response = self.client.get(reverse("consents-list"), {"page_size": 10**6})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 5)
+
+    def test_incoming_is_paginated(self):
+        url = reverse("users-incoming", args=[self.owner.address])
+        ids = self.collect(url, page_size=2)
+
+        self.assertEqual(len(ids), 5)
+
+    def test_assets_and_users_are_paginated(self):
+        for name in ("assets-list", "users-list"):
+            response = self.client.get(reverse(name), {"page_size": 1})
+            self.assertEqual(len(response.data["results"]), 1)
+            self.assertIsNotNone(response.data["next"])
@@ -0,0 +1,66 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from consents.tests.fixtures import (
+    make_asset,
+    make_consent,
+    make_response,
+    make_user,
+)
+
+
+class ConsentQueryCountTest(APITestCase):
+    """The consent endpoints must run a fixed number of queries, whatever the
+    number of rows they serialize."""
+
+    def setUp(self):
+        self.owner = make_user()
+        self.solicitor = make_user()
+
+    def seed(self, amount: int) -> None:
+        for i in range(amount):
+            consent = make_consent(
+                self.solicitor,
+                dataset=make_asset(self.owner),
+            )
+            if i % 2:
+                make_response(consent, permitted=1)
+
+    def assert_constant_queries(self, url: str, expected: int) -> None:
+        for amount in (1, 10):
+            self.seed(amount)
+            with self.assertNumQueries(expected):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_consent_list(self):
+        self.assert_constant_queries(reverse("consents-list"), 1)
+
+    def test_consent_detail(self):
+        consent = make_consent(self.solicitor)
+        make_response(consent, permitted=3)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("consents-detail", args=[consent.pk]))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "Accepted")
+
+    def test_user_incoming(self):
+        url = reverse("users-incoming", args=[self.owner.address])
+        self.assert_constant_queries(url, 2)
+
+    def test_user_outgoing(self):
+        url = reverse("users-outgoing", args=[self.solicitor.address])
+        self.assert_constant_queries(url, 2)
+
+    def test_list_status_is_denormalized(self):
+        self.seed(2)
+
+        response = self.client.get(reverse("consents-list"))
+
+        self.assertEqual(
+            sorted(consent["status"] for consent in response.data["results"]),
+            ["Pending", "Resolved"],
+        )
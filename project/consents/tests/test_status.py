@@ -0,0 +1,55 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from consents.models import Consent, Status
+from consents.tests.fixtures import make_asset, make_consent, make_user
+
+
+class ConsentStatusTest(APITestCase):
+    def setUp(self):
+        self.owner = make_user()
+        self.consent = make_consent(make_user(), dataset=make_asset(self.owner))
+        self.client.force_authenticate(self.owner)
+
+    def respond(self, permitted: str):
+        return self.client.post(
+            reverse("consent-response-list", args=[self.consent.pk]),
+            {"reason": "Test reason", "permitted": permitted},
+        )
+
+    def test_response_updates_status(self):
+        response = self.respond("1")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["status"], "Resolved")
+        self.consent.refresh_from_db()
+        self.assertEqual(self.consent.status, Status.RESOLVED)
+
+    def test_delete_response_resets_status(self):
+        self.respond("3")
+
+        response = self.client.delete(
+            reverse("consents-delete-response", args=[self.consent.pk])
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.consent.refresh_from_db()
+        self.assertEqual(self.consent.status, Status.PENDING)
+        self.assertIn(self.consent, Consent.helper.pending())
+
+    def test_sync_command_repairs_drift(self):
+        self.respond("3")
+        Consent.objects.update(status=Status.PENDING)
+
+        with self.assertRaises(SystemExit):
+            call_command("sync_consent_status", check=True, stdout=StringIO())
+
+        call_command("sync_consent_status", stdout=StringIO())
+
+        self.consent.refresh_from_db()
+        self.assertEqual(self.consent.status, Status.ACCEPTED)
+        self.assertFalse(Consent.helper.drifted().exists())
@@ -0,0 +1,219 @@
+import socket
+from datetime import timedelta
+from unittest import mock
+
+from django.urls import reverse
+from django.utils import timezone
+from helpers.config import config
+from helpers.services.aquarius import AquariusError, DdoSummary
+from jobs.models import Job
+from jobs.registry import registry
+from jobs.worker import Worker
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from consents import submissions
+from consents.models import Consent, ConsentSubmission
+from consents.tests.fixtures import make_address, make_consent, make_did, make_user
+
+
+class ConsentSubmissionTest(APITestCase):
+    def setUp(self):
+        patcher = mock.patch("assets.models.aquarius")
+        self.aquarius = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.aquarius.get_ddo_summaries.side_effect = lambda dids: {
+            did: DdoSummary(did=did, owner=make_address(), chain_id=1) for did in dids
+        }
+
+        # Addresses the callback hosts resolve to, IP literals to themselves
+        self.addresses = {"example.com": "93.184.215.14"}
+        patcher = mock.patch(
+            "helpers.validators.CallbackUrlValidator.socket.getaddrinfo",
+            side_effect=lambda host, port, **kwargs: [
+                (
+                    socket.AF_INET,
+                    socket.SOCK_STREAM,
+                    6,
+                    "",
+                    (self.addresses.get(host, host), port),
+                )
+            ],
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.solicitor = make_user()
+        self.client.force_authenticate(self.solicitor)
+
+    def submit(self, **data):
+        return self.client.post(
+            reverse("consents-list"),
+            {"dataset": make_did(), "algorithm": make_did(), "request": "3", **data},
+            headers={"Prefer": "respond-async"},
+        )
+
+    def make_due(self):
+        ConsentSubmission.objects.update(next_attempt_at=timezone.now())
+
+    def test_accepted(self):
+        response = self.submit()
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["state"], "resolving")
+        self.assertEqual(response["Location"], response.data["url"])
+        self.assertEqual(response["Preference-Applied"], "respond-async")
+        self.aquarius.get_ddo_summaries.assert_not_called()
+        self.assertFalse(Consent.objects.exists())
+
+    def test_query_parameter_opt_in(self):
+        response = self.client.post(
+            reverse("consents-list") + "?async=true",
+            {"dataset": make_did(), "algorithm": make_did(), "request": "3"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+    def test_resolved_by_the_worker(self):
+        url = self.submit(callback_url="https://example.com/hook").data["url"]
+
+        with mock.patch("consents.submissions.requests.post") as post:
+            self.assertEqual(submissions.process_due(), 1)
+
+        response = self.client.get(url)
+        self.assertEqual(response.data["state"], "created")
+        consent = Consent.objects.get()
+        self.assertTrue(response.data["consent"].endswith(f"/consents/{consent.pk}/"))
+        self.assertEqual(int(consent.request), 3)
+        self.assertEqual(post.call_args.kwargs["json"]["consent"], consent.pk)
+
+    def test_callbacks_do_not_follow_redirects(self):
+        self.submit(callback_url="https://example.com/hook")
+
+        with mock.patch("consents.submissions.requests.post") as post:
+            submissions.process_due()
+
+        self.assertIs(post.call_args.kwargs["allow_redirects"], False)
+
+    def test_callbacks_to_internal_addresses_are_rejected(self):
+        self.addresses.update(
+            {
+                "internal.example.com": "10.0.0.7",
+                "metadata.example.com": "169.254.169.254",
+                "localhost": "127.0.0.1",
+            }
+        )
+
+        for url in (
+            "http://example.com/hook",
+            "https://internal.example.com/hook",
+            "https://metadata.example.com/latest",
+            "https://localhost:8000/hook",
+            "https://[::1]/hook",
+        ):
+            with self.subTest(url=url):
+                response = self.submit(callback_url=url)
+
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn("callback_url", response.data)
+
+    def test_callback_allowlist(self):
+        self.addresses["hooks.example.com"] = "10.0.0.7"
+
+        with mock.patch.object(config, "CONSENT_CALLBACK_HOSTS", ["hooks.example.com"]):
+            allowed = self.submit(callback_url="https://hooks.example.com/hook")
+            other = self.submit(callback_url="https://example.com/hook")
+
+        self.assertEqual(allowed.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(other.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_callback_host_moved_to_an_internal_address(self):
+        self.submit(callback_url="https://example.com/hook")
+        self.addresses["example.com"] = "192.168.1.1"
+
+        with mock.patch("consents.submissions.requests.post") as post:
+            submissions.process_due()
+
+        post.assert_not_called()
+        self.assertEqual(ConsentSubmission.objects.get().state, "created")
+
+    def test_transient_errors_are_retried(self):
+        self.submit()
+        self.aquarius.get_ddo_summaries.side_effect = lambda dids: {
+            did: AquariusError("Timed out") for did in dids
+        }
+
+        submissions.process_due()
+        submission = ConsentSubmission.objects.get()
+        self.assertEqual(submission.state, "resolving")
+        self.assertEqual(submission.attempts, 1)
+        self.assertEqual(submission.last_error, "Timed out")
+        self.assertGreater(submission.next_attempt_at, timezone.now())
+
+        # Not due yet
+        self.assertEqual(submissions.process_due(), 0)
+
+        for _ in range(config.CONSENT_SUBMISSION_MAX_ATTEMPTS - 1):
+            self.make_due()
+            submissions.process_due()
+
+        submission.refresh_from_db()
+        self.assertEqual(submission.state, "failed")
+        self.assertEqual(submission.attempts, config.CONSENT_SUBMISSION_MAX_ATTEMPTS)
+
+    def test_unknown_asset_fails_right_away(self):
+        self.submit()
+        self.aquarius.get_ddo_summaries.side_effect = lambda dids: {
+            did: AquariusError("Not found", 404) for did in dids
+        }
+
+        submissions.process_due()
+
+        self.assertEqual(ConsentSubmission.objects.get().state, "failed")
+
+    def test_pair_of_another_solicitor_fails(self):
+        existing = make_consent(make_user())
+        self.submit(dataset=existing.dataset.did, algorithm=existing.algorithm.did)
+
+        submissions.process_due()
+
+        submission = ConsentSubmission.objects.get()
+        self.assertEqual(submission.state, "failed")
+        self.assertEqual(
+            submission.last_error,
+            "The dataset and algorithm pair has already been "
+            "requested by another solicitor",
+        )
+        self.assertEqual(Consent.objects.get(), existing)
+
+    def test_recurring_task_renews_the_job_lease(self):
+        self.submit()
+        self.submit()
+
+        with mock.patch("consents.tasks.heartbeat") as heartbeat:
+            registry.get("consents.process_due_submissions").fn()
+
+        self.assertEqual(heartbeat.call_count, 2)
+        self.assertFalse(ConsentSubmission.objects.filter(state="resolving").exists())
+
+    def test_backoff(self):
+        self.assertEqual(submissions.backoff(1), timedelta(seconds=10))
+        self.assertEqual(submissions.backoff(3), timedelta(seconds=40))
+        self.assertEqual(submissions.backoff(20), timedelta(seconds=600))
+
+    def test_only_the_solicitor_can_see_it(self):
+        url = self.submit().data["url"]
+        self.client.force_authenticate(make_user())
+
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_resolved_by_a_job(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.submit()
+
+        self.assertEqual(Worker(name="test").run_once(), 1)
+
+        self.assertEqual(ConsentSubmission.objects.get().state, "created")
+        self.assertEqual(
+            Job.objects.get(task="consents.resolve_submission").state, Job.State.DONE
+        )
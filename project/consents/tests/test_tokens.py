@@ -0,0 +1,168 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.urls import reverse
+from django.utils import timezone
+from helpers.config import config
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.exceptions import TokenBackendError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from consents import tokens
+from consents.models import ConsentToken
+from consents.tests.fixtures import make_asset, make_consent, make_user
+
+
+class ConsentTokenTest(APITestCase):
+    def setUp(self):
+        self.enterContext(
+            mock.patch.object(config, "CONSENT_TOKEN_SIGNING_KEY", "decision-key")
+        )
+        self.owner = make_user()
+        self.solicitor = make_user()
+        self.consent = make_consent(
+            self.solicitor, dataset=make_asset(self.owner), request=3
+        )
+        self.client.force_authenticate(self.owner)
+
+    def respond(self, permitted: str):
+        return self.client.post(
+            reverse("consent-response-list", args=[self.consent.pk]),
+            {"reason": "Test reason", "permitted": permitted},
+        )
+
+    def token(self):
+        return self.client.get(reverse("consents-token", args=[self.consent.pk]))
+
+    def revoked(self, **params):
+        return self.client.get(reverse("consents-revoked-tokens"), params)
+
+    def test_accepting_issues_a_verifiable_token(self):
+        self.respond("2")
+
+        response = self.token()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        claims = tokens.decode(response.data["token"])
+        self.assertEqual(claims["jti"], response.data["jti"])
+        self.assertEqual(claims["dataset"], self.consent.dataset.did)
+        self.assertEqual(claims["algorithm"], self.consent.algorithm.did)
+        self.assertEqual(claims["solicitor"], self.solicitor.address)
+        self.assertEqual(claims["status"], "Resolved")
+        self.assertEqual(claims["permitted"], 2)
+        self.assertEqual(claims["exp"], response.data["expires_at"])
+        self.assertEqual(ConsentToken.objects.count(), 1)
+
+    def test_no_token_unless_allowed(self):
+        self.assertEqual(self.token().status_code, status.HTTP_404_NOT_FOUND)
+
+        self.respond("0")
+
+        self.assertEqual(self.token().status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(ConsentToken.objects.exists())
+
+    def test_bulk_responses_issue_tokens(self):
+        other = make_consent(self.solicitor, dataset=make_asset(self.owner))
+
+        self.client.post(
+            reverse("consents-bulk-respond"),
+            {
+                "items": [
+                    {"consent": self.consent.pk, "permitted": "3"},
+                    {"consent": other.pk, "permitted": "0"},
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(
+            list(ConsentToken.objects.values_list("consent", flat=True)),
+            [self.consent.pk],
+        )
+
+    def test_expired_token_is_reissued(self):
+        self.respond("3")
+        first = self.token().data
+        ConsentToken.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        second = self.token().data
+
+        self.assertNotEqual(first["jti"], second["jti"])
+        self.assertEqual(tokens.purge(), 1)
+
+    def test_deleting_the_response_revokes(self):
+        self.respond("3")
+        jti = self.token().data["jti"]
+        before = timezone.now().timestamp()
+
+        self.client.delete(reverse("consents-delete-response", args=[self.consent.pk]))
+
+        self.assertEqual(self.token().status_code, status.HTTP_404_NOT_FOUND)
+        response = self.revoked()
+        self.assertEqual([t["jti"] for t in response.data["revoked"]], [jti])
+        self.assertEqual(len(self.revoked(since=before).data["revoked"]), 1)
+        since = response.data["checked_at"]
+        self.assertEqual(self.revoked(since=since).data["revoked"], [])
+
+    def test_deleting_the_consent_revokes(self):
+        self.respond("3")
+        jti = self.token().data["jti"]
+        self.client.force_authenticate(self.solicitor)
+
+        response = self.client.delete(
+            reverse("consents-detail", args=[self.consent.pk])
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual([t["jti"] for t in self.revoked().data["revoked"]], [jti])
+
+    def test_expired_revocations_are_not_listed(self):
+        self.respond("3")
+        self.token()
+        tokens.revoke(self.consent)
+        ConsentToken.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        self.assertEqual(self.revoked().data["revoked"], [])
+
+    def test_invalid_since(self):
+        response = self.revoked(since="yesterday")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_access_tokens_are_not_decisions(self):
+        access = str(AccessToken.for_user(self.owner))
+
+        with self.assertRaises(TokenBackendError):
+            tokens.decode(access)
+
+    def test_decisions_are_not_signed_with_the_access_token_key(self):
+        self.respond("3")
+        decision = self.token().data["token"]
+        access_backend = TokenBackend(
+            jwt_settings.ALGORITHM,
+            signing_key=jwt_settings.SIGNING_KEY,
+            audience=tokens.AUDIENCE,
+        )
+
+        with self.assertRaises(TokenBackendError):
+            access_backend.decode(decision)
+
+    def test_signing_key_is_required(self):
+        with mock.patch.object(config, "CONSENT_TOKEN_SIGNING_KEY", None):
+            with self.assertRaises(ImproperlyConfigured):
+                tokens.backend()
+        with (
+            mock.patch.object(config, "CONSENT_TOKEN_ALGORITHM", "ES256"),
+            mock.patch.object(config, "CONSENT_TOKEN_VERIFYING_KEY", ""),
+        ):
+            with self.assertRaises(ImproperlyConfigured):
+                tokens.backend()
+
+    def test_no_public_key_for_shared_secrets(self):
+        response = self.client.get(reverse("consents-token-key"))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
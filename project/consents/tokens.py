@@ -0,0 +1,145 @@
+"""Signed consent decisions that compute providers verify offline.
+
+Accepting or resolving a consent issues a short-lived JWT carrying the
+dataset, algorithm, solicitor and permitted flags, signed with the
+CONSENT_TOKEN_* key material (a dedicated HS256 secret by default, never
+the SECRET_KEY of the access tokens, or an ES256/RS256 key pair so providers
+only need the public key). Tokens are revoked when their response or consent
+is deleted. The revocations of the tokens that have not expired yet are
+published, so a provider checking them every so often never trusts a
+withdrawn consent for longer than that.
+"""
+
+from datetime import timedelta
+
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from helpers.config import config
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.exceptions import TokenBackendError
+
+from consents.models import Consent, ConsentResponse, ConsentToken, Status
+
+AUDIENCE = "consent-decision"
+TOKEN_TYPE = "consent"
+
+ALLOWED = (Status.ACCEPTED, Status.RESOLVED)
+
+
+def backend() -> TokenBackend:
+    """The key material of the decision tokens. Checked here rather than
+    when the settings load, so a missing key only fails the token endpoints.
+
+    Raises:
+        ImproperlyConfigured: If the key material is not configured.
+    """
+    # Decision tokens are verified by third parties, sharing the key of the
+    # access tokens with them would let them forge sessions
+    if not config.CONSENT_TOKEN_SIGNING_KEY:
+        raise ImproperlyConfigured("CONSENT_TOKEN_SIGNING_KEY must be set")
+    if (
+        not config.CONSENT_TOKEN_ALGORITHM.startswith("HS")
+        and not config.CONSENT_TOKEN_VERIFYING_KEY
+    ):
+        raise ImproperlyConfigured("CONSENT_TOKEN_VERIFYING_KEY must be set")
+
+    return TokenBackend(
+        config.CONSENT_TOKEN_ALGORITHM,
+        signing_key=config.CONSENT_TOKEN_SIGNING_KEY,
+        verifying_key=config.CONSENT_TOKEN_VERIFYING_KEY,
+        audience=AUDIENCE,
+    )
+
+
+def issue(*responses: ConsentResponse) -> list[ConsentToken]:
+    """Issues a token for each given response that allows the algorithm of
+    its consent. Meant to run in the transaction creating the responses."""
+    now = timezone.now()
+    expires_at = now + timedelta(seconds=config.CONSENT_TOKEN_LIFETIME)
+    return ConsentToken.objects.bulk_create(
+        ConsentToken(
+            consent_id=response.consent_id,
+            permitted=response.permitted,
+            issued_at=now,
+            expires_at=expires_at,
+        )
+        for response in responses
+        if response.status in ALLOWED
+    )
+
+
+def current(consent: Consent) -> ConsentToken | None:
+    """The valid token of a consent, issuing a new one if the last expired.
+    None if the consent does not allow its algorithm."""
+    if consent.status not in ALLOWED:
+        return None
+
+    token = (
+        consent.tokens.filter(revoked_at__isnull=True, expires_at__gt=timezone.now())
+        .order_by("-expires_at")
+        .first()
+    )
+    return token or issue(consent.response)[0]
+
+
+def revoke(*consents: Consent | int) -> int:
+    """Revokes every unexpired token of the given consents.
+
+    Returns:
+        int: The amount of revoked tokens.
+    """
+    now = timezone.now()
+    return ConsentToken.objects.filter(
+        consent__in=consents,
+        revoked_at__isnull=True,
+        expires_at__gt=now,
+    ).update(revoked_at=now)
+
+
+def revoked(since=None):
+    """Revocations of the tokens that have not expired yet, the only ones a
+    provider may still trust, optionally only those made after `since`."""
+    queryset = ConsentToken.objects.filter(
+        revoked_at__isnull=False,
+        expires_at__gt=timezone.now(),
+    )
+    if since is not None:
+        queryset = queryset.filter(revoked_at__gt=since)
+    return queryset.order_by("revoked_at")
+
+
+def purge() -> int:
+    """Deletes the expired tokens, which nobody can use anymore."""
+    deleted, _ = ConsentToken.objects.filter(expires_at__lt=timezone.now()).delete()
+    return deleted
+
+
+def encode(token: ConsentToken) -> str:
+    consent = token.consent
+    return backend().encode(
+        {
+            "token_type": TOKEN_TYPE,
+            "jti": token.jti.hex,
+            "iat": int(token.issued_at.timestamp()),
+            "exp": int(token.expires_at.timestamp()),
+            "consent": consent.pk,
+            "dataset": consent.dataset.did,
+            "algorithm": consent.algorithm.did,
+            "solicitor": consent.solicitor.address,
+            "status": str(consent.get_status_display()),
+            "permitted": int(token.permitted),
+        }
+    )
+
+
+def decode(token: str) -> dict:
+    """Verifies a token as a provider would, its signature, audience and
+    expiry. Revocations have to be checked apart.
+
+    Raises:
+        TokenBackendError: If the token is invalid or expired.
+    """
+    payload = backend().decode(token)
+    if payload.get("token_type") != TOKEN_TYPE:
+        raise TokenBackendError("Token is not a consent decision")
+    return payload
@@ -1,7 +1,20 @@
+import hashlib
+from datetime import UTC, datetime
+
+import orjson
 from django.db import transaction
-from django.db.models import Q
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    quote_etag,
+)
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
+from helpers.config import config
+from helpers.pagination import ConsentPagination
 from helpers.permissions.consent import ConsentPermissions
 from helpers.permissions.consent_response import ConsentResponsePermissions
 from rest_framework import status
@@ -13,17 +26,34 @@ from rest_framework.mixins import (
     ListModelMixin,
     RetrieveModelMixin,
 )
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.permissions import AllowAny, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
-from consents.models import Consent, ConsentResponse
+from consents import lifecycle, tokens
+from consents.export import EXPORT_FORMATS, export_rows
+from consents.filters import ConsentFilterSet
+from consents.models import (
+    Consent,
+    ConsentEvent,
+    ConsentResponse,
+    ConsentSubmission,
+)
 from consents.serializers import (
+    BatchConsentDecision,
+    BatchCreateConsent,
+    BulkCreateConsentResponse,
+    ConsentDecision,
+    ConsentEventSerializer,
+    ConsentSubmissionSerializer,
+    ConsentTokenSerializer,
     CreateConsent,
     CreateConsentResponse,
+    CreateConsentSubmission,
     DetailConsent,
     DetailConsentResponse,
     ListConsent,
+    RevokedConsentToken,
 )
 
 
@@ -34,8 +64,9 @@ class ConsentsViewset(
     DestroyModelMixin,
     GenericViewSet,
 ):
-    queryset = Consent.objects.all()
+    queryset = Consent.helper.with_details()
     serializer_class = ListConsent
+    pagination_class = ConsentPagination
     permission_classes = (
         IsAuthenticatedOrReadOnly,
         ConsentPermissions,
@@ -48,57 +79,72 @@ class ConsentsViewset(
             case "retrieve":
                 return DetailConsent
             case "create":
+                if self.respond_async:
+                    return CreateConsentSubmission
                 return CreateConsent
+            case "batch_create":
+                return BatchCreateConsent
+            case "decision":
+                return ConsentDecision
+            case "batch_decision":
+                return BatchConsentDecision
+            case "bulk_respond":
+                return BulkCreateConsentResponse
         return self.serializer_class
 
+    @property
+    def respond_async(self) -> bool:
+        """Whether the client opted in to asynchronous creation, with a
+        `Prefer: respond-async` header or the `async` query parameter."""
+        request = self.request
+        return "respond-async" in request.headers.get("Prefer", "") or (
+            request.query_params.get("async", "").lower() in ("1", "true")
+        )
+
     def get_queryset(self):
         if getattr(self, "swagger_fake_view", False):
             return self.queryset.none()
 
-        query_params = self.request.query_params
-        special = {
-            "dataset": "dataset__owner__address",
-            "algorithm": "algorithm__owner__address",
-        }
-
-        query = Q()
-        for param, value in query_params.items():
-            if param in special:
-                query |= Q(**{special[param]: value})
-            else:
-                query |= Q(**{param: value})
-
-        return self.queryset.filter(query).order_by("-created_at")
+        if self.action == "list":
+            return ConsentFilterSet(self.request.query_params).filter(self.queryset)
+        return self.queryset
 
     @swagger_auto_schema(
         operation_summary="Lists the Consents",
         operation_description="List of Constents",
+        manual_parameters=ConsentFilterSet.openapi_parameters(),
         responses={
             "200": openapi.Response(
                 description="List of consents",
                 schema=ListConsent,
                 examples={
                     "application/json": {
-                        "url": "http://localhost:8050/api/consents/1/",
-                        "id": 1,
-                        "created_at": 1758271130,
-                        "dataset": "http://localhost:8050/api/assets/did:op:75afadb65591ca977344fa598c2b42c0ca5c7e8620b7c8bf47533e8f222d7997/",
-                        "algorithm": "http://localhost:8050/api/assets/did:op:b533c6703cd099cfc228e1f6587c4049bc1f445b2bd0da24f5321a13fd9f1c8a/",
-                        "solicitor": {
-                            "url": "http://localhost:8050/api/users/0xD999bAaE98AC5246568FD726be8832c49626867D/",
-                            "address": "0xD999bAaE98AC5246568FD726be8832c49626867D",
-                        },
-                        "reason": "nkjhk",
-                        "request": {"trusted_algorithm": "true"},
-                        "response": {
-                            "consent": "http://localhost:8050/api/consents/1/",
-                            "status": "Denied",
-                            "reason": "asdsad",
-                            "permitted": {},
-                            "last_updated_at": 1758288980,
-                        },
-                        "status": "Denied",
-                        "direction": "-",
+                        "next": "http://localhost:8050/api/consents/?cursor=cD0yMDI1LTA5LTE5",
+                        "previous": None,
+                        "results": [
+                            {
+                                "url": "http://localhost:8050/api/consents/1/",
+                                "id": 1,
+                                "created_at": 1758271130,
+                                "dataset": "http://localhost:8050/api/assets/did:op:75afadb65591ca977344fa598c2b42c0ca5c7e8620b7c8bf47533e8f222d7997/",
+                                "algorithm": "http://localhost:8050/api/assets/did:op:b533c6703cd099cfc228e1f6587c4049bc1f445b2bd0da24f5321a13fd9f1c8a/",
+                                "solicitor": {
+                                    "url": "http://localhost:8050/api/users/0xD999bAaE98AC5246568FD726be8832c49626867D/",
+                                    "address": "0xD999bAaE98AC5246568FD726be8832c49626867D",
+                                },
+                                "reason": "nkjhk",
+                                "request": {"trusted_algorithm": "true"},
+                                "response": {
+                                    "consent": "http://localhost:8050/api/consents/1/",
+                                    "status": "Denied",
+                                    "reason": "asdsad",
+                                    "permitted": {},
+                                    "last_updated_at": 1758288980,
+                                },
+                                "status": "Denied",
+                                "direction": "-",
+                            },
+                        ],
                     }
                 },
             ),
@@ -172,6 +218,23 @@ class ConsentsViewset(
                     }
                 },
             ),
+            "202": openapi.Response(
+                description="Accepted for asynchronous creation (`Prefer: respond-async`), poll the `Location`",
+                examples={
+                    "application/json": {
+                        "id": 12,
+                        "url": "http://localhost:8050/api/consents/submissions/12/",
+                        "state": "resolving",
+                        "dataset": "did:op:75afadb65591ca977344fa598c2b42c0ca5c7e8620b7c8bf47533e8f222d7997",
+                        "algorithm": "did:op:f0f0e7de07529aac4907a619c53dc6884ccb01cadd2666174216cd1a3f94f426",
+                        "request": {"trusted_algorithm": True},
+                        "reason": "asdasd",
+                        "consent": None,
+                        "attempts": 0,
+                        "last_error": "",
+                    }
+                },
+            ),
             "401": openapi.Response(
                 description="Unauthorized",
                 schema=openapi.Schema(
@@ -188,7 +251,433 @@ class ConsentsViewset(
         tags=["Consent Petition"],
     )
     def create(self, request, *args, **kwargs):
-        return super().create(request, *args, **kwargs)
+        if not self.respond_async:
+            return super().create(request, *args, **kwargs)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(
+            serializer.data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={
+                "Location": serializer.data["url"],
+                "Preference-Applied": "respond-async",
+            },
+        )
+
+    @swagger_auto_schema(
+        method="get",
+        operation_summary="Retrieves an asynchronous Consent Petition",
+        operation_description="State of a Consent Petition created with `Prefer: respond-async`. It stays `resolving` until its assets are resolved in Aquarius, then becomes `created`, linking the consent, or `failed`, with the last error.",
+        responses={
+            "200": openapi.Response(
+                description="The submission",
+                examples={
+                    "application/json": {
+                        "id": 12,
+                        "url": "http://localhost:8050/api/consents/submissions/12/",
+                        "state": "created",
+                        "dataset": "did:op:75afadb65591ca977344fa598c2b42c0ca5c7e8620b7c8bf47533e8f222d7997",
+                        "algorithm": "did:op:f0f0e7de07529aac4907a619c53dc6884ccb01cadd2666174216cd1a3f94f426",
+                        "request": {
+                            "trusted_algorithm_publisher": True,
+                            "trusted_algorithm": True,
+                        },
+                        "reason": "I want to use your data",
+                        "consent": "http://localhost:8050/api/consents/3/",
+                        "attempts": 1,
+                        "last_error": "",
+                    }
+                },
+            ),
+            "404": openapi.Response(description="Not found or not yours"),
+        },
+        tags=["Consent Petition"],
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path=r"submissions/(?P<submission_pk>[0-9]+)",
+    )
+    def submission(self, request, submission_pk=None, *args, **kwargs):
+        submission = get_object_or_404(
+            ConsentSubmission,
+            pk=submission_pk,
+            solicitor=request.user,
+        )
+        return Response(
+            ConsentSubmissionSerializer(submission, context={"request": request}).data
+        )
+
+    @swagger_auto_schema(
+        method="get",
+        operation_summary="Decides whether an algorithm may run on a dataset",
+        operation_description="Returns whether the algorithm is allowed on the dataset, along with the status and permitted flags of their Consent Petition. Reads a single consent through its unique (dataset, algorithm) pair, so its cost does not depend on the number of consents. Pairs without a consent, or whose consent was requested by another solicitor than the given one, are not allowed. Responses carry an `ETag` and must be revalidated before each use, unchanged decisions are answered with a 304.",
+        query_serializer=ConsentDecision,
+        responses={
+            "200": openapi.Response(
+                description="The decision",
+                examples={
+                    "application/json": {
+                        "dataset": "did:op:75afadb65591ca977344fa598c2b42c0ca5c7e8620b7c8bf47533e8f222d7997",
+                        "algorithm": "did:op:b533c6703cd099cfc228e1f6587c4049bc1f445b2bd0da24f5321a13fd9f1c8a",
+                        "solicitor": "0xD999bAaE98AC5246568FD726be8832c49626867D",
+                        "consent": "http://localhost:8050/api/consents/1/",
+                        "allowed": True,
+                        "status": "Resolved",
+                        "request": {
+                            "trusted_algorithm_publisher": True,
+                            "trusted_algorithm": True,
+                        },
+                        "permitted": {"trusted_algorithm": True},
+                        "permitted_mask": 2,
+                    }
+                },
+            ),
+            "304": openapi.Response(description="Not modified since the given ETag"),
+            "400": openapi.Response(
+                description="Bad Request",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        "dataset": openapi.Schema(
+                            type=openapi.TYPE_ARRAY,
+                            items=openapi.Schema(type=openapi.TYPE_STRING),
+                        )
+                    },
+                ),
+                examples={"application/json": {"dataset": ["This field is required."]}},
+            ),
+        },
+        tags=["Consent Petition"],
+    )
+    @action(detail=False, methods=["get"])
+    def decision(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        query = serializer.validated_data
+        consent = Consent.helper.decision(**query)
+        data = ConsentDecision(
+            {**query, "consent": consent},
+            context=self.get_serializer_context(),
+        ).data
+
+        digest = hashlib.blake2b(
+            orjson.dumps(data, option=orjson.OPT_SORT_KEYS), digest_size=16
+        )
+        etag = quote_etag(digest.hexdigest())
+        response = get_conditional_response(request, etag=etag) or Response(data)
+        response["ETag"] = etag
+        # Revalidated on every use, a withdrawn consent must not be served
+        # from a cache. Unchanged decisions are answered with a cheap 304
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    @swagger_auto_schema(
+        method="post",
+        operation_summary="Decides many dataset and algorithm pairs at once",
+        operation_description="Returns the decision of each (dataset, algorithm) pair, as the single decision endpoint does, in order. The whole batch is answered with a single query, so its latency barely grows with its size. Reads only, so it does not require authentication.",
+        request_body=BatchConsentDecision,
+        responses={
+            "200": openapi.Response(
+                description="Decision of each pair",
+                examples={
+                    "application/json": {
+                        "results": [
+                            {
+                                "index": 0,
+                                "dataset": "did:op:75afadb65591ca977344fa598c2b42c0ca5c7e8620b7c8bf47533e8f222d7997",
+                                "algorithm": "did:op:b533c6703cd099cfc228e1f6587c4049bc1f445b2bd0da24f5321a13fd9f1c8a",
+                                "solicitor": "0xD999bAaE98AC5246568FD726be8832c49626867D",
+                                "consent": "http://localhost:8050/api/consents/1/",
+                                "allowed": True,
+                                "status": "Accepted",
+                                "request": {"trusted_algorithm": True},
+                                "permitted": {"trusted_algorithm": True},
+                                "permitted_mask": 2,
+                            },
+                            {
+                                "index": 1,
+                                "dataset": "did:op:75afadb65591ca977344fa598c2b42c0ca5c7e8620b7c8bf47533e8f222d7997",
+                                "algorithm": "did:op:f0f0e7de07529aac4907a619c53dc6884ccb01cadd2666174216cd1a3f94f426",
+                                "solicitor": None,
+                                "consent": None,
+                                "allowed": False,
+                                "status": None,
+                                "request": {},
+                                "permitted": {},
+                                "permitted_mask": 0,
+                            },
+                        ]
+                    }
+                },
+            ),
+            "400": openapi.Response(
+                description="Bad Request",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        "pairs": openapi.Schema(
+                            type=openapi.TYPE_ARRAY,
+                            items=openapi.Schema(type=openapi.TYPE_OBJECT),
+                        )
+                    },
+                ),
+                examples={
+                    "application/json": {
+                        "pairs": {
+                            "non_field_errors": [
+                                "Ensure this field has no more than 500 elements."
+                            ]
+                        }
+                    }
+                },
+            ),
+        },
+        tags=["Consent Petition"],
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="decisions",
+        permission_classes=(AllowAny,),
+    )
+    def batch_decision(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        pairs = serializer.validated_data["pairs"]
+        consents = Consent.helper.decisions(pairs)
+        return Response(
+            BatchConsentDecision(
+                [
+                    {**pair, "consent": consent}
+                    for pair, consent in zip(pairs, consents)
+                ],
+                context=self.get_serializer_context(),
+            ).data
+        )
+
+    @swagger_auto_schema(
+        method="get",
+        operation_summary="Signed decision of an accepted Consent Petition",
+        operation_description="Returns a short-lived JWT that a compute provider can verify offline instead of calling the decision endpoint. It carries the `dataset`, `algorithm`, `solicitor`, `status` and `permitted` bitmask claims, and the `consent-decision` audience. A token is issued when the consent is accepted or resolved, and a new one when the last expires. Deleting the response or the consent revokes its tokens, see the revocation feed.",
+        responses={
+            "200": openapi.Response(
+                description="The current token",
+                examples={
+                    "application/json": {
+                        "jti": "5f0c2d5e9b2a4bb8a3d4e1f2a6b7c8d9",
+                        "token": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9...",
+                        "issued_at": 1758291529,
+                        "expires_at": 1758292429,
+                    }
+                },
+            ),
+            "404": openapi.Response(
+                description="Consent not found, or not accepted nor resolved",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={"detail": openapi.Schema(type=openapi.TYPE_STRING)},
+                ),
+                examples={
+                    "application/json": {
+                        "detail": "The consent does not allow its algorithm"
+                    }
+                },
+            ),
+        },
+        tags=["Consent Petition"],
+    )
+    @action(detail=True, methods=["get"])
+    def token(self, request, *args, **kwargs):
+        with transaction.atomic():
+            token = tokens.current(self.get_object())
+        if token is None:
+            return Response(
+                {"detail": "The consent does not allow its algorithm"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return Response(ConsentTokenSerializer(token).data)
+
+    @swagger_auto_schema(
+        method="get",
+        operation_summary="Revoked decision tokens",
+        operation_description="Lists the revoked decision tokens that have not expired yet, oldest revocation first. Expired tokens are never listed, so the whole list stays small and providers may fetch it completely. `since` (a UNIX timestamp) only returns the revocations made after it, pass a value somewhat before the previous `checked_at` to not miss revocations committed meanwhile.",
+        manual_parameters=[
+            openapi.Parameter(
+                "since",
+                openapi.IN_QUERY,
+                description="Only revocations after this UNIX timestamp",
+                type=openapi.TYPE_NUMBER,
+                example=1758291529.5,
+            ),
+        ],
+        responses={
+            "200": openapi.Response(
+                description="The revoked tokens",
+                examples={
+                    "application/json": {
+                        "checked_at": 1758291600.25,
+                        "revoked": [
+                            {
+                                "jti": "5f0c2d5e9b2a4bb8a3d4e1f2a6b7c8d9",
+                                "revoked_at": 1758291580.123,
+                                "expires_at": 1758292429,
+                            }
+                        ],
+                    }
+                },
+            ),
+            "400": openapi.Response(
+                description="Bad Request",
+                examples={
+                    "application/json": {"since": ["A valid number is required."]}
+                },
+            ),
+        },
+        tags=["Consent Petition"],
+    )
+    @action(detail=False, methods=["get"], url_path="tokens/revoked")
+    def revoked_tokens(self, request, *args, **kwargs):
+        since = request.query_params.get("since")
+        if since is not None:
+            try:
+                since = datetime.fromtimestamp(float(since), tz=UTC)
+            except (ValueError, OverflowError, OSError):
+                raise ValidationError({"since": ["A valid number is required."]})
+
+        checked_at = timezone.now()
+        return Response(
+            {
+                "checked_at": checked_at.timestamp(),
+                "revoked": RevokedConsentToken(tokens.revoked(since), many=True).data,
+            }
+        )
+
+    @swagger_auto_schema(
+        method="get",
+        operation_summary="Key verifying the decision tokens",
+        operation_description="Public key and algorithm providers verify the decision tokens with. Only available when they are signed with an asymmetric algorithm (ES256, RS256...), HMAC keys are shared out of band.",
+        responses={
+            "200": openapi.Response(
+                description="The verifying key",
+                examples={
+                    "application/json": {
+                        "algorithm": "ES256",
+                        "audience": "consent-decision",
+                        "verifying_key": "-----BEGIN PUBLIC KEY-----\n...\n-----END PUBLIC KEY-----\n",
+                    }
+                },
+            ),
+            "404": openapi.Response(
+                description="Tokens are signed with a shared secret",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={"detail": openapi.Schema(type=openapi.TYPE_STRING)},
+                ),
+            ),
+        },
+        tags=["Consent Petition"],
+    )
+    @action(detail=False, methods=["get"], url_path="tokens/key")
+    def token_key(self, request, *args, **kwargs):
+        backend = tokens.backend()
+        if backend.algorithm.startswith("HS"):
+            return Response(
+                {"detail": "Decision tokens are signed with a shared secret"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return Response(
+            {
+                "algorithm": backend.algorithm,
+                "audience": tokens.AUDIENCE,
+                "verifying_key": backend.verifying_key,
+            }
+        )
+
+    @swagger_auto_schema(
+        method="post",
+        operation_summary="Create many Consent Petitions at once",
+        operation_description="Creates a Consent Petition for each (dataset, algorithm) item. Every unknown asset is resolved in Aquarius only once and the petitions are inserted in bulk. Returns one result per item, in order.",
+        request_body=BatchCreateConsent,
+        responses={
+            "200": openapi.Response(
+                description="Result of each item",
+                examples={
+                    "application/json": {
+                        "results": [
+                            {
+                                "index": 0,
+                                "status": "created",
+                                "consent": {
+                                    "id": 3,
+                                    "created_at": 1758291529,
+                                    "dataset": "http://localhost:8050/api/assets/did:op:75afadb65591ca977344fa598c2b42c0ca5c7e8620b7c8bf47533e8f222d7997/",
+                                    "algorithm": "http://localhost:8050/api/assets/did:op:f0f0e7de07529aac4907a619c53dc6884ccb01cadd2666174216cd1a3f94f426/",
+                                    "solicitor": {
+                                        "url": "http://localhost:8050/api/users/0xD999bAaE98AC5246568FD726be8832c49626867D/",
+                                        "address": "0xD999bAaE98AC5246568FD726be8832c49626867D",
+                                    },
+                                    "reason": "asdasd",
+                                    "request": {"trusted_algorithm": "true"},
+                                    "response": "null",
+                                    "status": "null",
+                                },
+                            },
+                            {
+                                "index": 1,
+                                "status": "error",
+                                "detail": "Asset with DID did:op:b533c6703cd099cfc228e1f6587c4049bc1f445b2bd0da24f5321a13fd9f1c8a is not a dataset",
+                            },
+                        ]
+                    }
+                },
+            ),
+            "400": openapi.Response(
+                description="Bad Request",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        "items": openapi.Schema(
+                            type=openapi.TYPE_ARRAY,
+                            items=openapi.Schema(type=openapi.TYPE_OBJECT),
+                        )
+                    },
+                ),
+                examples={
+                    "application/json": {
+                        "items": {
+                            "non_field_errors": [
+                                "Ensure this field has no more than 100 elements."
+                            ]
+                        }
+                    }
+                },
+            ),
+            "401": openapi.Response(
+                description="Unauthorized",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={"detail": openapi.Schema(type=openapi.TYPE_STRING)},
+                ),
+                examples={
+                    "application/json": {
+                        "detail": "Authentication credentials were not provided"
+                    }
+                },
+            ),
+        },
+        tags=["Consent Petition"],
+    )
+    @action(detail=False, methods=["post"], url_path="batch")
+    def batch_create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_200_OK)
 
     @swagger_auto_schema(
         operation_summary="Delete a Consent Petition",
@@ -249,6 +738,11 @@ class ConsentsViewset(
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
 
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        lifecycle.deleted(instance)
+        instance.delete()
+
     @swagger_auto_schema(
         method="delete",
         operation_summary="Delete a consent petition response",
@@ -308,15 +802,254 @@ class ConsentsViewset(
     def delete_response(self, *args, **kwargs):
         instance = self.get_object()
 
-        query = ConsentResponse.objects.filter(consent=instance)
-        if query.exists():
-            query.first().delete()
-            return Response(status=status.HTTP_204_NO_CONTENT)
+        with transaction.atomic():
+            deleted, _ = ConsentResponse.objects.filter(consent=instance).delete()
+            if deleted:
+                lifecycle.response_deleted(instance)
+                return Response(status=status.HTTP_204_NO_CONTENT)
         return Response(
             {"detail": "No ConsentResponse found for the given Consent"},
             status=status.HTTP_404_NOT_FOUND,
         )
 
+    @swagger_auto_schema(
+        method="post",
+        operation_summary="Respond to many Consent Petitions at once",
+        operation_description="Responds to each given Consent Petition with its permitted flags and reason. Must be authenticated and be the owner of the datasets. Returns one result per item, in order.",
+        request_body=BulkCreateConsentResponse,
+        responses={
+            "200": openapi.Response(
+                description="Result of each item",
+                examples={
+                    "application/json": {
+                        "results": [
+                            {
+                                "index": 0,
+                                "consent": 1,
+                                "status": "created",
+                                "consent_status": "Accepted",
+                            },
+                            {
+                                "index": 1,
+                                "consent": 2,
+                                "status": "error",
+                                "detail": "Consent already has been responded to",
+                            },
+                        ]
+                    }
+                },
+            ),
+            "400": openapi.Response(
+                description="Bad Request",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        "items": openapi.Schema(
+                            type=openapi.TYPE_ARRAY,
+                            items=openapi.Schema(type=openapi.TYPE_OBJECT),
+                        )
+                    },
+                ),
+                examples={
+                    "application/json": {
+                        "items": {
+                            "non_field_errors": [
+                                "Ensure this field has no more than 100 elements."
+                            ]
+                        }
+                    }
+                },
+            ),
+            "401": openapi.Response(
+                description="Unauthorized",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={"detail": openapi.Schema(type=openapi.TYPE_STRING)},
+                ),
+                examples={
+                    "application/json": {
+                        "detail": "Authentication credentials were not provided"
+                    }
+                },
+            ),
+        },
+        tags=["Consent Petition Response"],
+    )
+    @action(detail=False, methods=["post"], url_path="responses")
+    def bulk_respond(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        method="get",
+        operation_summary="Changes of the Consent Petitions since a cursor",
+        operation_description="Append-only feed of every creation, response, response deletion and deletion of a Consent Petition, oldest first. Pass the returned `cursor` as `after` to get only what changed since, polling costs the same whatever the number of consents. Deleted consents are kept as `deleted` tombstones. Starting with `after=0` replays the whole history.",
+        manual_parameters=[
+            openapi.Parameter(
+                "after",
+                openapi.IN_QUERY,
+                description="Cursor of the last event already seen",
+                type=openapi.TYPE_INTEGER,
+                default=0,
+            ),
+            openapi.Parameter(
+                "limit",
+                openapi.IN_QUERY,
+                description=f"Max events to return, up to {config.CONSENT_FEED_PAGE_SIZE}",
+                type=openapi.TYPE_INTEGER,
+                default=config.CONSENT_FEED_PAGE_SIZE,
+            ),
+        ],
+        responses={
+            "200": openapi.Response(
+                description="The events after the cursor",
+                examples={
+                    "application/json": {
+                        "cursor": 2,
+                        "has_more": False,
+                        "events": [
+                            {
+                                "cursor": 1,
+                                "kind": "created",
+                                "consent": 3,
+                                "created_at": 1758291529,
+                                "data": {
+                                    "dataset": "did:op:75afadb65591ca977344fa598c2b42c0ca5c7e8620b7c8bf47533e8f222d7997",
+                                    "algorithm": "did:op:f0f0e7de07529aac4907a619c53dc6884ccb01cadd2666174216cd1a3f94f426",
+                                    "solicitor": "0xD999bAaE98AC5246568FD726be8832c49626867D",
+                                    "reason": "asdasd",
+                                    "request": 3,
+                                    "status": "Pending",
+                                },
+                            },
+                            {
+                                "cursor": 2,
+                                "kind": "responded",
+                                "consent": 3,
+                                "created_at": 1758291600,
+                                "data": {
+                                    "status": "Resolved",
+                                    "permitted": 2,
+                                    "response_reason": "Only trusted",
+                                },
+                            },
+                        ],
+                    }
+                },
+            ),
+            "400": openapi.Response(
+                description="Bad Request",
+                examples={
+                    "application/json": {"after": ["A valid integer is required."]}
+                },
+            ),
+        },
+        tags=["Consent Petition"],
+    )
+    @action(detail=False, methods=["get"])
+    def changes(self, request, *args, **kwargs):
+        params = {}
+        for name, default in (("after", 0), ("limit", config.CONSENT_FEED_PAGE_SIZE)):
+            try:
+                params[name] = int(request.query_params.get(name, default))
+            except ValueError:
+                raise ValidationError({name: ["A valid integer is required."]})
+        limit = min(max(params["limit"], 1), config.CONSENT_FEED_PAGE_SIZE)
+
+        # Range scan on the primary key, one more row tells if there are more
+        events = list(
+            ConsentEvent.objects.filter(pk__gt=params["after"]).order_by("pk")[
+                : limit + 1
+            ]
+        )
+        has_more = len(events) > limit
+        events = events[:limit]
+
+        return Response(
+            {
+                "cursor": events[-1].pk if events else params["after"],
+                "has_more": has_more,
+                "events": ConsentEventSerializer(events, many=True).data,
+            }
+        )
+
+    @swagger_auto_schema(
+        method="get",
+        operation_summary="Export the Consent Petitions",
+        operation_description="Streams every Consent Petition matching the list filters as NDJSON or CSV. Rows are streamed as they are read, so the export has no size limit.",
+        manual_parameters=[
+            openapi.Parameter(
+                "output",
+                openapi.IN_QUERY,
+                description="Output format",
+                type=openapi.TYPE_STRING,
+                enum=[*EXPORT_FORMATS],
+                default="ndjson",
+            ),
+            *ConsentFilterSet.openapi_parameters(),
+        ],
+        responses={
+            "200": openapi.Response(
+                description="Streamed consents, one per line",
+                examples={
+                    "application/x-ndjson": {
+                        "id": 1,
+                        "created_at": "2025-09-19T08:38:50.000000+00:00",
+                        "dataset": "did:op:75afadb65591ca977344fa598c2b42c0ca5c7e8620b7c8bf47533e8f222d7997",
+                        "dataset_owner": "0xDf7a37EA1f42588Ea219Ec19328757F67BaBCeCD",
+                        "algorithm": "did:op:b533c6703cd099cfc228e1f6587c4049bc1f445b2bd0da24f5321a13fd9f1c8a",
+                        "algorithm_owner": "0xD999bAaE98AC5246568FD726be8832c49626867D",
+                        "chain_id": 32457,
+                        "solicitor": "0xD999bAaE98AC5246568FD726be8832c49626867D",
+                        "reason": "nkjhk",
+                        "request": 2,
+                        "status": "Denied",
+                        "permitted": 0,
+                        "response_reason": "asdsad",
+                        "responded_at": "2025-09-19T13:36:20.000000+00:00",
+                    }
+                },
+            ),
+            "400": openapi.Response(
+                description="Bad Request",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={"detail": openapi.Schema(type=openapi.TYPE_STRING)},
+                ),
+                examples={
+                    "application/json": {
+                        "detail": "Invalid output xml, expected any of: ndjson, csv",
+                    }
+                },
+            ),
+        },
+        tags=["Consent Petition"],
+    )
+    @action(detail=False, methods=["get"])
+    def export(self, request, *args, **kwargs):
+        params = request.query_params.copy()
+        output = params.pop("output", ["ndjson"])[-1]
+
+        if output not in EXPORT_FORMATS:
+            raise ValidationError(
+                {
+                    "detail": f"Invalid output {output}, expected any of: {', '.join(EXPORT_FORMATS)}"
+                }
+            )
+        encode, content_type = EXPORT_FORMATS[output]
+
+        queryset = ConsentFilterSet(params).filter(Consent.objects.all())
+        rows = export_rows(queryset, chunk_size=config.EXPORT_CHUNK_SIZE)
+
+        filename = f"consents-{timezone.now():%Y%m%d%H%M%S}.{output}"
+        return StreamingHttpResponse(
+            encode(rows),
+            content_type=content_type,
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
+
 
 class ConsentResponseViewset(
     CreateModelMixin,
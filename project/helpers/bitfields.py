@@ -1,5 +1,8 @@
 import json
 
+from bitfield import BitField
+from django.db.models import Lookup
+
 
 def get_mask(value: int | str | dict, base_class) -> int:
     if isinstance(value, dict):
@@ -24,3 +27,21 @@ def get_mask(value: int | str | dict, base_class) -> int:
             value = res
 
     return value
+
+
+@BitField.register_lookup
+class HasBits(Lookup):
+    """Rows with every bit of an integer mask set, as ``field & mask = mask``.
+
+    Unlike the exact lookup of django-bitfield it takes a plain int, so it
+    fits query parameters and partial index conditions alike. PostgreSQL
+    only uses a partial index when the query repeats its condition, so test
+    one flag per lookup to match the per-flag indexes.
+    """
+
+    lookup_name = "hasbits"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"({lhs} & {rhs}) = {rhs}", (*lhs_params, *rhs_params, *rhs_params)
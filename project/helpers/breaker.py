@@ -0,0 +1,71 @@
+import threading
+import time
+
+from helpers.metrics import metrics
+
+
+class CircuitBreaker:
+    """Stops calling a failing dependency for a while.
+
+    The circuit opens after `failure_threshold` consecutive failures. While
+    open, calls are rejected for `reset_timeout` seconds. Then a single
+    probe is let through (half-open). The circuit closes again if the probe
+    succeeds and reopens if it fails.
+    """
+
+    CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+    _levels = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        metrics.set("circuit_breaker_state", 0, name=name)
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds until the circuit lets a probe through."""
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """Whether a call may be attempted now. Callers that get True must
+        report its outcome with `success` or `failure`."""
+        with self._lock:
+            if self.state == self.OPEN and self.retry_after == 0:
+                self._transition(self.HALF_OPEN)
+
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+
+        metrics.inc("circuit_breaker_rejected_total", name=self.name)
+        return False
+
+    def success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            if self.state != self.CLOSED:
+                self._transition(self.CLOSED)
+
+    def failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self.failures >= self.failure_threshold
+            ):
+                self.opened_at = time.monotonic()
+                self._transition(self.OPEN)
+
+    def _transition(self, state: str) -> None:
+        self.state = state
+        metrics.set("circuit_breaker_state", self._levels[state], name=self.name)
+        metrics.inc("circuit_breaker_transitions_total", name=self.name, to=state)
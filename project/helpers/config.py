@@ -11,6 +11,44 @@ class Config(BaseSettings):
 
     DATABASE_URI: str = "postgresql://postgres:example@db:5432/consents"
     AQUARIUS_URL: str = "https://aquarius.pontus-x.eu"  # Default to public Aquarius
+    AQUARIUS_CONNECT_TIMEOUT: float = 3.05  # Seconds
+    AQUARIUS_READ_TIMEOUT: float = 10.0  # Seconds
+    AQUARIUS_RETRIES: int = 2  # Retries of failed connections and 502-504s
+    AQUARIUS_BACKOFF: float = 0.3  # Retry backoff factor, in seconds
+    AQUARIUS_POOL_SIZE: int = 10  # Keep-alive connections per host
+    AQUARIUS_CACHE_SIZE: int = 1024  # DDO summaries kept in memory, 0 disables it
+    AQUARIUS_CACHE_TTL: float = 300.0  # Seconds
+    AQUARIUS_CACHE_NEGATIVE_TTL: float = 0.0  # Seconds to remember 404s, 0 disables it
+    AQUARIUS_CACHE_STALE_TTL: float = 3600.0  # Seconds expired DDOs are served while Aquarius is down
+    AQUARIUS_CACHE_BACKEND: str | None = None  # Django cache alias shared by workers
+    AQUARIUS_BREAKER_FAILURES: int = 5  # Consecutive failures that open the circuit
+    AQUARIUS_BREAKER_RESET: float = 30.0  # Seconds before an open circuit is probed
+    AQUARIUS_SYNC_BATCH_SIZE: int = 500  # DDOs per page when mirroring Aquarius
+    AQUARIUS_SYNC_MAX_PAGES: int = 20  # Pages mirrored per run of the recurring task
+    AQUARIUS_ADVISORY_LOCK: bool = False  # Coalesce lookups across workers (PostgreSQL)
+    ASSET_OWNER_CHECK_RATE: float = 2.0  # Aquarius requests per second when reconciling
+    ASSET_OWNER_CHECK_INTERVAL: int = 86400  # Seconds before an owner is checked again
+    ASSET_OWNER_CHECK_BATCH_SIZE: int = 50  # Assets reconciled per transaction
+    ASSET_OWNER_CHECK_LIMIT: int = 500  # Assets checked per run of the recurring task
+
+    EXPORT_CHUNK_SIZE: int = 2000  # Rows fetched per round-trip when exporting
+    CONSENT_BATCH_LIMIT: int = 100  # Max items of a batch consent creation
+    CONSENT_DECISION_BATCH_LIMIT: int = 500  # Max pairs of a batch decision
+    CONSENT_TOKEN_ALGORITHM: str = "HS256"  # ES256 or RS256 need cryptography installed
+    CONSENT_TOKEN_SIGNING_KEY: str | None = None  # Required to issue decision tokens
+    CONSENT_TOKEN_VERIFYING_KEY: str = ""  # Public key (PEM) of asymmetric algorithms
+    CONSENT_TOKEN_LIFETIME: int = 900  # Seconds a decision token is valid
+    CONSENT_FEED_PAGE_SIZE: int = 500  # Max events per page of the change feed
+    CONSENT_CALLBACK_HOSTS: list[str] = []  # Hosts callbacks may target, any public one if empty
+    CONSENT_SUBMISSION_MAX_ATTEMPTS: int = 6  # Resolutions tried before failing
+    CONSENT_SUBMISSION_BACKOFF: float = 10.0  # Seconds before the first retry, doubled after
+    CONSENT_SUBMISSION_MAX_BACKOFF: float = 600.0  # Seconds
+
+    JOBS_BACKOFF: float = 5.0  # Seconds before a failed job is retried, doubled after
+    JOBS_MAX_BACKOFF: float = 3600.0  # Seconds
+    JOBS_LEASE: float = 600.0  # Seconds a running job may take before it is requeued
+    JOBS_RETENTION_DAYS: int = 7  # Days finished jobs are kept
+    JOBS_METRICS_PORT: int | None = None  # Port workers serve /metrics on, off if unset
 
     TEST_PRIVATE_KEY: str | None = Field(default=None)
     TEST_DATASET_DID: str | None = Field(default=None)
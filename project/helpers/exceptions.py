@@ -0,0 +1,35 @@
+import math
+
+from helpers.services.aquarius import AquariusError, AquariusUnavailable
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.views import exception_handler as drf_exception_handler
+
+
+class ServiceUnavailable(APIException):
+    status_code = 503
+    default_detail = "Service temporarily unavailable, try again later."
+    default_code = "service_unavailable"
+
+    def __init__(self, detail=None, code=None, wait: float | None = None):
+        super().__init__(detail, code)
+        self.wait = math.ceil(wait) if wait is not None else None
+
+
+class BadGateway(APIException):
+    status_code = 502
+    default_detail = "Invalid response from an upstream service."
+    default_code = "bad_gateway"
+
+
+def exception_handler(exc, context):
+    """Translates the Aquarius errors into API errors before handing them to
+    the default DRF handler, which adds the Retry-After header of 503s."""
+
+    if isinstance(exc, AquariusUnavailable):
+        exc = ServiceUnavailable(str(exc), wait=exc.retry_after)
+    elif isinstance(exc, AquariusError):
+        if exc.status_code == 404:
+            exc = ValidationError({"detail": str(exc)})
+        else:
+            exc = BadGateway(str(exc))
+    return drf_exception_handler(exc, context)
@@ -0,0 +1,110 @@
+import operator
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from django.db.models import Q, QuerySet
+from django.utils.dateparse import parse_datetime
+from drf_yasg import openapi
+from rest_framework.exceptions import ValidationError
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Accepts either a UNIX timestamp (as returned by the API) or an ISO-8601
+    datetime."""
+
+    if value.isdigit():
+        return datetime.fromtimestamp(int(value), tz=UTC)
+
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(f"{value} is not a timestamp nor an ISO-8601 datetime")
+    return parsed
+
+
+@dataclass(frozen=True)
+class Filter:
+    """Maps a query parameter to a single ORM lookup."""
+
+    lookup: str
+    parse: Callable[[str], Any] = str
+    description: str = ""
+
+    def to_q(self, value: str) -> Q:
+        return Q(**{self.lookup: self.parse(value)})
+
+
+class FilterSet:
+    """Whitelisted query parameter filters.
+
+    Only the declared ``filters`` are turned into lookups, any other parameter
+    that is not in ``ignored`` is rejected. Filters are AND-ed together unless
+    the ``combine=or`` parameter is given.
+    """
+
+    filters: Mapping[str, Filter] = {}
+    ignored: tuple[str, ...] = ("format", "cursor", "page_size")
+    combine_param = "combine"
+
+    def __init__(self, params: Mapping[str, str]) -> None:
+        self.params = params
+
+    def get_query(self) -> Q:
+        params = {
+            param: value
+            for param, value in self.params.items()
+            if param not in self.ignored and param != self.combine_param
+        }
+
+        unknown = sorted(set(params) - set(self.filters))
+        if unknown:
+            raise ValidationError(
+                {
+                    "detail": f"Unknown filters: {', '.join(unknown)}, "
+                    f"expected any of: {', '.join(self.filters)}"
+                }
+            )
+
+        match self.params.get(self.combine_param, "and").lower():
+            case "and":
+                combine = operator.and_
+            case "or":
+                combine = operator.or_
+            case other:
+                raise ValidationError(
+                    {"detail": f"Invalid {self.combine_param} {other}, expected and/or"}
+                )
+
+        query = Q()
+        for param, value in params.items():
+            try:
+                query = combine(query, self.filters[param].to_q(value))
+            except (TypeError, ValueError) as e:
+                raise ValidationError({"detail": f"Invalid {param}: {e}"})
+
+        return query
+
+    def filter(self, queryset: QuerySet) -> QuerySet:
+        return queryset.filter(self.get_query())
+
+    @classmethod
+    def openapi_parameters(cls) -> list[openapi.Parameter]:
+        return [
+            openapi.Parameter(
+                param,
+                openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description=f.description,
+            )
+            for param, f in cls.filters.items()
+        ] + [
+            openapi.Parameter(
+                cls.combine_param,
+                openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                enum=["and", "or"],
+                default="and",
+                description="How the given filters are combined",
+            )
+        ]
@@ -0,0 +1,84 @@
+import threading
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class Metrics:
+    """Process-local registry of counters and gauges, rendered in the
+    Prometheus text exposition format by `middleware.metrics`, or by `serve`
+    in the processes with no web server."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[Labels, float]] = defaultdict(dict)
+        self._gauges: dict[str, dict[Labels, float]] = defaultdict(dict)
+
+    @staticmethod
+    def _labels(labels: dict) -> Labels:
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def inc(self, name: str, value: float = 1, /, **labels) -> None:
+        key = self._labels(labels)
+        with self._lock:
+            series = self._counters[name]
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, /, **labels) -> None:
+        with self._lock:
+            self._gauges[name][self._labels(labels)] = value
+
+    def get(self, name: str, /, **labels) -> float:
+        key = self._labels(labels)
+        with self._lock:
+            series = self._counters.get(name) or self._gauges.get(name) or {}
+            return series.get(key, 0)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for kind, metrics in (
+                ("counter", self._counters),
+                ("gauge", self._gauges),
+            ):
+                for name, series in sorted(metrics.items()):
+                    lines.append(f"# TYPE {name} {kind}")
+                    for labels, value in sorted(series.items()):
+                        tags = ",".join(f'{key}="{val}"' for key, val in labels)
+                        # Every digit, rate() needs to see large counters move
+                        value = str(value) if isinstance(value, int) else repr(value)
+                        lines.append(
+                            f"{name}{{{tags}}} {value}" if tags else f"{name} {value}"
+                        )
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int, host: str = "") -> ThreadingHTTPServer:
+        """Serves the registry at /metrics from a background thread. Returns
+        the server, to shut it down."""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+
+                payload = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+metrics = Metrics()
+
+__all__ = ["metrics"]
@@ -0,0 +1,15 @@
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """Opaque cursor pagination. Every page is a range scan on the ordering
+    index, so page N costs the same as the first one."""
+
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    ordering = ("id",)
+
+
+class ConsentPagination(KeysetPagination):
+    # Backed by the consent_created_at_id index
+    ordering = ("-created_at", "-id")
@@ -4,7 +4,13 @@ from rest_framework import permissions
 class ConsentPermissions(permissions.BasePermission):
 
     def has_permission(self, request, view):
-        if view.action in ["create", "delete_response"]:
+        if view.action in [
+            "create",
+            "batch_create",
+            "bulk_respond",
+            "delete_response",
+            "submission",
+        ]:
             return request.user.is_authenticated
 
         return True
@@ -14,6 +20,6 @@ class ConsentPermissions(permissions.BasePermission):
             return obj.solicitor == request.user
 
         if view.action == "destroy_response":
-            return obj.dataset.owner == request.user
+            return obj.dataset_owner_id == request.user.pk
 
         return True
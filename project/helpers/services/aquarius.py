@@ -1,8 +1,221 @@
 import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
 from dataclasses import dataclass, field
 
 import requests
+from django.core.cache import caches
+from helpers.breaker import CircuitBreaker
+from helpers.concurrency import SingleFlight, advisory_lock
 from helpers.config import config
+from helpers.metrics import metrics
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class AquariusError(AssertionError):
+    """Aquarius could not be reached or answered with an error.
+
+    Subclasses AssertionError, which is what the service used to raise.
+    """
+
+    def __init__(self, message: str, status_code: int | None = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class AquariusUnavailable(AquariusError):
+    """Aquarius is not being called because its circuit breaker is open."""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__("Aquarius is unavailable, retry later")
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class DdoSummary:
+    """The fields of an asset DDO that the API relies on."""
+
+    did: str
+    owner: str
+    chain_id: int
+    type: str | None = None
+    nft_address: str | None = None
+    updated: str | None = None
+
+    @classmethod
+    def from_ddo(cls, did: str, ddo: dict) -> "DdoSummary":
+        try:
+            owner = ddo["nft"]["owner"]
+        except (KeyError, TypeError):
+            raise AquariusError(f"Asset {did} DDO has no NFT owner")
+
+        metadata = ddo.get("metadata") or {}
+        return cls(
+            did=did,
+            owner=owner,
+            chain_id=ddo.get("chainId") or 0,
+            type=metadata.get("type"),
+            nft_address=ddo.get("nftAddress"),
+            updated=metadata.get("updated"),
+        )
+
+
+class DdoCache:
+    """Bounded LRU of DDO summaries whose entries expire after a TTL.
+
+    Expired summaries are kept for another `stale_ttl` seconds, to be served
+    when Aquarius is unavailable. Assets Aquarius does not know of can be
+    remembered too, for `negative_ttl` seconds. When a Django cache alias is
+    given as `backend`, entries are kept there instead so that every worker
+    shares them.
+    """
+
+    key_prefix = "aquarius:ddo:"
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        negative_ttl: float = 0.0,
+        stale_ttl: float = 0.0,
+        backend: str | None = None,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stale_ttl = stale_ttl
+        self.backend = backend
+        self._entries: OrderedDict[str, tuple[float, float, DdoSummary | str]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls) -> "DdoCache | None":
+        if not (config.AQUARIUS_CACHE_SIZE or config.AQUARIUS_CACHE_BACKEND):
+            return None
+        return cls(
+            maxsize=config.AQUARIUS_CACHE_SIZE,
+            ttl=config.AQUARIUS_CACHE_TTL,
+            negative_ttl=config.AQUARIUS_CACHE_NEGATIVE_TTL,
+            stale_ttl=config.AQUARIUS_CACHE_STALE_TTL,
+            backend=config.AQUARIUS_CACHE_BACKEND,
+        )
+
+    def get(self, did: str) -> DdoSummary | None:
+        """Returns the cached summary of a DID, or None on a miss.
+
+        Raises:
+            AquariusError: If the DID is cached as not found in Aquarius.
+        """
+
+        value = self._load(did, stale=False)
+        if value is None:
+            metrics.inc("aquarius_cache_misses_total")
+            return None
+
+        metrics.inc("aquarius_cache_hits_total")
+        if isinstance(value, str):
+            raise AquariusError(value, status_code=404)
+        return value
+
+    def get_stale(self, did: str) -> DdoSummary | None:
+        """Returns the cached summary of a DID even if it expired, as long as
+        it is within the stale window."""
+
+        value = self._load(did, stale=True)
+        if isinstance(value, DdoSummary):
+            metrics.inc("aquarius_cache_stale_total")
+            return value
+        return None
+
+    def set(self, did: str, summary: DdoSummary) -> None:
+        self._store(did, summary, self.ttl, self.stale_ttl)
+
+    def set_missing(self, did: str, message: str) -> None:
+        if self.negative_ttl > 0:
+            self._store(did, message, self.negative_ttl, 0.0)
+
+    def invalidate(self, did: str) -> None:
+        if self.backend:
+            caches[self.backend].delete(self.key_prefix + did)
+            return
+
+        with self._lock:
+            self._entries.pop(did, None)
+            metrics.set("aquarius_cache_size", len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            metrics.set("aquarius_cache_size", 0)
+
+    def _load(self, did: str, stale: bool) -> DdoSummary | str | None:
+        if self.backend:
+            entry = caches[self.backend].get(self.key_prefix + did)
+        else:
+            with self._lock:
+                entry = self._entries.get(did)
+                if entry is not None:
+                    self._entries.move_to_end(did)
+        if entry is None:
+            return None
+
+        expires_at, stale_until, value = entry
+        now = time.time()
+        if now < expires_at or (stale and now < stale_until):
+            return value
+
+        if now >= stale_until and not self.backend:
+            with self._lock:
+                self._entries.pop(did, None)
+        return None
+
+    def _store(
+        self, did: str, value: DdoSummary | str, ttl: float, stale_ttl: float
+    ) -> None:
+        expires_at = time.time() + ttl
+        entry = (expires_at, expires_at + stale_ttl, value)
+        if self.backend:
+            caches[self.backend].set(
+                self.key_prefix + did, entry, timeout=ttl + stale_ttl
+            )
+            return
+
+        with self._lock:
+            self._entries[did] = entry
+            self._entries.move_to_end(did)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                metrics.inc("aquarius_cache_evictions_total")
+            metrics.set("aquarius_cache_size", len(self._entries))
+
+
+def build_session() -> requests.Session:
+    """Keep-alive session retrying connection errors and gateway failures
+    with exponential backoff."""
+
+    retry = Retry(
+        total=config.AQUARIUS_RETRIES,
+        backoff_factor=config.AQUARIUS_BACKOFF,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=("GET", "POST"),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_maxsize=config.AQUARIUS_POOL_SIZE,
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
 
 
 @dataclass(frozen=True)
@@ -10,27 +223,262 @@ class AquariusService:
 
     url: str = field(default_factory=lambda: config.AQUARIUS_URL)
     logger: logging.Logger = field(default_factory=lambda: logging.getLogger(__name__))
+    session: requests.Session = field(default_factory=build_session)
+    timeout: tuple[float, float] = field(
+        default_factory=lambda: (
+            config.AQUARIUS_CONNECT_TIMEOUT,
+            config.AQUARIUS_READ_TIMEOUT,
+        )
+    )
+    cache: DdoCache | None = field(default_factory=DdoCache.from_config)
+    advisory_lock: bool = field(default_factory=lambda: config.AQUARIUS_ADVISORY_LOCK)
+    flights: SingleFlight = field(default_factory=SingleFlight)
+    breaker: CircuitBreaker = field(
+        default_factory=lambda: CircuitBreaker(
+            "aquarius",
+            failure_threshold=config.AQUARIUS_BREAKER_FAILURES,
+            reset_timeout=config.AQUARIUS_BREAKER_RESET,
+        )
+    )
 
-    def get_asset_owner(self, asset_did: str) -> str:
-        """Queries the Aquarius cache API for the owner of an asset.
+    def get_ddo_summary(self, asset_did: str) -> DdoSummary:
+        """Returns the DDO summary of an asset, from the cache when possible.
 
         Args:
             asset_did (str): The DID of the asset.
 
         Returns:
-            str: The address of the asset owner.
+            DdoSummary: The owner, chainId and metadata of the asset.
 
         Raises:
-            AssertionError: If the request to Aquarius fails or returns an error.
+            AquariusError: If the request to Aquarius fails or returns an error.
+        """
+
+        if self.cache is not None:
+            summary = self.cache.get(asset_did)
+            if summary is not None:
+                return summary
+
+        # Concurrent lookups of the same DID share a single upstream request
+        summary, shared = self.flights.do(asset_did, lambda: self._resolve(asset_did))
+        if shared:
+            metrics.inc("aquarius_coalesced_total")
+        return summary
+
+    def get_ddo_summaries(
+        self, asset_dids: Iterable[str]
+    ) -> dict[str, DdoSummary | AquariusError]:
+        """Resolves many DIDs at once, requesting the uncached ones from
+        Aquarius concurrently. The cache and the advisory locks are only used
+        from the calling thread, the pool threads never touch the database.
+
+        Returns:
+            dict: The DDO summary, or the AquariusError raised, of each DID.
+        """
+
+        results: dict[str, DdoSummary | AquariusError] = {}
+        missing = []
+        for did in dict.fromkeys(asset_dids):
+            try:
+                results[did] = self.cache.get(did) if self.cache is not None else None
+            except AquariusError as e:
+                results[did] = e
+            if results[did] is None:
+                missing.append(did)
+        if not missing:
+            return results
+
+        with self._locked(missing):
+            # Other workers may have resolved some while we waited for the locks
+            if self.advisory_lock and self.cache is not None:
+                for did in missing:
+                    try:
+                        results[did] = self.cache.get(did)
+                    except AquariusError as e:
+                        results[did] = e
+                missing = [did for did in missing if results[did] is None]
+
+            with ThreadPoolExecutor(
+                max_workers=min(len(missing), config.AQUARIUS_POOL_SIZE) or 1
+            ) as pool:
+                fetched = list(pool.map(self._fetch_shared, missing))
+
+            for did, result in zip(missing, fetched):
+                try:
+                    results[did] = self._settle(did, result)
+                except AquariusError as e:
+                    results[did] = e
+        return results
+
+    def _fetch_shared(self, asset_did: str) -> DdoSummary | AquariusError:
+        # Concurrent lookups of the same DID share a single upstream request
+        try:
+            summary, shared = self.flights.do(
+                asset_did, lambda: self.fetch_ddo_summary(asset_did)
+            )
+        except AquariusError as e:
+            return e
+        if shared:
+            metrics.inc("aquarius_coalesced_total")
+        return summary
+
+    @contextmanager
+    def _locked(self, asset_dids: list[str]) -> Iterator[None]:
+        """Holds the advisory lock of every given DID, if enabled. Taken in
+        order, so that concurrent lookups of overlapping DIDs never deadlock."""
+
+        with ExitStack() as stack:
+            if self.advisory_lock:
+                for did in sorted(asset_dids):
+                    stack.enter_context(advisory_lock(f"aquarius:{did}"))
+            yield
+
+    def _resolve(self, asset_did: str) -> DdoSummary:
+        with self._locked([asset_did]):
+            # Another worker may have resolved it while we waited for the lock
+            if self.advisory_lock and self.cache is not None:
+                summary = self.cache.get(asset_did)
+                if summary is not None:
+                    return summary
+
+            try:
+                summary = self.fetch_ddo_summary(asset_did)
+            except AquariusError as e:
+                return self._settle(asset_did, e)
+            return self._settle(asset_did, summary)
+
+    def _settle(self, asset_did: str, result: DdoSummary | AquariusError) -> DdoSummary:
+        """Caches the outcome of a request to Aquarius. Failed requests fall
+        back to an expired summary, if one is still at hand.
+
+        Raises:
+            AquariusError: The error of the request, if there is no fallback.
+        """
+
+        if isinstance(result, DdoSummary):
+            if self.cache is not None:
+                self.cache.set(asset_did, result)
+            return result
+
+        if self.cache is None:
+            raise result
+        if result.status_code == 404:
+            self.cache.set_missing(asset_did, str(result))
+            raise result
+
+        # Better an expired summary than no summary at all
+        stale = self.cache.get_stale(asset_did)
+        if stale is None:
+            raise result
+        self.logger.warning("Serving stale DDO of %s: %s", asset_did, result)
+        return stale
+
+    def invalidate(self, asset_did: str) -> None:
+        """Drops the cached DDO summary of an asset, e.g. when its owner changed."""
+
+        if self.cache is not None:
+            self.cache.invalidate(asset_did)
+
+    def fetch_ddo_summary(self, asset_did: str) -> DdoSummary:
+        """Fetches the DDO of an asset from the Aquarius cache API.
+
+        Args:
+            asset_did (str): The DID of the asset.
+
+        Returns:
+            DdoSummary: The owner, chainId and metadata of the asset.
+
+        Raises:
+            AquariusError: If the request to Aquarius fails or returns an error.
         """
 
         url = f"{self.url}/api/aquarius/assets/ddo/{asset_did}"
-        self.logger.debug("Querying Aquarius at %s for asset owner.", url)
+        self.logger.debug("Querying Aquarius at %s for asset DDO.", url)
+
+        res = self._request("GET", url)
+        return DdoSummary.from_ddo(asset_did, res.json())
+
+    def query_ddos(
+        self,
+        updated_since: str | None = None,
+        after: tuple[str, str] | None = None,
+        size: int = 100,
+    ) -> list[dict]:
+        """Pages the Aquarius query API for the DDOs updated since a given
+        `metadata.updated` timestamp, oldest first and by id among those
+        sharing a timestamp.
+
+        Args:
+            updated_since (str): Inclusive lower bound, None for every DDO.
+            after (tuple): The `metadata.updated` and id of the last DDO of
+                the previous page, the page starts right after it.
+            size (int): The page size.
+
+        Raises:
+            AquariusError: If the request to Aquarius fails or returns an error.
+        """
+
+        query = {"match_all": {}}
+        if updated_since is not None:
+            query = {"range": {"metadata.updated": {"gte": updated_since}}}
+
+        url = f"{self.url}/api/aquarius/assets/query"
+        body = {
+            "query": query,
+            "sort": [{"metadata.updated": "asc"}, {"id": "asc"}],
+            "size": size,
+        }
+        if after is not None:
+            body["search_after"] = list(after)
+        self.logger.debug("Querying Aquarius at %s with %s.", url, body)
+
+        res = self._request("POST", url, json=body)
+        return [hit["_source"] for hit in res.json().get("hits", {}).get("hits", [])]
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Sends a request through the circuit breaker. Connection errors,
+        timeouts and 5xx responses count as failures.
+
+        Raises:
+            AquariusUnavailable: If the circuit is open.
+            AquariusError: If the request fails or does not return a 200.
+        """
+
+        if not self.breaker.allow():
+            raise AquariusUnavailable(self.breaker.retry_after)
+
+        try:
+            res = self.session.request(method, url, timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:
+            self.breaker.failure()
+            raise AquariusError(f"Error querying Aquarius: {e}") from e
 
-        res = requests.get(url)
+        if res.status_code >= 500:
+            self.breaker.failure()
+        else:
+            self.breaker.success()
 
-        assert res.status_code == 200, f"Error querying Aquarius: {res.text}"
-        return res.json().get("nft").get("owner")
+        if res.status_code != 200:
+            raise AquariusError(
+                f"Error querying Aquarius: {res.text}",
+                status_code=res.status_code,
+            )
+        return res
+
+    def get_asset_owner(self, asset_did: str) -> str:
+        """Queries the Aquarius cache API for the owner of an asset.
+
+        Args:
+            asset_did (str): The DID of the asset.
+
+        Returns:
+            str: The address of the asset owner.
+
+        Raises:
+            AquariusError: If the request to Aquarius fails or returns an error.
+        """
+
+        return self.get_ddo_summary(asset_did).owner
 
     def get_asset_chain_id(self, asset_did: str) -> int:
         """Queries the Aquarius cache API for the chainId of an asset.
@@ -42,15 +490,15 @@ class AquariusService:
             int: The asset's chainId
         """
 
-        url = f"{self.url}/api/aquarius/assets/ddo/{asset_did}"
-        self.logger.debug("Querying Aquarius at %s for asset chainId.", url)
-
-        res = requests.get(url)
-
-        assert res.status_code == 200, f"Error querying Aquarius: {res.text}"
-        return res.json().get("chainId")
+        return self.get_ddo_summary(asset_did).chain_id
 
 
 aquarius = AquariusService()
 
-__all__ = ["aquarius"]
+__all__ = [
+    "aquarius",
+    "AquariusError",
+    "AquariusUnavailable",
+    "DdoCache",
+    "DdoSummary",
+]
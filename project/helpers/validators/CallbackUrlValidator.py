@@ -0,0 +1,57 @@
+import ipaddress
+import socket
+from urllib.parse import urlsplit
+
+from helpers.config import config
+from rest_framework.validators import ValidationError
+
+
+class CallbackUrlValidator:
+    """Only lets through https URLs of the allowed hosts or, if none are
+    configured, of hosts that resolve to public addresses only, so callbacks
+    cannot be pointed at the internal network."""
+
+    def __init__(self, allowed_hosts: list[str] | None = None) -> None:
+        self.allowed_hosts = allowed_hosts
+
+    def __call__(self, value: str) -> None:
+        url = urlsplit(value)
+        if url.scheme != "https" or not url.hostname:
+            raise ValidationError("Callback URL must be an https URL")
+
+        allowed_hosts = (
+            config.CONSENT_CALLBACK_HOSTS
+            if self.allowed_hosts is None
+            else self.allowed_hosts
+        )
+        if allowed_hosts:
+            if url.hostname not in allowed_hosts:
+                raise ValidationError(f"Callback host {url.hostname} is not allowed")
+            return
+
+        try:
+            infos = socket.getaddrinfo(
+                url.hostname, url.port or 443, proto=socket.IPPROTO_TCP
+            )
+        except (socket.gaierror, UnicodeError, ValueError):
+            raise ValidationError(f"Callback host {url.hostname} could not be resolved")
+
+        for *_, sockaddr in infos:
+            address = ipaddress.ip_address(sockaddr[0].split("%")[0])
+            if address.version == 6 and address.ipv4_mapped is not None:
+                address = address.ipv4_mapped
+            if not address.is_global or address.is_multicast:
+                raise ValidationError(
+                    f"Callback host {url.hostname} resolves to a non-public address"
+                )
+
+    def __repr__(self) -> str:
+        return "%s(allowed_hosts=%r)" % (self.__class__.__name__, self.allowed_hosts)
+
+    def deconstruct(self) -> tuple:
+        # Required to make this serializable in Django migrations
+        return (
+            self.__class__.__module__ + "." + self.__class__.__name__,
+            [],
+            {"allowed_hosts": self.allowed_hosts},
+        )
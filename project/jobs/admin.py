@@ -0,0 +1,9 @@
+from django.contrib import admin
+
+from jobs import models
+
+
+@admin.register(models.Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "task", "state", "run_at", "attempts", "locked_by")
+    list_filter = ("state", "task")
@@ -0,0 +1,68 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import F
+
+from jobs.models import Job
+from jobs.worker import Worker
+
+
+class Command(BaseCommand):
+    help = """
+    Benchmarks the job queue: enqueues no-op jobs, drains them with
+    concurrent workers and reports the throughput and the claim latency
+    (from due to claimed). Deletes its jobs afterwards, run it against
+    PostgreSQL for SKIP LOCKED to be exercised.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--jobs", type=int, default=2000)
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument("--batch-size", type=int, default=10)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        jobs = Job.objects.bulk_create(
+            Job(task="jobs.noop", payload={"bench": True})
+            for _ in range(options["jobs"])
+        )
+        self.stdout.write(
+            f"Enqueued {len(jobs)} jobs in {time.perf_counter() - started:.2f} s"
+        )
+
+        def drain(n: int):
+            worker = Worker(name=f"bench-{n}", batch_size=options["batch_size"])
+            try:
+                while worker.run_once():
+                    pass
+            finally:
+                connection.close()
+
+        started = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=options["workers"]) as pool:
+                list(pool.map(drain, range(options["workers"])))
+            elapsed = time.perf_counter() - started
+
+            bench = Job.objects.filter(task="jobs.noop", payload__bench=True)
+            lags = [
+                lag.total_seconds()
+                for lag in bench.annotate(lag=F("locked_at") - F("run_at"))
+                .values_list("lag", flat=True)
+                .iterator()
+            ]
+        finally:
+            Job.objects.filter(task="jobs.noop", payload__bench=True).delete()
+
+        self.stdout.write(
+            f"Ran {len(lags)} jobs in {elapsed:.2f} s "
+            f"({len(lags) / elapsed:.0f} jobs/s) with {options['workers']} workers"
+        )
+        self.stdout.write(
+            f"Claim latency: p50 {statistics.median(lags) * 1000:.1f} ms, "
+            f"p95 {sorted(lags)[int(len(lags) * 0.95) - 1] * 1000:.1f} ms, "
+            f"max {max(lags) * 1000:.1f} ms"
+        )
@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+from helpers.config import config
+from helpers.metrics import metrics
+
+from jobs.worker import Worker
+
+
+class Command(BaseCommand):
+    help = """
+    Runs the background jobs stored in the database until interrupted. Start
+    as many as needed, they never claim the same job.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--name", help="Defaults to host:pid")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10,
+            help="Jobs claimed at once",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to sleep when there is nothing to do",
+        )
+        parser.add_argument(
+            "--metrics-port",
+            type=int,
+            default=config.JOBS_METRICS_PORT,
+            help="Serve the metrics of the worker at /metrics on this port",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run the due jobs and exit",
+        )
+
+    def handle(self, *args, **options):
+        worker = Worker(
+            name=options["name"],
+            batch_size=options["batch_size"],
+            poll_interval=options["interval"],
+        )
+        if not options["once"]:
+            if options["metrics_port"] is not None:
+                metrics.serve(options["metrics_port"])
+            worker.run()
+            return
+
+        worker.schedule_recurring()
+        ran = 0
+        while processed := worker.run_once():
+            ran += processed
+        self.stdout.write(f"Ran jobs... {ran}")
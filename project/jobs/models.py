@@ -0,0 +1,160 @@
+from datetime import datetime, timedelta
+
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from jobs.registry import registry
+
+
+class JobManager(models.Manager):
+    def enqueue(
+        self,
+        task: str,
+        payload: dict | None = None,
+        run_at: datetime | None = None,
+        key: str | None = None,
+        priority: int = 0,
+        max_attempts: int | None = None,
+    ) -> "Job | None":
+        """Queues a run of a registered task.
+
+        Args:
+            task (str): The registered name of the task.
+            payload (dict): The keyword arguments of the task, JSON encodable.
+            run_at (datetime): Not before this time, defaults to now.
+            key (str): Deduplication key, no job is queued while another
+                unfinished job holds the same key.
+            priority (int): Lower runs first.
+            max_attempts (int): Defaults to the attempts of the task.
+
+        Returns:
+            Job: The queued job, or None when deduplicated.
+        """
+        registered = registry.get(task)
+        try:
+            with transaction.atomic():
+                return self.create(
+                    task=task,
+                    payload=payload or {},
+                    run_at=run_at or timezone.now(),
+                    key=key,
+                    priority=priority,
+                    max_attempts=max_attempts or registered.max_attempts,
+                )
+        except IntegrityError:
+            if key is None:
+                raise
+            return None
+
+    def requeue_expired(self, lease: timedelta) -> int:
+        """Gives back the jobs whose worker vanished while running them."""
+        return self.filter(
+            state=Job.State.RUNNING,
+            locked_at__lt=timezone.now() - lease,
+        ).update(state=Job.State.QUEUED, locked_by="", run_at=timezone.now())
+
+    def renew(self, worker: str) -> int:
+        """Extends the lease of every job `worker` is running."""
+        return self.filter(state=Job.State.RUNNING, locked_by=worker).update(
+            locked_at=timezone.now()
+        )
+
+    def release(self, job: "Job", worker: str, fields: list[str]) -> bool:
+        """Saves the given fields of a job `worker` is running, unless its
+        lease expired and the job was requeued or claimed by another worker
+        meanwhile.
+
+        Returns:
+            bool: Whether the worker still held the job.
+        """
+        return bool(
+            self.filter(pk=job.pk, state=Job.State.RUNNING, locked_by=worker).update(
+                **{field: getattr(job, field) for field in fields}
+            )
+        )
+
+    def claim(self, worker: str, limit: int = 1) -> list["Job"]:
+        """Locks up to `limit` due jobs for `worker`. Concurrent workers skip
+        the rows locked by each other instead of waiting on them."""
+        now = timezone.now()
+        with transaction.atomic():
+            jobs = list(
+                self.select_for_update(skip_locked=True)
+                .filter(state=Job.State.QUEUED, run_at__lte=now)
+                .order_by("priority", "run_at", "id")[:limit]
+            )
+            if not jobs:
+                return []
+
+            self.filter(pk__in=[job.pk for job in jobs]).update(
+                state=Job.State.RUNNING,
+                locked_by=worker,
+                locked_at=now,
+                attempts=F("attempts") + 1,
+            )
+
+        for job in jobs:
+            job.state, job.locked_by, job.locked_at = Job.State.RUNNING, worker, now
+            job.attempts += 1
+        return jobs
+
+
+class Job(models.Model):
+    """A unit of background work, run by the `run_worker` command."""
+
+    class State(models.TextChoices):
+        QUEUED = "queued", _("Queued")
+        RUNNING = "running", _("Running")
+        DONE = "done", _("Done")
+        FAILED = "failed", _("Failed")
+
+    class Meta:
+        db_table = "job"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["key"],
+                condition=Q(state__in=["queued", "running"]),
+                name="job_unfinished_key",
+            ),
+        ]
+        indexes = [
+            # The claim query only scans the queued jobs
+            models.Index(
+                fields=["priority", "run_at", "id"],
+                condition=Q(state="queued"),
+                name="job_queued",
+            ),
+            models.Index(
+                fields=["locked_at"],
+                condition=Q(state="running"),
+                name="job_running",
+            ),
+        ]
+
+    task = models.CharField(max_length=255)
+    payload = models.JSONField(default=dict)
+    key = models.CharField(max_length=255, null=True)
+    priority = models.SmallIntegerField(default=0)
+
+    state = models.CharField(
+        max_length=10,
+        choices=State.choices,
+        default=State.QUEUED,
+    )
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    last_error = models.TextField(blank=True)
+
+    locked_by = models.CharField(max_length=255, blank=True)
+    locked_at = models.DateTimeField(null=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True)
+
+    objects = JobManager()
+
+    def __str__(self):
+        return f"{self.task} #{self.pk} ({self.state})"
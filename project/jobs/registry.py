@@ -0,0 +1,46 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+
+
+@dataclass(frozen=True)
+class Task:
+    name: str
+    fn: Callable[..., None]
+    max_attempts: int = 5
+    every: timedelta | None = None  # Recurring when set
+
+
+class Registry:
+    def __init__(self) -> None:
+        self.tasks: dict[str, Task] = {}
+
+    def get(self, name: str) -> Task:
+        try:
+            return self.tasks[name]
+        except KeyError:
+            raise LookupError(f"Unknown task {name}, is it declared in a tasks.py?")
+
+    def task(
+        self,
+        name: str,
+        max_attempts: int = 5,
+        every: timedelta | None = None,
+    ) -> Callable:
+        """Registers a function as a task, called with the job payload as
+        keyword arguments. Raising makes the job be retried with backoff."""
+
+        def register(fn: Callable) -> Callable:
+            self.tasks[name] = Task(name, fn, max_attempts, every)
+            return fn
+
+        return register
+
+    def recurring(self) -> list[Task]:
+        return [task for task in self.tasks.values() if task.every is not None]
+
+
+registry = Registry()
+task = registry.task
+
+__all__ = ["registry", "task"]
@@ -0,0 +1,21 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from helpers.config import config
+
+from jobs.models import Job
+from jobs.registry import task
+
+
+@task("jobs.purge", every=timedelta(hours=1))
+def purge():
+    """Deletes the finished jobs past their retention."""
+    Job.objects.filter(
+        state__in=[Job.State.DONE, Job.State.FAILED],
+        finished_at__lt=timezone.now() - timedelta(days=config.JOBS_RETENTION_DAYS),
+    ).delete()
+
+
+@task("jobs.noop")
+def noop(**payload):
+    """Does nothing, used by bench_jobs."""
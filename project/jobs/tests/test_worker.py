@@ -0,0 +1,215 @@
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from threading import Barrier
+from unittest import mock, skipUnless
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.utils import timezone
+from helpers.metrics import Metrics
+
+from jobs.models import Job
+from jobs.registry import registry, task
+from jobs.worker import Worker, heartbeat
+
+calls = []
+
+
+@task("tests.record")
+def record(**payload):
+    calls.append(payload)
+
+
+@task("tests.broken", max_attempts=3)
+def broken():
+    raise RuntimeError("Broken")
+
+
+@task("tests.recurring", every=timedelta(minutes=5))
+def recurring():
+    calls.append("recurring")
+
+
+@task("tests.long")
+def long():
+    # Runs for longer than the lease, as far as the database can tell
+    Job.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+    heartbeat()
+    calls.append(Job.objects.requeue_expired(timedelta(minutes=10)))
+
+
+class WorkerTest(TestCase):
+    def setUp(self):
+        calls.clear()
+        self.worker = Worker(name="test")
+
+    def test_runs_due_jobs(self):
+        job = Job.objects.enqueue("tests.record", {"n": 1})
+
+        self.assertEqual(self.worker.run_once(), 1)
+
+        job.refresh_from_db()
+        self.assertEqual(job.state, Job.State.DONE)
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(calls, [{"n": 1}])
+
+    def test_scheduled_jobs_wait(self):
+        Job.objects.enqueue("tests.record", run_at=timezone.now() + timedelta(hours=1))
+
+        self.assertEqual(self.worker.run_once(), 0)
+
+    def test_priority(self):
+        for n, priority in enumerate((5, 0, 1)):
+            Job.objects.enqueue("tests.record", {"n": n}, priority=priority)
+        self.worker.batch_size = 1
+
+        while self.worker.run_once():
+            pass
+
+        self.assertEqual(calls, [{"n": 1}, {"n": 2}, {"n": 0}])
+
+    def test_retries_with_backoff(self):
+        job = Job.objects.enqueue("tests.broken")
+
+        self.worker.run_once()
+        job.refresh_from_db()
+        self.assertEqual(job.state, Job.State.QUEUED)
+        self.assertEqual(job.last_error, "RuntimeError: Broken")
+        self.assertGreater(job.run_at, timezone.now())
+
+        for _ in range(2):
+            Job.objects.update(run_at=timezone.now())
+            self.worker.run_once()
+
+        job.refresh_from_db()
+        self.assertEqual(job.state, Job.State.FAILED)
+        self.assertEqual(job.attempts, 3)
+
+    def test_unknown_task(self):
+        job = Job.objects.create(task="tests.unknown", max_attempts=1)
+
+        self.worker.run_once()
+
+        job.refresh_from_db()
+        self.assertEqual(job.state, Job.State.FAILED)
+
+    def test_recurring(self):
+        self.worker.schedule_recurring()
+        self.worker.schedule_recurring()
+        job = Job.objects.get(task="tests.recurring")
+        Job.objects.exclude(task="tests.recurring").delete()
+
+        self.worker.run_once()
+
+        job.refresh_from_db()
+        self.assertEqual(calls, ["recurring"])
+        self.assertEqual(job.state, Job.State.QUEUED)
+        self.assertGreater(job.run_at, timezone.now() + timedelta(minutes=4))
+
+    def test_key_deduplicates_unfinished_jobs(self):
+        first = Job.objects.enqueue("tests.record", key="only")
+        self.assertIsNone(Job.objects.enqueue("tests.record", key="only"))
+
+        self.worker.run_once()
+
+        self.assertNotEqual(Job.objects.enqueue("tests.record", key="only"), first)
+
+    def test_expired_lease_is_requeued(self):
+        job = Job.objects.enqueue("tests.record")
+        Job.objects.claim("vanished")
+        Job.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+
+        self.worker.run_once()
+
+        job.refresh_from_db()
+        self.assertEqual(job.state, Job.State.DONE)
+        self.assertEqual(job.attempts, 2)
+
+    def test_connections_are_only_recycled_between_batches(self):
+        Job.objects.enqueue("tests.record")
+
+        with mock.patch("jobs.worker.close_old_connections") as close:
+            self.worker.run_once()
+            close.assert_not_called()
+
+            # Stops after the first batch, leaving the signal handlers alone
+            with (
+                mock.patch("jobs.worker.signal.signal"),
+                mock.patch.object(
+                    self.worker, "run_once", side_effect=self.worker.stop
+                ),
+            ):
+                self.worker.run()
+
+        close.assert_called_once()
+
+    def test_heartbeat_renews_the_lease(self):
+        job = Job.objects.enqueue("tests.long")
+        Job.objects.enqueue("tests.record", priority=1)
+        worker = Worker(name="test", lease=timedelta(0))  # Renews at every beat
+
+        self.assertEqual(worker.run_once(), 2)
+
+        job.refresh_from_db()
+        self.assertEqual(calls, [0, {}])
+        self.assertEqual(job.state, Job.State.DONE)
+        self.assertFalse(Job.objects.exclude(state=Job.State.DONE).exists())
+
+    def test_heartbeat_outside_a_worker(self):
+        job = Job.objects.enqueue("tests.record")
+        Job.objects.claim("test")
+        Job.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+
+        heartbeat()
+
+        job.refresh_from_db()
+        self.assertLess(job.locked_at, timezone.now() - timedelta(minutes=59))
+
+    def test_outcome_of_a_lost_lease_is_dropped(self):
+        job = Job.objects.enqueue("tests.record")
+        (claimed,) = Job.objects.claim("test")
+        # Requeued by another worker, then claimed by it
+        Job.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+        Job.objects.requeue_expired(self.worker.lease)
+        Job.objects.claim("other")
+
+        self.worker.succeeded(claimed, registry.get("tests.record"))
+
+        job.refresh_from_db()
+        self.assertEqual(job.state, Job.State.RUNNING)
+        self.assertEqual(job.locked_by, "other")
+
+
+class WorkerMetricsTest(SimpleTestCase):
+    def test_served_without_a_web_server(self):
+        registry = Metrics()
+        registry.inc("jobs_claimed_total", task="tests.record")
+        server = registry.serve(0, host="127.0.0.1")
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        host, port = server.server_address
+
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics") as response:
+            body = response.read().decode()
+
+        self.assertIn('jobs_claimed_total{task="tests.record"} 1', body)
+
+
+@skipUnless(connection.vendor == "postgresql", "SKIP LOCKED needs PostgreSQL")
+class ConcurrentClaimTest(TransactionTestCase):
+    def test_workers_never_claim_the_same_job(self):
+        Job.objects.bulk_create(Job(task="jobs.noop") for _ in range(20))
+        barrier = Barrier(2)
+        claimed = {}
+
+        def claim(name):
+            barrier.wait()
+            claimed[name] = [job.pk for job in Job.objects.claim(name, limit=15)]
+            connection.close()
+
+        with ThreadPoolExecutor(2) as pool:
+            list(pool.map(claim, ("a", "b")))
+
+        self.assertFalse(set(claimed["a"]) & set(claimed["b"]))
+        self.assertEqual(len(claimed["a"]) + len(claimed["b"]), 20)
@@ -0,0 +1,162 @@
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+from datetime import timedelta
+
+from django.db import close_old_connections
+from django.utils import timezone
+from helpers.config import config
+from helpers.metrics import metrics
+
+from jobs.models import Job
+from jobs.registry import Task, registry
+
+logger = logging.getLogger(__name__)
+
+_current = threading.local()
+
+
+def heartbeat() -> None:
+    """Renews the lease of the jobs held by the worker running the calling
+    task. Tasks that may outlast the lease call it as they make progress,
+    it does nothing outside a worker."""
+    worker = getattr(_current, "worker", None)
+    if worker is not None:
+        worker.heartbeat()
+
+
+def backoff(attempts: int) -> timedelta:
+    seconds = config.JOBS_BACKOFF * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(seconds, config.JOBS_MAX_BACKOFF))
+
+
+class Worker:
+    """Claims and runs the due jobs, `batch_size` at a time."""
+
+    def __init__(
+        self,
+        name: str | None = None,
+        batch_size: int = 10,
+        poll_interval: float = 1.0,
+        lease: timedelta = timedelta(seconds=config.JOBS_LEASE),
+    ) -> None:
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.stopping = False
+        self.renewed_at = timezone.now()
+
+    def schedule_recurring(self) -> None:
+        """Makes sure every recurring task has a job queued. The key keeps a
+        single one queued however many workers start."""
+        for task in registry.recurring():
+            Job.objects.enqueue(task.name, key=f"recurring:{task.name}")
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        self.schedule_recurring()
+        logger.info("Worker %s started", self.name)
+        while not self.stopping:
+            # Between batches, where no transaction is ever open
+            close_old_connections()
+            if not self.run_once():
+                time.sleep(self.poll_interval)
+        logger.info("Worker %s stopped", self.name)
+
+    def stop(self, *args) -> None:
+        self.stopping = True
+
+    def run_once(self) -> int:
+        """Runs a batch of due jobs. Returns how many it ran."""
+        Job.objects.requeue_expired(self.lease)
+
+        jobs = Job.objects.claim(self.name, self.batch_size)
+        self.renewed_at = timezone.now()
+        for job in jobs:
+            # The rest of the batch waits on the lease taken when claimed
+            self.heartbeat()
+            metrics.inc("jobs_claimed_total", task=job.task)
+            metrics.inc(
+                "jobs_claim_lag_seconds_total",
+                (job.locked_at - job.run_at).total_seconds(),
+                task=job.task,
+            )
+            self.execute(job)
+        return len(jobs)
+
+    def heartbeat(self) -> None:
+        """Renews the lease of the jobs this worker holds, once a quarter of
+        the lease went by since the last renewal."""
+        now = timezone.now()
+        if now - self.renewed_at < self.lease / 4:
+            return
+
+        Job.objects.renew(self.name)
+        self.renewed_at = now
+
+    def execute(self, job: Job) -> None:
+        started = time.perf_counter()
+        _current.worker = self
+        try:
+            task = registry.get(job.task)
+            task.fn(**job.payload)
+        except Exception as e:
+            logger.exception("Job %s failed", job)
+            self.failed(job, e)
+        else:
+            self.succeeded(job, task)
+        finally:
+            _current.worker = None
+            metrics.inc(
+                "jobs_run_seconds_total",
+                time.perf_counter() - started,
+                task=job.task,
+            )
+
+    def succeeded(self, job: Job, task: Task) -> None:
+        metrics.inc("jobs_succeeded_total", task=job.task)
+        if task.every is not None:
+            self.reschedule(job, task.every)
+            return
+
+        job.state = Job.State.DONE
+        job.finished_at = timezone.now()
+        self.release(job, ["state", "finished_at"])
+
+    def failed(self, job: Job, error: Exception) -> None:
+        job.last_error = f"{type(error).__name__}: {error}"
+        if job.attempts < job.max_attempts:
+            metrics.inc("jobs_retried_total", task=job.task)
+            job.state = Job.State.QUEUED
+            job.run_at = timezone.now() + backoff(job.attempts)
+            self.release(job, ["state", "run_at", "last_error"])
+            return
+
+        metrics.inc("jobs_failed_total", task=job.task)
+        task = registry.tasks.get(job.task)
+        if task is not None and task.every is not None:
+            # A recurring task keeps its schedule even after a failed run
+            self.reschedule(job, task.every)
+            return
+
+        job.state = Job.State.FAILED
+        job.finished_at = timezone.now()
+        self.release(job, ["state", "finished_at", "last_error"])
+
+    def reschedule(self, job: Job, every: timedelta) -> None:
+        job.state = Job.State.QUEUED
+        job.run_at = timezone.now() + every
+        job.attempts = 0
+        self.release(job, ["state", "run_at", "attempts", "last_error"])
+
+    def release(self, job: Job, fields: list[str]) -> None:
+        # The job was given to another worker if the lease expired meanwhile
+        if not Job.objects.release(job, self.name, fields):
+            metrics.inc("jobs_lost_total", task=job.task)
+            logger.warning("Lost the lease of job %s, dropping its outcome", job)
@@ -0,0 +1,14 @@
+from django.http import HttpResponse
+from helpers.metrics import metrics
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.path == "/api/metrics":
+            return HttpResponse(
+                metrics.render(), content_type="text/plain; version=0.0.4"
+            )
+        return self.get_response(request)
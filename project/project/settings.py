@@ -61,10 +61,12 @@ INSTALLED_APPS = [
     "consents",
     "users",
     "assets",
+    "jobs",
 ]
 
 MIDDLEWARE = [
     "middleware.healthcheck.HealthCheckMiddleware",
+    "middleware.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -154,12 +156,15 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "TEST_REQUEST_DEFAULT_FORMAT": "json",
+    "DEFAULT_PAGINATION_CLASS": "helpers.pagination.KeysetPagination",
+    "PAGE_SIZE": 50,
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
     ],
+    "EXCEPTION_HANDLER": "helpers.exceptions.exception_handler",
 }
 
 SWAGGER_SETTINGS = {
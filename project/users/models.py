@@ -1,6 +1,8 @@
+from collections.abc import Iterable
+
+from django.apps import apps
 from django.contrib.auth.models import AbstractUser, UserManager
-from django.db import models
-from helpers.services.aquarius import aquarius
+from django.db import IntegrityError, models, transaction
 from django.utils import timezone
 
 
@@ -9,11 +11,31 @@ class ConsentsUserManager(UserManager):
         user = self.filter(address=address)
         if user.exists():
             return user.first()
-        else:
-            return self.create(address=address, username=f"user_{address}")
+
+        try:
+            with transaction.atomic():
+                return self.create(address=address, username=f"user_{address}")
+        except IntegrityError:
+            # A concurrent request created it first
+            return self.get(address=address)
+
+    def bulk_get_or_create(self, addresses: Iterable[str]) -> dict[str, "ConsentsUser"]:
+        """Returns the users of the given addresses by address, creating the
+        missing ones with a single insert."""
+        addresses = set(addresses)
+        self.bulk_create(
+            [
+                self.model(address=address, username=f"user_{address}")
+                for address in addresses
+            ],
+            ignore_conflicts=True,
+        )
+        return {user.address: user for user in self.filter(address__in=addresses)}
 
     def get_or_create_from_aquarius(self, did: str) -> "ConsentsUser":
-        address = aquarius.get_asset_owner(did)
+        # Assets import this app's models, so the manager is loaded lazily
+        Asset = apps.get_model("assets", "Asset")
+        address = Asset.helper.get_ddo_summary(did).owner
         return self.get_or_create(address=address)
 
 
@@ -1,5 +1,6 @@
-from consents.models import Consent
+from consents.models import ConsentCounter
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ObjectDoesNotExist
 from rest_framework import serializers
 
 User = get_user_model()
@@ -40,12 +41,18 @@ class DetailUserSerializer(serializers.ModelSerializer):
             "outgoing_pending_consents",
         )
 
-    # Retrieve incoming/pending consents according to the user ownership of the asset
+    # Pending consents of the datasets the user owns, and of those they solicited
     def get_incoming_pending_consents(self, obj):
-        return Consent.helper.from_dataset_owner(obj, pending_only=True).count()
+        return self.counter(obj).incoming_pending
 
     def get_outgoing_pending_consents(self, obj):
-        return Consent.helper.from_solicitor(obj, pending_only=True).count()
+        return self.counter(obj).outgoing_pending
+
+    def counter(self, obj) -> ConsentCounter:
+        try:
+            return obj.consent_counter
+        except ObjectDoesNotExist:
+            return ConsentCounter(user=obj)
 
 
 class NonceQuerySerializer(serializers.Serializer):
@@ -15,6 +15,7 @@ from eth_account import Account
 from eth_account.messages import encode_defunct
 from eth_utils import to_checksum_address
 from helpers.auth import build_siwe_message
+from helpers.pagination import ConsentPagination, KeysetPagination
 from rest_framework import mixins, response, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny
@@ -32,6 +33,7 @@ class UsersViewset(
 ):
     queryset = models.ConsentsUser.objects.all()
     serializer_class = serializers.ListUserSerializer
+    pagination_class = KeysetPagination
     lookup_field = "address"
     lookup_url_kwarg = "address"
 
@@ -48,16 +50,20 @@ class UsersViewset(
             "200": openapi.Response(
                 description="List of user's addresses and details URL",
                 examples={
-                    "application/json": [
-                        {
-                            "url": "http://localhost:8050/api/users/admin@admin/",
-                            "address": "admin@admin",
-                        },
-                        {
-                            "url": "http://localhost:8050/api/users/0xDf7a37EA1f42588Ea219Ec19328757F67BaBCeCD/",
-                            "address": "0xDf7a37EA1f42588Ea219Ec19328757F67BaBCeCD",
-                        },
-                    ]
+                    "application/json": {
+                        "next": "http://localhost:8050/api/users/?cursor=cD0yMDI1LTA5LTE5",
+                        "previous": None,
+                        "results": [
+                            {
+                                "url": "http://localhost:8050/api/users/admin@admin/",
+                                "address": "admin@admin",
+                            },
+                            {
+                                "url": "http://localhost:8050/api/users/0xDf7a37EA1f42588Ea219Ec19328757F67BaBCeCD/",
+                                "address": "0xDf7a37EA1f42588Ea219Ec19328757F67BaBCeCD",
+                            },
+                        ],
+                    }
                 },
             ),
         },
@@ -114,10 +120,18 @@ class UsersViewset(
                     user, pending_only=pending_only
                 )
 
+        paginator = ConsentPagination()
+        page = paginator.paginate_queryset(
+            consents.with_details(),
+            self.request,
+            view=self,
+        )
         serializer = ListConsent(
-            consents, many=True, context={"request": self.request, "direction": way}
+            page,
+            many=True,
+            context={"request": self.request, "direction": way},
         )
-        return response.Response(serializer.data)
+        return paginator.get_paginated_response(serializer.data)
 
     @swagger_auto_schema(
         method="get",
@@ -138,24 +152,28 @@ class UsersViewset(
                 description="User details",
                 schema=ListConsent,
                 examples={
-                    "application/json": [
-                        {
-                            "url": "http://localhost:8050/api/consents/1/",
-                            "id": 1,
-                            "created_at": 1758271130,
-                            "dataset": "http://localhost:8050/api/assets/did:op:75afadb65591ca977344fa598c2b42c0ca5c7e8620b7c8bf47533e8f222d7997/",
-                            "algorithm": "http://localhost:8050/api/assets/did:op:b533c6703cd099cfc228e1f6587c4049bc1f445b2bd0da24f5321a13fd9f1c8a/",
-                            "solicitor": {
-                                "url": "http://localhost:8050/api/users/0xD999bAaE98AC5246568FD726be8832c49626867D/",
-                                "address": "0xD999bAaE98AC5246568FD726be8832c49626867D",
-                            },
-                            "reason": "Provided reason",
-                            "request": {"trusted_algorithm": True},
-                            "response": None,
-                            "status": "Pending",
-                            "direction": "Incoming",
-                        }
-                    ]
+                    "application/json": {
+                        "next": "http://localhost:8050/api/users/0xDf7a37EA1f42588Ea219Ec19328757F67BaBCeCD/incoming/?cursor=cD0yMDI1LTA5LTE5",
+                        "previous": None,
+                        "results": [
+                            {
+                                "url": "http://localhost:8050/api/consents/1/",
+                                "id": 1,
+                                "created_at": 1758271130,
+                                "dataset": "http://localhost:8050/api/assets/did:op:75afadb65591ca977344fa598c2b42c0ca5c7e8620b7c8bf47533e8f222d7997/",
+                                "algorithm": "http://localhost:8050/api/assets/did:op:b533c6703cd099cfc228e1f6587c4049bc1f445b2bd0da24f5321a13fd9f1c8a/",
+                                "solicitor": {
+                                    "url": "http://localhost:8050/api/users/0xD999bAaE98AC5246568FD726be8832c49626867D/",
+                                    "address": "0xD999bAaE98AC5246568FD726be8832c49626867D",
+                                },
+                                "reason": "Provided reason",
+                                "request": {"trusted_algorithm": True},
+                                "response": None,
+                                "status": "Pending",
+                                "direction": "Incoming",
+                            }
+                        ],
+                    }
                 },
             ),
             "404": openapi.Response(
@@ -192,24 +210,28 @@ class UsersViewset(
                 description="List of outgoing consents",
                 schema=ListConsent,
                 examples={
-                    "application/json": [
-                        {
-                            "url": "..",
-                            "id": 1,
-                            "created_at": 1758271130,
-                            "dataset": "..",
-                            "algorithm": "..",
-                            "solicitor": {
+                    "application/json": {
+                        "next": "http://localhost:8050/api/users/0xD999bAaE98AC5246568FD726be8832c49626867D/outgoing/?cursor=cD0yMDI1LTA5LTE5",
+                        "previous": None,
+                        "results": [
+                            {
                                 "url": "..",
-                                "address": "0xD999bAaE98AC5246568FD726be8832c49626867D",
-                            },
-                            "reason": "Provided reason",
-                            "request": {"trusted_algorithm": True},
-                            "response": None,
-                            "status": "Pending",
-                            "direction": "Outgoing",
-                        }
-                    ]
+                                "id": 1,
+                                "created_at": 1758271130,
+                                "dataset": "..",
+                                "algorithm": "..",
+                                "solicitor": {
+                                    "url": "..",
+                                    "address": "0xD999bAaE98AC5246568FD726be8832c49626867D",
+                                },
+                                "reason": "Provided reason",
+                                "request": {"trusted_algorithm": True},
+                                "response": None,
+                                "status": "Pending",
+                                "direction": "Outgoing",
+                            }
+                        ],
+                    }
                 },
             ),
             "404": openapi.Response(